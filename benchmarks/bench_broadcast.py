@@ -0,0 +1,158 @@
+# Cost and size of the telemetry broadcast, and a round-trip check.
+#
+# Run: python benchmarks/bench_broadcast.py [--frames 600] [--cars 60]
+#
+# Runs the pipeline over synthetic frames and reports, per view and for the
+# whole message, the encoded size and the encode/decode cost. Then checks
+# that everything round-trips:
+#   codec     decode(encode(updates)) equals the pipeline's result
+#   framing   messages pushed through a socketpair in uneven chunks come out
+#             of Subscriber.feed whole and in order
+#   loopback  a Publisher and a Subscriber on 127.0.0.1 connect (without the
+#             subscriber ever blocking) and deliver every message
+
+import argparse
+import math
+import random
+import socket
+import time
+
+from synthetic import make_session
+
+from acc_dashboard.broadcast import CODECS, Publisher, Subscriber, decode, encode
+from acc_dashboard.pipeline import Pipeline
+from acc_dashboard.telemetry.acquisition import Frame
+
+# fields that come back as the subscriber's own TrackInfo, not a copy
+_LOCAL = {"track", "track_points", "track_index", "path_to_points"}
+
+
+def pipeline_updates(frames, cars):
+    pipeline = Pipeline()
+    session = make_session(cars=cars)
+    out = []
+    for i in range(frames):
+        updates = pipeline.run([Frame(i + 1, i / 60, next(session))], now=i / 60)
+        if updates:
+            out.append(updates)
+    return out
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float):
+        # floats travel as f32 or f64
+        return math.isclose(a, b, rel_tol=1e-6, abs_tol=1e-4) or (math.isnan(a) and math.isnan(b))
+    if isinstance(a, dict) and isinstance(b, dict):
+        return a.keys() == b.keys() and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, (list, tuple)) and isinstance(b, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def check_equal(sent, received):
+    assert sent.keys() == received.keys(), (sent.keys(), received.keys())
+    for view, data in sent.items():
+        for key, value in data.items():
+            if key not in _LOCAL:
+                assert _same(value, received[view][key]), (view, key, value, received[view][key])
+
+
+def check_codec(updates):
+    for seq, u in enumerate(updates, 1):
+        got_seq, back = decode(encode(u, seq))
+        assert got_seq == seq
+        check_equal(u, back)
+
+
+def check_framing(updates, seed=1):
+    rng = random.Random(seed)
+    stream = b"".join(encode(u, seq) for seq, u in enumerate(updates, 1))
+    a, b = socket.socketpair()
+    b.setblocking(False)
+    sub = Subscriber()
+    received = []
+    try:
+        offset = 0
+        while offset < len(stream):
+            step = rng.randint(1, 4096)
+            a.sendall(stream[offset:offset + step])
+            offset += step
+            while True:
+                try:
+                    chunk = b.recv(65536)
+                except BlockingIOError:
+                    break
+                # 7-byte feeds complete at most one message each (a header is 10)
+                for i in range(0, len(chunk), 7):
+                    got = sub.feed(chunk[i:i + 7])
+                    if got:
+                        received.append((sub.last_seq, got))
+    finally:
+        a.close()
+        b.close()
+    assert [seq for seq, _ in received] == list(range(1, len(updates) + 1)), "messages lost or reordered"
+    for (_, got), sent in zip(received, updates):
+        check_equal(sent, got)
+
+
+def check_loopback(updates, timeout=5.0):
+    pub = Publisher(port=0)
+    sub = Subscriber(*pub.address)
+    try:
+        worst_poll = 0.0
+        deadline = time.perf_counter() + timeout
+        while not pub:
+            t0 = time.perf_counter()
+            sub.poll()
+            worst_poll = max(worst_poll, time.perf_counter() - t0)
+            pub.publish({})  # accepts pending connections
+            assert time.perf_counter() < deadline, "subscriber never connected"
+        for u in updates:
+            pub.publish(u)
+        while sub.last_seq != pub.seq:
+            sub.poll()
+            assert time.perf_counter() < deadline, f"got {sub.messages} of {pub.seq} messages"
+        return worst_poll
+    finally:
+        sub.close()
+        pub.close()
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark and check the telemetry broadcast.")
+    ap.add_argument("--frames", type=int, default=600, help="Synthetic frames to run the pipeline over.")
+    ap.add_argument("--cars", type=int, default=60, help="Cars on track.")
+    args = ap.parse_args()
+
+    updates = pipeline_updates(args.frames, args.cars)
+
+    print(f"{'view':<8} {'bytes':>7} {'encode us':>10} {'decode us':>10}")
+    for view, (_, enc, dec) in CODECS.items():
+        samples = [u[view] for u in updates if view in u]
+        if not samples:
+            continue
+        payloads = []
+        t0 = time.perf_counter()
+        for d in samples:
+            payloads.append(enc(d))
+        t_enc = (time.perf_counter() - t0) / len(samples)
+        t0 = time.perf_counter()
+        for p in payloads:
+            dec(memoryview(p))
+        t_dec = (time.perf_counter() - t0) / len(samples)
+        size = sum(map(len, payloads)) / len(payloads)
+        print(f"{view:<8} {size:>7.0f} {t_enc * 1e6:>10.1f} {t_dec * 1e6:>10.1f}")
+
+    messages = [encode(u, seq) for seq, u in enumerate(updates, 1)]
+    print(f"{len(messages)} messages, {sum(map(len, messages)) / len(messages):.0f} B mean")
+
+    check_codec(updates)
+    print("codec round trip ok")
+    check_framing(updates)
+    print("socketpair framing ok")
+    worst_poll = check_loopback(updates)
+    print(f"loopback publish/subscribe ok (slowest poll while connecting {worst_poll * 1e3:.2f} ms)")
+
+
+if __name__ == "__main__":
+    main()
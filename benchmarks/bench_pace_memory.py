@@ -0,0 +1,80 @@
+# Memory used by per-car pace state for a full 60-car grid.
+#
+# Run: python benchmarks/bench_pace_memory.py [--cars 60]
+#
+# Compares the old MiniMapWidget dict-of-dicts layout (one dict per car per
+# track point, keyed by (x, z) tuples) with PaceStore's flat arrays.
+
+import argparse
+import sys
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from acc_dashboard.processors.pace import PaceStore  # noqa: E402
+from acc_dashboard.processors.track_asset import read_track_points  # noqa: E402
+
+TRACKS_DIR = Path(__file__).resolve().parents[1] / "src" / "acc_dashboard" / "resources" / "tracks"
+SECTOR_LEN = 10
+
+
+def legacy_pace_list(track_pts, cars, sector_count):
+    pace_list = {}
+    for car_id in range(cars):
+        points = {}
+        for i in range(len(track_pts)):
+            points[track_pts[i]] = {
+                "speed": 0.0,
+                "last_speed": 0.0,
+                "next_point": track_pts[(i + 1) % len(track_pts)],
+            }
+        sectors = {}
+        for s in range(sector_count):
+            sectors[s] = {"avg": 0.0, "prev_avg": 0.0, "sum": 0.0, "cnt": 0}
+        pace_list[car_id] = {
+            "points": points,
+            "last_point_seen": None,
+            "last_time_seen": 0.0,
+            "sectors": sectors,
+            "last_sector": None,
+        }
+    return pace_list
+
+
+def pace_store(track_pts, cars, sector_count):
+    store = PaceStore(len(track_pts), SECTOR_LEN, sector_count)
+    for car_id in range(cars):
+        store.add_car(car_id, 0.0)
+    return store
+
+
+def measure(build, *args):
+    tracemalloc.start()
+    obj = build(*args)
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del obj
+    return size
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark pace state memory.")
+    ap.add_argument("--cars", type=int, default=60, help="Cars on the grid.")
+    args = ap.parse_args()
+
+    print(f"{'track':<12} {'pts':>5} {'legacy KiB':>11} {'store KiB':>10} {'ratio':>7}")
+    for points_file in sorted(TRACKS_DIR.glob("*/points_*.json")):
+        pts = read_track_points(str(points_file))
+        sector_count = (len(pts) + SECTOR_LEN - 1) // SECTOR_LEN
+
+        legacy = measure(legacy_pace_list, pts, args.cars, sector_count)
+        store = measure(pace_store, pts, args.cars, sector_count)
+        print(
+            f"{points_file.parent.name:<12} {len(pts):>5} {legacy / 1024:>11.1f} "
+            f"{store / 1024:>10.1f} {legacy / store:>6.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
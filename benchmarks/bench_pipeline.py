@@ -0,0 +1,83 @@
+# Pipeline scheduling: per-frame cost and a cadence check.
+#
+# Run: python benchmarks/bench_pipeline.py [--seconds 60] [--hz 120]
+#
+# Feeds synthetic frames at --hz through the default processors one frame
+# per run and reports the cost per run. Then checks on a synthetic clock
+# that rated processors keep their configured rate: never two runs closer
+# than one period less a frame (runs land on the first frame due, so one can
+# come late and the next on time; the first run and the one after a stall
+# included), and the expected number of runs before and after a one-second
+# stall.
+
+import argparse
+import time
+from types import SimpleNamespace
+
+from synthetic import make_session
+
+from acc_dashboard.pipeline import Pipeline, Processor
+from acc_dashboard.telemetry.acquisition import Frame
+
+RATES = (1.0, 10.0, 30.0)
+STALL = (4.0, 5.0)  # s, no frames in between
+
+
+def check_cadence(frame_hz, seconds=10.0):
+    clock = {"now": 0.0}
+    runs = {hz: [] for hz in RATES}
+    pipeline = Pipeline(
+        [Processor(f"{hz:g}hz", (lambda sm, hz=hz: runs[hz].append(clock["now"])), hz=hz, reads=("Physics",))
+         for hz in RATES],
+        clock=lambda: clock["now"],
+    )
+
+    for i in range(int(seconds * frame_hz)):
+        now = i / frame_hz
+        if STALL[0] <= now < STALL[1]:
+            continue
+        clock["now"] = now
+        sm = SimpleNamespace(Physics=SimpleNamespace(packed_id=i + 1))
+        pipeline.run([Frame(i + 1, now, sm)])
+
+    frame = 1.0 / frame_hz
+    for hz, times in runs.items():
+        period = 1.0 / hz
+        gaps = [b - a for a, b in zip(times, times[1:])]
+        assert min(gaps) >= period - frame - 1e-9, f"{hz:g} Hz ran twice within {min(gaps) * 1000:.1f} ms"
+        for lo, hi in ((0.0, STALL[0]), (STALL[1], seconds)):
+            n = sum(lo <= t < hi for t in times)
+            # each run can slip by up to one frame
+            expected = (hi - lo) / (period + frame), (hi - lo) / period
+            assert expected[0] - 1 <= n <= expected[1] + 1, f"{hz:g} Hz: {n} runs in [{lo:g}, {hi:g}) s"
+    return {hz: len(times) for hz, times in runs.items()}
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark and check pipeline scheduling.")
+    ap.add_argument("--seconds", type=float, default=60.0, help="Synthetic session length.")
+    ap.add_argument("--hz", type=float, default=120.0, help="Frame rate fed to the pipeline.")
+    args = ap.parse_args()
+
+    session = make_session(hz=args.hz)
+    pipeline = Pipeline(clock=lambda: 0.0)
+    n = int(args.seconds * args.hz)
+    elapsed = 0.0
+    for i in range(n):
+        now = i / args.hz
+        frame = Frame(i + 1, now, next(session))
+        t0 = time.perf_counter()
+        pipeline.run([frame], now)
+        elapsed += time.perf_counter() - t0
+
+    print(f"{n} frames at {args.hz:g} Hz: {elapsed / n * 1e6:.1f} us per run")
+    for proc in pipeline.processors:
+        print(f"    {proc.name:<8} {proc.runs:>6} runs ({proc.runs / args.seconds:.1f}/s, configured {proc!r})")
+
+    for frame_hz in (60.0, 120.0, 333.0):
+        counts = check_cadence(frame_hz)
+        print(f"cadence ok at {frame_hz:g} Hz frames: " + ", ".join(f"{hz:g} Hz x{n}" for hz, n in counts.items()))
+
+
+if __name__ == "__main__":
+    main()
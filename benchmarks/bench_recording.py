@@ -0,0 +1,68 @@
+# Cost and size of binary session recordings.
+#
+# Run: python benchmarks/bench_recording.py [--seconds 120] [--hz 60]
+#
+# Records synthetic 60-car snapshots with SessionRecorder and reports the
+# per-frame write cost, bytes per frame and the projected size of a one-hour
+# session, then reads everything back to check it round-trips.
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic import make_session
+
+from acc_dashboard.telemetry.recording import SessionReader, SessionRecorder
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark telemetry recording.")
+    ap.add_argument("--seconds", type=float, default=120.0, help="Simulated session length.")
+    ap.add_argument("--hz", type=float, default=60.0, help="Recording rate.")
+    args = ap.parse_args()
+
+    n = int(args.seconds * args.hz)
+    session = make_session(hz=args.hz)
+    frames = []
+    for _ in range(n):
+        sm = next(session)
+        # the generator reuses one snapshot; keep field values per frame
+        frames.append((sm.Physics.packed_id, sm.Graphics.car_coordinates[0].x))
+
+    print(f"{'mode':<16} {'write us':>9} {'B/frame':>8} {'MiB/hour':>9} {'read us':>8}")
+    for label, compress, delta in (
+        ("raw", False, False),
+        ("zlib", True, False),
+        ("zlib + delta", True, True),
+    ):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "session.accrec"
+            session = make_session(hz=args.hz)
+            t_write = 0.0
+            with SessionRecorder(path, compress=compress, delta=delta) as rec:
+                for i in range(n):
+                    sm = next(session)
+                    t0 = time.perf_counter()
+                    rec.write(sm, t=i / args.hz)
+                    t_write += time.perf_counter() - t0
+            size = path.stat().st_size
+
+            t0 = time.perf_counter()
+            with SessionReader(path) as reader:
+                assert len(reader) == n
+                for i, (t, sm) in enumerate(reader):
+                    packet, x = frames[i]
+                    assert sm.Physics.packed_id == packet
+                    assert abs(sm.Graphics.car_coordinates[0].x - x) < 1e-3
+            t_read = time.perf_counter() - t0
+
+        per_frame = size / n
+        print(
+            f"{label:<16} {t_write / n * 1e6:>9.1f} {per_frame:>8.0f} "
+            f"{per_frame * args.hz * 3600 / 2**20:>9.1f} {t_read / n * 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
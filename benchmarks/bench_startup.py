@@ -0,0 +1,124 @@
+# Cold-start profile of the dashboard: what the imports cost and how long
+# until the window first paints.
+#
+# Run: python benchmarks/bench_startup.py [--runs 5] [--budget-ms 1500]
+#          [--out startup.json]
+#
+# Imports are measured with `python -X importtime -c "import <module>"` for
+# acc_dashboard.main (the window) and acc_dashboard.headless, and reported
+# per top-level package (self time) plus the slowest modules (cumulative).
+#
+# Startup runs `python -m acc_dashboard.main --startup-profile` offscreen on
+# zero-filled file-backed pages, --runs times, and reports the median time
+# from spawning the process to each mark it prints:
+#   main         imports done, main() entered
+#   window       QApplication and MainWindow built
+#   first_paint  the window has painted
+#   started      telemetry, processors and the controller running
+#   track_ready  the current track loaded off-thread
+#
+# With --budget-ms the run fails (exit code 1) when the median time to
+# first_paint is over budget.
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+SRC = ROOT / "src"
+MARKS = ("main", "window", "first_paint", "started", "track_ready")
+
+
+def _env():
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(SRC), env.get("PYTHONPATH")]))
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+def import_profile(module):
+    """(wall ms, {package: self ms}, [(cumulative ms, module)]) for importing ``module``."""
+    start = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        env=_env(), capture_output=True, text=True, check=True,
+    )
+    wall = (time.perf_counter() - start) * 1000
+
+    packages = defaultdict(float)
+    modules = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        packages[name.split(".")[0]] += int(self_us) / 1000
+        modules.append((int(cumulative_us) / 1000, name))
+    modules.sort(reverse=True)
+    return wall, dict(packages), modules
+
+
+def startup_run(pages):
+    spawned = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-m", "acc_dashboard.main", "--startup-profile", "--pages", pages],
+        env=_env(), capture_output=True, text=True, timeout=60,
+    )
+    for line in reversed(proc.stdout.splitlines()):
+        if line.startswith("{"):
+            return {name: (t - spawned) * 1000 for name, t in json.loads(line).items()}
+    raise RuntimeError(f"no startup profile printed:\n{proc.stderr}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Profile the dashboard's cold start.")
+    ap.add_argument("--runs", type=int, default=5, help="Startup runs (the median is reported).")
+    ap.add_argument("--top", type=int, default=12, help="Slowest modules to list.")
+    ap.add_argument("--budget-ms", type=float, help="Fail if the median time to first paint is over this.")
+    ap.add_argument("--out", metavar="PATH", help="Write results as JSON to PATH.")
+    args = ap.parse_args()
+
+    sys.path.insert(0, str(SRC))
+    from acc_dashboard.telemetry.mapped import create_page_files
+
+    report = {"imports": {}, "startup_ms": {}}
+    for module in ("acc_dashboard.main", "acc_dashboard.headless"):
+        wall, packages, modules = import_profile(module)
+        report["imports"][module] = {"wall_ms": wall, "packages_ms": packages}
+        print(f"import {module}: {wall:.0f} ms wall")
+        for name, ms in sorted(packages.items(), key=lambda kv: -kv[1])[:8]:
+            print(f"    {name:<32} {ms:>7.1f} ms self")
+        if module == "acc_dashboard.main":
+            print("  slowest (cumulative):")
+            for ms, name in modules[:args.top]:
+                print(f"    {name:<40} {ms:>7.1f} ms")
+
+    pages = create_page_files(tempfile.mkdtemp(prefix="acc-pages-"))
+    runs = [startup_run(pages) for _ in range(args.runs)]
+    print(f"startup, median of {len(runs)} runs (ms since spawn):")
+    for mark in MARKS:
+        values = [r[mark] for r in runs if mark in r]
+        if values:
+            report["startup_ms"][mark] = statistics.median(values)
+            print(f"    {mark:<14} {report['startup_ms'][mark]:>7.0f}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.budget_ms is not None:
+        first_paint = report["startup_ms"].get("first_paint", float("inf"))
+        if first_paint > args.budget_ms:
+            print(f"OVER BUDGET: first paint {first_paint:.0f} ms > {args.budget_ms:.0f} ms")
+            sys.exit(1)
+        print(f"first paint within {args.budget_ms:.0f} ms budget")
+
+
+if __name__ == "__main__":
+    main()
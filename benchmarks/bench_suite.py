@@ -0,0 +1,300 @@
+# Per-tick latency and allocations of the whole dashboard pipeline.
+#
+# Run: python benchmarks/bench_suite.py [--ticks 300] [--out results.json]
+#          [--baseline old.json] [--threshold 0.25] [--only minimap]
+#
+# Stages (all fed by synthetic.make_session, sampled at the 5 Hz UI tick):
+#   telemetry/pyacc|mapped            one shared-memory read of file-backed
+#                                     pages: pyaccsharedmemory's full decode
+#                                     vs MappedTelemetry
+#   processors/fuel|tires|track       process_* on one snapshot
+#   minimap/<track>/<n>               MiniMapWidget.set_cars + compute_paces
+#                                     with 1, 20 and 60 cars on every track
+#   paint/minimap|tires|fuel          the cards rendered offscreen, as the
+#                                     MainWindow lays them out
+#
+# Each stage is timed over --ticks ticks, then run again under tracemalloc
+# for the bytes allocated per tick (peak) and kept per tick (net). Results
+# are written as JSON; with --baseline the run fails (exit code 1) when any
+# stage's --metric grew by more than --threshold.
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from synthetic import TRACKS, make_session  # noqa: E402
+
+import PySide6  # noqa: E402
+import pyaccsharedmemory as acc  # noqa: E402
+from PySide6.QtGui import QImage  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from acc_dashboard.processors.fuel import process_fuel  # noqa: E402
+from acc_dashboard.processors.tires import process_tires  # noqa: E402
+from acc_dashboard.processors.track import get_track, process_track  # noqa: E402
+from acc_dashboard.telemetry import mapped  # noqa: E402
+from acc_dashboard.ui.main_window import MainWindow, MiniMapWidget  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+TICK_HZ = 5.0
+CAR_COUNTS = (1, 20, 60)
+METRICS = ("p50_us", "p90_us", "p99_us", "mean_us", "alloc_bytes")
+
+
+def cars_of(sm, cars):
+    g = sm.Graphics
+    return [
+        {"x": v.x, "y": v.y, "z": v.z, "car_id": car_id, "is_player": car_id == g.player_car_id}
+        for car_id, v in zip(g.car_id[:cars], g.car_coordinates[:cars])
+    ]
+
+
+class Stage:
+    """One benchmarked step: ``prepare(sm)`` runs untimed, ``run()`` is timed."""
+
+    def __init__(self, name, run, prepare=None, track="monza", cars=60):
+        self.name = name
+        self.run = run
+        self.prepare = prepare
+        self.track = track
+        self.cars = cars
+
+
+def telemetry_stages():
+    directory = mapped.create_page_files(tempfile.mkdtemp(prefix="acc-pages-"))
+    telemetry = mapped.MappedTelemetry(directory)
+    maps = telemetry.connect()
+    physics = mapped.page_view(maps["physics"], "physics")
+    packet = {"id": 0}
+
+    def new_frame(sm):
+        # a new physics packet each tick, as the game would publish
+        packet["id"] += 1
+        physics.packed_id = packet["id"]
+
+    # pyaccsharedmemory's decoder over the same pages
+    pages = {}
+    for name, (_, size) in mapped.PAGES.items():
+        f = open(os.path.join(directory, f"{name}.bin"), "r+b")
+        pages[name] = acc.accSM(f.fileno(), size)
+
+    def full_read():
+        acc.read_physic_map(pages["physics"])
+        acc.read_graphics_map(pages["graphics"])
+        acc.read_static_map(pages["static"])
+
+    return [
+        Stage("telemetry/pyacc", full_read, new_frame),
+        Stage("telemetry/mapped", telemetry.get_sm, new_frame),
+    ]
+
+
+def processor_stages():
+    holder = {}
+
+    def keep(sm):
+        holder["sm"] = sm
+
+    return [
+        Stage("processors/fuel", lambda: process_fuel(holder["sm"]), keep),
+        Stage("processors/tires", lambda: process_tires(holder["sm"]), keep),
+        Stage("processors/track", lambda: process_track(holder["sm"]), keep),
+    ]
+
+
+def minimap_stages():
+    stages = []
+    for track in sorted(TRACKS):
+        for cars in CAR_COUNTS:
+            stages.append(_minimap_stage(track, cars))
+    return stages
+
+
+def _minimap_stage(track, cars):
+    widget = MiniMapWidget()
+    clock = {"now": 0.0}
+    widget.clock = lambda: clock["now"]
+    # the dashboard calls set_track once per track and set_cars every tick
+    info = get_track(track)
+    widget.set_track(info.points, info.index, info)
+    holder = {}
+
+    def prepare(sm):
+        holder["cars"] = cars_of(sm, cars)
+        clock["now"] += 1.0 / TICK_HZ
+
+    def run():
+        widget.set_cars(holder["cars"], 0, 0.0)
+        widget.compute_paces()
+
+    return Stage(f"minimap/{track}/{cars}", run, prepare, track=track, cars=cars)
+
+
+def paint_stages(window):
+    track, tyres, fuel = window.track, window.tyres, window.fuel
+    images = {}
+
+    def target(widget):
+        size = widget.size()
+        key = id(widget)
+        if key not in images or images[key].size() != size:
+            images[key] = QImage(size, QImage.Format_ARGB32_Premultiplied)
+        return images[key]
+
+    def render(widget):
+        def run():
+            image = target(widget)
+            widget.render(image)
+        return run
+
+    clock = {"now": 0.0}
+    track.map.clock = lambda: clock["now"]
+
+    def prepare_track(sm):
+        clock["now"] += 1.0 / TICK_HZ
+        track.update_view(process_track(sm))
+
+    return [
+        Stage("paint/minimap", render(track.map), prepare_track),
+        Stage("paint/tires", render(tyres), lambda sm: tyres.update_view(process_tires(sm))),
+        Stage("paint/fuel", render(fuel), lambda sm: fuel.update_view(process_fuel(sm))),
+    ]
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    k = min(len(sorted_values) - 1, max(0, round(q * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+def measure(stage, ticks, warmup):
+    session = make_session(track=stage.track, cars=stage.cars, hz=TICK_HZ)
+
+    def next_tick():
+        if stage.prepare is not None:
+            stage.prepare(next(session))
+
+    for _ in range(warmup):
+        next_tick()
+        stage.run()
+
+    times = []
+    for _ in range(ticks):
+        next_tick()
+        t0 = time.perf_counter_ns()
+        stage.run()
+        times.append(time.perf_counter_ns() - t0)
+
+    alloc = net = 0
+    alloc_ticks = max(1, ticks // 4)
+    tracemalloc.start()
+    for _ in range(alloc_ticks):
+        next_tick()
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        stage.run()
+        current, peak = tracemalloc.get_traced_memory()
+        alloc += peak - before
+        net += current - before
+    tracemalloc.stop()
+
+    times.sort()
+    return {
+        "ticks": ticks,
+        "p50_us": percentile(times, 0.50) / 1000,
+        "p90_us": percentile(times, 0.90) / 1000,
+        "p99_us": percentile(times, 0.99) / 1000,
+        "max_us": times[-1] / 1000,
+        "mean_us": sum(times) / len(times) / 1000,
+        "alloc_bytes": alloc / alloc_ticks,
+        "retained_bytes": net / alloc_ticks,
+    }
+
+
+def environment():
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "commit": commit,
+        "time": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pyside6": PySide6.__version__,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def compare(results, baseline, metric, threshold):
+    """Stages whose ``metric`` regressed by more than ``threshold`` (a fraction)."""
+    regressions = []
+    for name, old in baseline.get("results", {}).items():
+        new = results.get(name)
+        if new is None or metric not in old:
+            continue
+        before, after = old[metric], new[metric]
+        if before > 0 and after > before * (1.0 + threshold):
+            regressions.append((name, before, after))
+    return regressions
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark the dashboard pipeline.")
+    ap.add_argument("--ticks", type=int, default=300, help="Timed ticks per stage.")
+    ap.add_argument("--warmup", type=int, default=20, help="Untimed ticks before timing.")
+    ap.add_argument("--only", default="", help="Run only stages whose name contains this.")
+    ap.add_argument("--out", metavar="PATH", help="Write results as JSON to PATH.")
+    ap.add_argument("--baseline", metavar="PATH", help="Compare against a previous JSON result.")
+    ap.add_argument("--metric", choices=METRICS, default="p50_us", help="Metric checked against the baseline.")
+    ap.add_argument("--threshold", type=float, default=0.25, help="Allowed relative regression (0.25 = 25%%).")
+    args = ap.parse_args()
+
+    app = QApplication.instance() or QApplication([sys.argv[0]])  # noqa: F841
+
+    window = MainWindow()
+    window.resize(920, 480)
+    window.show()
+    app.processEvents()
+
+    stages = telemetry_stages() + processor_stages() + minimap_stages() + paint_stages(window)
+    stages = [s for s in stages if args.only in s.name]
+
+    print(f"{'stage':<28} {'p50 us':>9} {'p90 us':>9} {'p99 us':>9} {'alloc B':>9} {'kept B':>8}")
+    results = {}
+    for stage in stages:
+        r = measure(stage, args.ticks, args.warmup)
+        results[stage.name] = r
+        print(
+            f"{stage.name:<28} {r['p50_us']:>9.1f} {r['p90_us']:>9.1f} {r['p99_us']:>9.1f} "
+            f"{r['alloc_bytes']:>9.0f} {r['retained_bytes']:>8.0f}"
+        )
+
+    report = {"environment": environment(), "tick_hz": TICK_HZ, "results": results}
+    if args.out:
+        Path(args.out).write_text(json.dumps(report, indent=2), encoding="utf-8")
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text(encoding="utf-8"))
+        regressions = compare(results, baseline, args.metric, args.threshold)
+        for name, before, after in regressions:
+            print(f"REGRESSION {name}: {args.metric} {before:.1f} -> {after:.1f} (+{after / before - 1:.0%})")
+        if regressions:
+            sys.exit(1)
+        print(f"no {args.metric} regressions over {args.threshold:.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Track load time from compiled assets versus the JSON, and asset checks.
+#
+# Run: python benchmarks/bench_track_asset.py [--runs 20]
+#
+# For every bundled track, compiles its points into a temporary asset and
+# reports the median time to build the geometry from the JSON and to load
+# the asset. Then checks that:
+#   same       the asset and the JSON give identical geometry
+#   truncated  an asset cut short anywhere (mid-header, mid-array) loads as
+#              None, and TrackInfo falls back to the JSON
+
+import argparse
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from acc_dashboard.processors import track_asset  # noqa: E402
+from acc_dashboard.processors.track_registry import TrackInfo  # noqa: E402
+
+TRACKS_DIR = Path(__file__).resolve().parents[1] / "src" / "acc_dashboard" / "resources" / "tracks"
+
+
+def median_ms(fn, runs):
+    times = []
+    for _ in range(runs):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def check_same(a, b):
+    assert a.points == b.points
+    assert list(a.arc) == list(b.arc)
+    assert (a.lap_length, a.bounds) == (b.lap_length, b.bounds)
+    assert (a.sector_len, a.sector_starts) == (b.sector_len, b.sector_starts)
+    assert a.index.cells == b.index.cells
+
+
+def cut_points(asset, size):
+    """Offsets inside the header and inside each array of the asset."""
+    n = len(asset)
+    header = track_asset._HEADER.size
+    ends = [header, header + 8 * n, header + 12 * n, size - 4 * asset.sector_count, size]
+    cuts = {header // 2}
+    for lo, hi in zip(ends, ends[1:]):
+        if hi - lo >= 8:
+            cuts.add(lo + ((hi - lo) // 8) * 4 + 2)  # mid-array, mid-value
+            cuts.add(lo + 4)
+    return sorted(c for c in cuts if 0 < c < size)
+
+
+def check_truncated(points, folder):
+    asset = track_asset.load(track_asset.compile_track(points), points)
+    path = track_asset.asset_path(points)
+    data = path.read_bytes()
+    reference = TrackInfo(folder.name, folder, points, folder / "laptime.txt")
+    cuts = cut_points(asset, len(data))
+    for cut in cuts:
+        path.write_bytes(data[:cut])
+        assert track_asset.load(path, points) is None, f"asset cut at {cut} of {len(data)} bytes loaded"
+        info = TrackInfo(folder.name, folder, points, folder / "laptime.txt")
+        check_same(info.compiled, reference.compiled)
+    path.write_bytes(data)
+    return len(cuts)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark and check compiled track assets.")
+    ap.add_argument("--runs", type=int, default=20, help="Loads timed per track (the median is reported).")
+    args = ap.parse_args()
+
+    print(f"{'track':<12} {'pts':>5} {'json ms':>8} {'asset ms':>9} {'KiB':>6}  checks")
+    for source in sorted(TRACKS_DIR.glob("*/points_*.json")):
+        with tempfile.TemporaryDirectory() as tmp:
+            folder = Path(tmp) / source.parent.name
+            folder.mkdir()
+            points = folder / source.name
+            shutil.copy(source, points)
+
+            asset_file = track_asset.compile_track(points)
+            built = track_asset.build(track_asset.read_track_points(points))
+            loaded = track_asset.load(asset_file, points)
+            check_same(loaded, built)
+
+            json_ms = median_ms(lambda: track_asset.build(track_asset.read_track_points(points)), args.runs)
+            asset_ms = median_ms(lambda: track_asset.load(asset_file, points), args.runs)
+            size = asset_file.stat().st_size
+            cuts = check_truncated(points, folder)
+            print(
+                f"{folder.name:<12} {len(built):>5} {json_ms:>8.2f} {asset_ms:>9.2f} {size / 1024:>6.1f}  "
+                f"same, {cuts} truncations fall back"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+# Nearest-track-point lookup cost per tick.
+#
+# Run: python benchmarks/bench_track_index.py [--ticks 200]
+#
+# Compares the old linear scan with TrackPointIndex (grid only, and grid plus
+# the window around the car's last seen point) for 1, 30 and 60 cars on every
+# bundled track.
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from acc_dashboard.processors.track_asset import read_track_points  # noqa: E402
+from acc_dashboard.processors.track_index import TrackPointIndex  # noqa: E402
+
+TRACKS_DIR = Path(__file__).resolve().parents[1] / "src" / "acc_dashboard" / "resources" / "tracks"
+CAR_COUNTS = (1, 30, 60)
+
+
+def linear_nearest(pts, x, z):
+    best_i = None
+    best_d = float("inf")
+    for i, (px, pz) in enumerate(pts):
+        dx = px - x
+        dz = pz - z
+        d = dx * dx + dz * dz
+        if d < best_d:
+            best_d = d
+            best_i = i
+    return best_i
+
+
+def simulate(pts, cars, ticks, seed=1):
+    """Car positions per tick: each car creeps forward with a little lateral noise."""
+    rng = random.Random(seed)
+    n = len(pts)
+    pos = [rng.uniform(0, n) for _ in range(cars)]
+    speed = [rng.uniform(0.8, 1.6) for _ in range(cars)]
+    frames = []
+    for _ in range(ticks):
+        frame = []
+        for c in range(cars):
+            pos[c] = (pos[c] + speed[c]) % n
+            i = int(pos[c])
+            t = pos[c] - i
+            (x1, z1), (x2, z2) = pts[i], pts[(i + 1) % n]
+            frame.append((
+                x1 + (x2 - x1) * t + rng.uniform(-3, 3),
+                z1 + (z2 - z1) * t + rng.uniform(-3, 3),
+            ))
+        frames.append(frame)
+    return frames
+
+
+def run_linear(pts, frames):
+    for frame in frames:
+        for x, z in frame:
+            linear_nearest(pts, x, z)
+
+
+def run_grid(index, frames):
+    for frame in frames:
+        for x, z in frame:
+            index.nearest(x, z)
+
+
+def run_windowed(index, frames):
+    hints = [None] * len(frames[0])
+    for frame in frames:
+        for c, (x, z) in enumerate(frame):
+            hints[c] = index.nearest(x, z, hints[c])
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    fn(*args)
+    return time.perf_counter() - t0
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Benchmark nearest track point lookup.")
+    ap.add_argument("--ticks", type=int, default=200, help="Ticks simulated per case.")
+    args = ap.parse_args()
+
+    print(f"{'track':<12} {'pts':>5} {'cars':>5} {'linear us':>10} {'grid us':>10} {'window us':>10} {'speedup':>8}")
+    for points_file in sorted(TRACKS_DIR.glob("*/points_*.json")):
+        pts = read_track_points(str(points_file))
+        t0 = time.perf_counter()
+        index = TrackPointIndex(pts)
+        build_ms = (time.perf_counter() - t0) * 1000
+
+        for cars in CAR_COUNTS:
+            frames = simulate(pts, cars, args.ticks)
+
+            # the windowed search must agree with the exhaustive one
+            hints = [None] * cars
+            for frame in frames:
+                for c, (x, z) in enumerate(frame):
+                    hints[c] = index.nearest(x, z, hints[c])
+                    ref = linear_nearest(pts, x, z)
+                    if hints[c] != ref:
+                        d_got = (pts[hints[c]][0] - x) ** 2 + (pts[hints[c]][1] - z) ** 2
+                        d_ref = (pts[ref][0] - x) ** 2 + (pts[ref][1] - z) ** 2
+                        assert abs(d_got - d_ref) < 1e-6, (points_file.name, c, hints[c], ref)
+
+            per_tick = [
+                timed(run, arg, frames) / args.ticks * 1e6
+                for run, arg in ((run_linear, pts), (run_grid, index), (run_windowed, index))
+            ]
+            print(
+                f"{points_file.parent.name:<12} {len(pts):>5} {cars:>5} "
+                f"{per_tick[0]:>10.1f} {per_tick[1]:>10.1f} {per_tick[2]:>10.1f} "
+                f"{per_tick[0] / per_tick[2]:>7.1f}x"
+            )
+        print(f"{'':<12} index build: {build_ms:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+# Synthetic ACC snapshots for benchmarks.
+#
+# make_session() yields pyaccsharedmemory-shaped snapshots (the same
+# dataclasses read_shared_memory() returns) with cars driving around one of
+# the bundled tracks, so processors, the minimap and the recorder can be
+# exercised without the game.
+
+import math
+import random
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import pyaccsharedmemory as acc  # noqa: E402
+
+from acc_dashboard.processors.track_asset import read_track_points  # noqa: E402
+from acc_dashboard.telemetry import schema  # noqa: E402
+
+TRACKS_DIR = Path(__file__).resolve().parents[1] / "src" / "acc_dashboard" / "resources" / "tracks"
+TRACKS = {p.parent.name: p for p in TRACKS_DIR.glob("*/points_*.json")}
+
+
+def blank_snapshot():
+    """An all-zero snapshot with every field present."""
+    return acc.ACC_map(
+        schema.PHYSICS.unpack(bytes(schema.PHYSICS.size)),
+        schema.GRAPHICS.unpack(bytes(schema.GRAPHICS.size)),
+        schema.STATIC.unpack(bytes(schema.STATIC.size)),
+    )
+
+
+def _acc_string(s):
+    return s.ljust(33, "\x00")
+
+
+def make_session(track="monza", cars=60, hz=60.0, seed=1):
+    """Endless generator of snapshots sampled at ``hz`` on ``track``."""
+    rng = random.Random(seed)
+    pts = read_track_points(str(TRACKS[track]))
+    n = len(pts)
+
+    pos = [rng.uniform(0, n) for _ in range(cars)]
+    # ~14 m between points, 45-75 m/s
+    speed = [rng.uniform(3.2, 5.4) for _ in range(cars)]
+    dt = 1.0 / hz
+
+    sm = blank_snapshot()
+    st = sm.Static
+    st.track = _acc_string(track)
+    st.car_model = _acc_string("porsche_992_gt3_r")
+    st.sector_count = 3
+    st.max_fuel = 120.0
+    st.aid_fuel_rate = 1.0
+    st.aid_tyre_rate = 1.0
+    st.num_cars = cars
+
+    g = sm.Graphics
+    g.status = acc.ACC_STATUS.ACC_LIVE
+    g.session_type = acc.ACC_SESSION_TYPE.ACC_RACE
+    g.fuel_per_lap = 2.9
+    g.active_cars = cars
+    g.player_car_id = 0
+    g.car_id = tuple(range(cars)) + (0,) * (schema.CAR_SLOTS - cars)
+    g.session_time_left = 3600 * 1000.0
+
+    ph = sm.Physics
+    ph.fuel = 100.0
+    packet = 0
+    while True:
+        packet += 1
+        ph.packed_id = packet
+        g.packed_id = packet
+        g.session_time_left = max(0.0, g.session_time_left - dt * 1000)
+        g.current_time = int(packet * dt * 1000) % 110000
+        g.last_time = 110000 if packet * dt > 110 else 0
+        g.completed_lap = int(packet * dt // 110)
+
+        coords = []
+        for c in range(cars):
+            pos[c] = (pos[c] + speed[c] * dt) % n
+            i = int(pos[c])
+            t = pos[c] - i
+            (x1, z1), (x2, z2) = pts[i], pts[(i + 1) % n]
+            coords.append(acc.Vector3f(x1 + (x2 - x1) * t, 0.0, z1 + (z2 - z1) * t))
+        coords += [acc.Vector3f(0.0, 0.0, 0.0)] * (schema.CAR_SLOTS - cars)
+        g.car_coordinates = coords
+
+        phase = packet * dt
+        ph.fuel = max(0.0, ph.fuel - 0.026 * dt)
+        ph.gas = 0.5 + 0.5 * math.sin(phase)
+        ph.brake = max(0.0, -math.sin(phase))
+        ph.heading = (phase * 0.3) % (2 * math.pi) - math.pi
+        ph.speed_kmh = 180 + 60 * math.sin(phase * 0.5)
+        wobble = 0.02 * math.sin(phase * 7)
+        ph.tyre_core_temp = acc.Wheels(85 + wobble, 86 + wobble, 90 + wobble, 91 + wobble)
+        ph.wheel_pressure = acc.Wheels(27.5, 27.6, 27.4, 27.5)
+        ph.slip_ratio = acc.Wheels(*(0.05 + wobble,) * 4)
+        ph.slip_angle = acc.Wheels(*(0.03 + wobble,) * 4)
+        ph.suspension_travel = acc.Wheels(*(0.02 + wobble * 0.1,) * 4)
+
+        yield sm
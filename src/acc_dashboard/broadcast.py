@@ -0,0 +1,369 @@
+"""Processed telemetry over a local socket, for several dashboards at once.
+
+One process reads shared memory and runs the processors; a ``Publisher`` in
+it sends every ``Pipeline.run`` result to any number of ``Subscriber``s
+(another monitor, a tablet, a recorder), which then only have to draw.
+
+Wire format, little-endian, one message per pipeline run::
+
+    message  "ACCB", version u8, section count u8, sequence u32, sections
+    section  view code u8, payload length u32, payload
+
+    fuel     9 doubles, laps sampled / laps left / pit window start / end /
+             stops needed as i32 (-1 for no window, unknown stops)
+    tyres    wear then temperature per wheel, 8 floats
+    track    flag i32, player car id i32 (-1 unknown), player heading f32
+             (NaN unknown), track name (u8 length + UTF-8), car count u16,
+             per car x, y, z f32, car id i32, is-player u8
+
+Track geometry is not sent: the subscriber looks the name up in its own
+track registry. Unknown view codes are skipped, so older subscribers keep
+working when views are added.
+
+The publisher never blocks: each client has an outgoing buffer, and a
+client more than ``MAX_BACKLOG`` bytes behind misses whole messages until it
+catches up. Subscribers reconnect on their own, without blocking either.
+"""
+
+import errno
+import math
+import select
+import socket
+import struct
+import time
+
+import pyaccsharedmemory as acc
+
+from .processors.track_registry import get_track
+
+MAGIC = b"ACCB"
+VERSION = 2
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 47610
+MAX_BACKLOG = 256 * 1024
+RECONNECT_INTERVAL = 1.0  # s
+
+# connect_ex results that mean "still connecting"
+_IN_PROGRESS = {errno.EINPROGRESS, errno.EWOULDBLOCK, errno.EALREADY, getattr(errno, "WSAEWOULDBLOCK", errno.EWOULDBLOCK)}
+
+_HEADER = struct.Struct("<4sBBI")
+_SECTION = struct.Struct("<BI")
+
+_FUEL_FLOATS = (
+    "fuel_left", "fuel_per_lap", "fuel_per_lap_mean", "fuel_per_lap_worst", "last_lap_time",
+    "fuel_needed_to_finish", "fuel_needed_worst", "margin", "fuel_to_add",
+)
+_FUEL = struct.Struct("<9d5i")
+
+_WHEELS = ("front_left", "front_right", "rear_left", "rear_right")
+_TYRE_KEYS = tuple(f"{w}_wear" for w in _WHEELS) + tuple(f"{w}_temp" for w in _WHEELS)
+_TYRES = struct.Struct("<8f")
+
+_TRACK_HEAD = struct.Struct("<iifB")
+_CAR_COUNT = struct.Struct("<H")
+_CAR = struct.Struct("<3fiB")
+
+
+def _encode_fuel(d):
+    window = d.get("pit_window") or (-1, -1)
+    stops = d.get("stops_needed", 0)
+    return _FUEL.pack(
+        *(float(d.get(k, 0.0)) for k in _FUEL_FLOATS),
+        int(d.get("laps_sampled", 0)), int(d.get("laps_left", 0)), int(window[0]), int(window[1]),
+        -1 if stops is None else int(stops),
+    )
+
+
+def _decode_fuel(buf):
+    values = _FUEL.unpack(buf)
+    d = dict(zip(_FUEL_FLOATS, values))
+    d["laps_sampled"], d["laps_left"], start, end, stops = values[len(_FUEL_FLOATS):]
+    d["pit_window"] = (start, end) if start >= 0 else None
+    d["stops_needed"] = stops if stops >= 0 else None
+    return d
+
+
+def _encode_tyres(d):
+    return _TYRES.pack(*(float(d[k]) for k in _TYRE_KEYS))
+
+
+def _decode_tyres(buf):
+    return dict(zip(_TYRE_KEYS, _TYRES.unpack(buf)))
+
+
+def _encode_track(d):
+    name = (d.get("track_name") or "").encode("utf-8")[:255]
+    player_id = d.get("player_car_id")
+    heading = d.get("player_car_rotation")
+    parts = [
+        _TRACK_HEAD.pack(
+            int(getattr(d.get("flag"), "value", d.get("flag")) or 0),
+            -1 if player_id is None else int(player_id),
+            math.nan if heading is None else float(heading),
+            len(name),
+        ),
+        name,
+    ]
+    cars = d.get("cars_coordinates") or ()
+    parts.append(_CAR_COUNT.pack(len(cars)))
+    for car in cars:
+        car_id = car.get("car_id")
+        parts.append(_CAR.pack(car["x"], car["y"], car["z"], -1 if car_id is None else car_id, car["is_player"]))
+    return b"".join(parts)
+
+
+def _decode_track(buf):
+    flag, player_id, heading, name_len = _TRACK_HEAD.unpack_from(buf, 0)
+    offset = _TRACK_HEAD.size
+    name = bytes(buf[offset:offset + name_len]).decode("utf-8", errors="ignore")
+    offset += name_len
+    (count,) = _CAR_COUNT.unpack_from(buf, offset)
+    offset += _CAR_COUNT.size
+    cars = [
+        {"x": x, "y": y, "z": z, "car_id": None if car_id < 0 else car_id, "is_player": bool(is_player)}
+        for x, y, z, car_id, is_player in _CAR.iter_unpack(buf[offset:offset + count * _CAR.size])
+    ]
+    try:
+        flag = acc.ACC_FLAG_TYPE(flag)
+    except ValueError:
+        pass
+
+    track = get_track(name)
+    return {
+        "track_name": track.name,
+        "path_to_points": track.points_path,
+        "track": track,
+        "flag": flag,
+        "track_points": track.points,
+        "track_index": track.index,
+        "cars_coordinates": cars,
+        "player_car_id": None if player_id < 0 else player_id,
+        "player_car_rotation": None if math.isnan(heading) else heading,
+    }
+
+
+# view name -> (wire code, encode, decode)
+CODECS = {
+    "fuel": (1, _encode_fuel, _decode_fuel),
+    "tyres": (2, _encode_tyres, _decode_tyres),
+    "track": (3, _encode_track, _decode_track),
+}
+_BY_CODE = {code: (view, decode) for view, (code, _, decode) in CODECS.items()}
+
+
+def encode(updates, seq=0) -> bytes:
+    """One message for a ``Pipeline.run`` result ({view: data})."""
+    sections = []
+    for view, data in updates.items():
+        codec = CODECS.get(view)
+        if codec is None or data is None:
+            continue
+        code, enc, _ = codec
+        payload = enc(data)
+        sections.append(_SECTION.pack(code, len(payload)))
+        sections.append(payload)
+    return _HEADER.pack(MAGIC, VERSION, len(sections) // 2, seq & 0xFFFFFFFF) + b"".join(sections)
+
+
+def _message_length(buf, offset=0):
+    """Length of the complete message at ``offset``, or None if more bytes are needed."""
+    if len(buf) - offset < _HEADER.size:
+        return None
+    magic, version, count, _ = _HEADER.unpack_from(buf, offset)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("not a telemetry broadcast stream")
+    end = offset + _HEADER.size
+    for _ in range(count):
+        if len(buf) - end < _SECTION.size:
+            return None
+        end += _SECTION.size + _SECTION.unpack_from(buf, end)[1]
+    return end - offset if end <= len(buf) else None
+
+
+def decode(message):
+    """(sequence, {view: data}) from one complete message."""
+    _, _, count, seq = _HEADER.unpack_from(message, 0)
+    offset = _HEADER.size
+    updates = {}
+    for _ in range(count):
+        code, length = _SECTION.unpack_from(message, offset)
+        offset += _SECTION.size
+        entry = _BY_CODE.get(code)
+        if entry is not None:
+            view, dec = entry
+            updates[view] = dec(memoryview(message)[offset:offset + length])
+        offset += length
+    return seq, updates
+
+
+class Publisher:
+    """Sends pipeline results to every connected subscriber without blocking."""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, max_backlog=MAX_BACKLOG):
+        self.max_backlog = max_backlog
+        self.seq = 0
+        self.dropped = 0
+        self._clients = {}  # socket -> pending bytes
+
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((host, port))
+        self._server.listen()
+        self._server.setblocking(False)
+        self.address = self._server.getsockname()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def _accept(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except (BlockingIOError, InterruptedError):
+                return
+            conn.setblocking(False)
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            self._clients[conn] = bytearray()
+
+    def _flush(self, conn, pending):
+        try:
+            sent = conn.send(pending)
+        except (BlockingIOError, InterruptedError):
+            return True
+        except OSError:
+            return False
+        del pending[:sent]
+        return True
+
+    def publish(self, updates):
+        self._accept()
+        if not updates or not self._clients:
+            return
+        self.seq += 1
+        message = encode(updates, self.seq)
+
+        for conn, pending in list(self._clients.items()):
+            if len(pending) > self.max_backlog:
+                self.dropped += 1  # slow reader: skip this message, keep the stream whole
+            else:
+                pending += message
+            if not self._flush(conn, pending):
+                conn.close()
+                del self._clients[conn]
+
+    def close(self):
+        for conn in self._clients:
+            conn.close()
+        self._clients.clear()
+        self._server.close()
+
+
+class Subscriber:
+    """Receives pipeline results from a ``Publisher``.
+
+    ``poll()`` reads whatever has arrived without blocking and returns the
+    newest data per view ({} when nothing new), reconnecting as needed. A
+    connection attempt is started without waiting and picked up by a later
+    poll once it completes, so a missing publisher never stalls the caller.
+    """
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, clock=time.monotonic):
+        self.address = (host, port)
+        self.clock = clock
+        self.last_seq = None
+        self.messages = 0
+
+        self._sock = None
+        self._connecting = None
+        self._buf = bytearray()
+        self._next_attempt = 0.0
+
+    @property
+    def connected(self):
+        return self._sock is not None
+
+    def connect(self):
+        """The connected socket, or None while there is none yet; never blocks."""
+        if self._sock is not None:
+            return self._sock
+        now = self.clock()
+        if self._connecting is None:
+            if now < self._next_attempt:
+                return None
+            self._next_attempt = now + RECONNECT_INTERVAL
+            sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            sock.setblocking(False)
+            if sock.connect_ex(self.address) not in (0, *_IN_PROGRESS):
+                sock.close()
+                return None
+            self._connecting = sock
+
+        sock = self._connecting
+        try:
+            _, done, failed = select.select([], [sock], [sock], 0)
+        except OSError:
+            done, failed = [], [sock]
+        if not done and not failed:
+            if now >= self._next_attempt:
+                # still nothing after a whole interval: start over
+                self._connecting = None
+                sock.close()
+            return None
+
+        self._connecting = None
+        if failed or sock.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR):
+            sock.close()
+            return None
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._sock = sock
+        self._buf.clear()
+        return sock
+
+    def close(self):
+        if self._connecting is not None:
+            self._connecting.close()
+            self._connecting = None
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+    def poll(self):
+        if self.connect() is None:
+            return {}
+        while True:
+            try:
+                chunk = self._sock.recv(65536)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                chunk = b""
+            if not chunk:
+                self.close()  # publisher went away; retry later
+                break
+            self._buf += chunk
+        return self.feed()
+
+    def feed(self, data=b""):
+        """Append received ``data`` and decode every complete message buffered.
+
+        Returns the newest data per view; a partial message waits for the
+        rest. A corrupt stream drops the connection.
+        """
+        self._buf += data
+        updates = {}
+        offset = 0
+        try:
+            while True:
+                length = _message_length(self._buf, offset)
+                if length is None:
+                    break
+                self.last_seq, views = decode(bytes(self._buf[offset:offset + length]))
+                updates.update(views)
+                self.messages += 1
+                offset += length
+        except ValueError:
+            self.close()
+            offset = len(self._buf)
+        del self._buf[:offset]
+        return updates
@@ -1,30 +1,123 @@
-from PySide6.QtCore import QTimer
-from .processors.fuel import process_fuel
-from .processors.tires import process_tires
-from .processors.track import process_track
+import threading
+import time
+
+from PySide6.QtCore import QCoreApplication, QTimer
+from .instrument import PROBES
+from .pipeline import Pipeline
+from .processors.track_registry import get_track
+from .telemetry.acquisition import DEFAULT_HZ, AcquisitionWorker
+
+# without a frame by then (no game running) the first track tick loads the track
+PRELOAD_TIMEOUT = 30.0  # s
 
 
 class AppController:
-    def __init__(self, telemetry, window):
+    """Feeds the window from shared memory, or from a publisher's broadcast.
+
+    With a ``publisher`` every pipeline result is also broadcast (see
+    ``broadcast.py``). With a ``subscriber`` the controller neither reads
+    telemetry nor runs processors: it only applies what it receives.
+
+    While acquisition idles (menus, pause, no game) the timer slows down with
+    it, and ticks without new frames do nothing.
+    """
+
+    def __init__(
+        self, telemetry, window, acquisition_hz=DEFAULT_HZ, recorder=None, pipeline=None,
+        publisher=None, subscriber=None,
+    ):
         self.telemetry = telemetry
         self.window = window
+        self.publisher = publisher
+        self.subscriber = subscriber
+
+        # shared memory is polled off the GUI thread; tick() only consumes
+        self.acquisition = None
+        if subscriber is None:
+            self.acquisition = AcquisitionWorker(telemetry, hz=acquisition_hz, recorder=recorder)
+            # minimap pace follows the frames' clock, so replays keep real speeds
+            window.track.map.clock = self.frame_clock
+        self._last_seq = 0
+        self._frame_time = None
 
+        # each processor runs at its own rate; the timer serves the fastest
+        self.pipeline = pipeline if pipeline is not None else Pipeline()
+
+        self.interval_ms = max(1, int(self.pipeline.tick_interval() * 1000))
+        self.idle = False
         self.timer = QTimer()
-        self.timer.setInterval(200)
+        self.timer.setInterval(self.interval_ms)
         self.timer.timeout.connect(self.tick)
 
+        self._stopping = threading.Event()
+        self.track_preload = None
+
+    def _preload_track(self):
+        """Load the track named by the first frame, off the GUI thread."""
+        arrived = self.acquisition.first_frame
+        deadline = time.monotonic() + PRELOAD_TIMEOUT
+        # waits in idle periods, so stop() is noticed without a busy poll
+        while not self._stopping.is_set() and time.monotonic() < deadline:
+            if arrived.wait(self.acquisition.rate.idle_period):
+                if not self._stopping.is_set():
+                    get_track(self.acquisition.ring.latest().sm.Static.track)
+                return
+
     def start(self):
-        self.telemetry.connect()
+        if self.acquisition is not None:
+            self.telemetry.connect()
+            self.acquisition.start()
+            # the first track tick then finds the track loaded (or waits for it)
+            self.track_preload = threading.Thread(target=self._preload_track, name="track-preload", daemon=True)
+            self.track_preload.start()
+        app = QCoreApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop)
         self.window.show()
         self.timer.start()
 
-    def tick(self):
-        sm = self.telemetry.get_sm()
-        if sm is None:
+    def stop(self):
+        self._stopping.set()
+        self.timer.stop()
+        if self.acquisition is not None:
+            self.acquisition.stop()
+        if self.publisher is not None:
+            self.publisher.close()
+        if self.subscriber is not None:
+            self.subscriber.close()
+
+    def frame_clock(self) -> float:
+        """Time of the newest frame consumed (see ``acquisition.frame_time``)."""
+        return time.perf_counter() if self._frame_time is None else self._frame_time
+
+    def _updates(self):
+        if self.subscriber is not None:
+            return self.subscriber.poll()
+
+        frames = self.acquisition.ring.since(self._last_seq)
+        if not frames:
+            return {}
+        self._last_seq = frames[-1].seq
+        self._frame_time = frames[-1].time
+        updates = self.pipeline.run(frames)
+        if self.publisher is not None:
+            self.publisher.publish(updates)
+        return updates
+
+    def _follow_acquisition_rate(self):
+        idle = self.acquisition.rate.idle
+        if idle == self.idle:
             return
-        d = process_fuel(sm)
-        self.window.fuel.update_view(d)
-        tire_data = process_tires(sm)
-        self.window.tyres.update_view(tire_data)
-        track_data = process_track(sm)
-        self.window.track.update_view(track_data)
\ No newline at end of file
+        self.idle = idle
+        idle_ms = int(self.acquisition.rate.idle_period * 1000)
+        self.timer.setInterval(max(self.interval_ms, idle_ms) if idle else self.interval_ms)
+
+    def tick(self):
+        if self.acquisition is not None:
+            self._follow_acquisition_rate()
+        # one update per view, however many processors or frames fed it
+        for view, data in self._updates().items():
+            t0 = PROBES.start()
+            getattr(self.window, view).update_view(data)
+            if t0:
+                PROBES.stop(f"view.{view}", t0)
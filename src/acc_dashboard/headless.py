@@ -0,0 +1,218 @@
+"""Run the processors without Qt.
+
+For recording, strategy and batch analysis on the sim rig: the same
+``Pipeline`` the dashboard runs, driven from a plain loop, with the sector
+pace kept by ``TrackPace`` instead of the minimap. Results are written as
+NDJSON and/or broadcast to dashboards started with ``--subscribe``. Nothing
+imported from here loads PySide6.
+
+Examples:
+    acc-dashboard-headless --publish
+    acc-dashboard-headless --record session.accrec
+    acc-dashboard-headless --replay session.accrec --replay-speed 0 --out analysis.ndjson
+"""
+
+import argparse
+import json
+import sys
+import time
+
+from .broadcast import DEFAULT_HOST, DEFAULT_PORT, Publisher
+from .instrument import PROBES
+from .pipeline import Pipeline
+from .processors.pace import TrackPace
+from .telemetry.acquisition import DEFAULT_HZ, AdaptiveRate, Frame, frame_time
+from .telemetry.mapped import MappedTelemetry, create_page_files
+from .telemetry.recording import SessionRecorder
+from .telemetry.replay import ReplayTelemetry
+from .telemetry.shared_memory import Telemetry
+
+
+class HeadlessRunner:
+    """Polls a telemetry source and runs the pipeline on each new frame.
+
+    ``out`` (a text file) gets one JSON line per run that updated anything:
+    the time, the fuel and tyre views, and the player's sector pace whenever
+    the track view ran. With ``hz`` 0 every poll follows the previous one
+    at once (batch replays); otherwise polling idles like the dashboard's
+    (see ``AdaptiveRate``).
+    """
+
+    def __init__(
+        self, telemetry, hz=DEFAULT_HZ, pipeline=None, recorder=None, publisher=None, out=None,
+        clock=time.perf_counter,
+    ):
+        self.telemetry = telemetry
+        self.rate = AdaptiveRate(hz) if hz > 0 else None
+        self.clock = clock
+        self.pipeline = pipeline if pipeline is not None else Pipeline(clock=clock)
+        self.pace = TrackPace(clock=clock)
+        self.recorder = recorder
+        self.publisher = publisher
+        self.out = out
+
+        self.frames = 0
+        self.errors = 0
+        self._stopped = False
+
+    def poll(self):
+        """Read one frame and process it; returns the pipeline's {view: result}."""
+        t0 = PROBES.start()
+        try:
+            sm = self.telemetry.get_sm()
+        except Exception:
+            # a bad read must not end the run; try again next period
+            sm = None
+            self.errors += 1
+        PROBES.stop("telemetry.get_sm", t0)
+        now = self.clock()
+        if self.rate is not None:
+            self.rate.update(sm, now)
+        if sm is None:
+            return {}
+        PROBES.count("telemetry.frames")
+
+        self.frames += 1
+        if self.recorder is not None:
+            self.recorder.write(sm)
+
+        frame = Frame(self.frames, frame_time(self.telemetry, now), sm)
+        updates = self.pipeline.run([frame], now)
+        if "track" in updates:
+            t0 = PROBES.start()
+            self.pace.update_view(updates["track"], frame.time)
+            PROBES.stop("pace.update", t0)
+        if self.publisher is not None:
+            self.publisher.publish(updates)
+        if self.out is not None and updates:
+            self._write(now, updates)
+        return updates
+
+    def _write(self, now, updates):
+        line = {"t": round(now, 4)}
+        for view in ("fuel", "tyres"):
+            if view in updates:
+                line[view] = updates[view]
+        if "track" in updates:
+            line["pace"] = self.pace.summary()
+        self.out.write(json.dumps(line) + "\n")
+
+    def stop(self):
+        self._stopped = True
+
+    def run(self, duration=None):
+        """Poll until stopped, ``duration`` seconds passed or a replay ends."""
+        start = next_t = time.perf_counter()
+        while not self._stopped:
+            self.poll()
+            if getattr(self.telemetry, "finished", False):
+                break
+            now = time.perf_counter()
+            if duration is not None and now - start >= duration:
+                break
+            if self.rate is None:
+                continue
+            next_t += self.rate.period
+            delay = next_t - now
+            if delay < 0:
+                # fell behind, don't try to catch up with a burst
+                next_t = now
+                delay = 0
+            time.sleep(delay)
+
+    def close(self):
+        if self.recorder is not None:
+            self.recorder.close()
+        if self.publisher is not None:
+            self.publisher.close()
+        close = getattr(self.telemetry, "close", None)
+        if close is not None:
+            close()
+        if self.out is not None and self.out is not sys.stdout:
+            self.out.close()
+
+
+def build_parser():
+    ap = argparse.ArgumentParser(prog="acc-dashboard-headless", description="Run the processors without a window.")
+    ap.add_argument(
+        "--hz", type=float, default=DEFAULT_HZ,
+        help=f"Shared memory polling rate (default {DEFAULT_HZ:g} Hz).",
+    )
+    ap.add_argument("--record", metavar="PATH", help="Record raw telemetry to PATH while running.")
+    ap.add_argument("--replay", metavar="PATH", help="Process a recording instead of reading ACC.")
+    ap.add_argument(
+        "--replay-speed", type=float, default=1.0,
+        help="Replay rate: 1 is real time, N is N times faster, 0 processes every frame as fast as possible.",
+    )
+    ap.add_argument(
+        "--pages", metavar="DIR",
+        help="Read file-backed shared-memory pages from DIR, creating zero-filled ones if missing.",
+    )
+    ap.add_argument(
+        "--publish", metavar="PORT", type=int, nargs="?", const=DEFAULT_PORT,
+        help=f"Broadcast processed telemetry to subscriber dashboards on PORT (default {DEFAULT_PORT}).",
+    )
+    ap.add_argument("--out", metavar="PATH", help="Write results as NDJSON to PATH ('-' for stdout).")
+    ap.add_argument("--duration", type=float, help="Stop after this many seconds.")
+    ap.add_argument("--perf-export", metavar="PATH", help="Collect hot-path timings and write them to PATH (.csv or .json).")
+    return ap
+
+
+def parse_args(argv, ap=None):
+    return (ap or build_parser()).parse_args(argv[1:])
+
+
+def main():
+    ap = build_parser()
+    args = parse_args(sys.argv, ap)
+    PROBES.enabled = bool(args.perf_export)
+    clock = time.perf_counter
+    hz = args.hz
+
+    publisher = None
+    if args.publish is not None:
+        try:
+            publisher = Publisher(DEFAULT_HOST, args.publish)
+        except OSError as e:
+            ap.error(f"cannot publish on port {args.publish}: {e.strerror or e}")
+
+    if args.replay:
+        telemetry = ReplayTelemetry(args.replay, speed=args.replay_speed)
+        telemetry.connect()
+        if not args.replay_speed:
+            # batch: rates follow the recording's clock, not the wall's
+            hz = 0
+            clock = lambda: telemetry.last_time  # noqa: E731
+    elif args.record:
+        # recordings keep every field, which only the full reader decodes
+        telemetry = Telemetry()
+    else:
+        if args.pages:
+            try:
+                create_page_files(args.pages)
+            except OSError as e:
+                ap.error(f"cannot use --pages {args.pages}: {e.strerror or e}")
+        telemetry = MappedTelemetry(args.pages)
+        telemetry.connect()
+
+    recorder = SessionRecorder(args.record) if args.record else None
+    out = None
+    if args.out:
+        out = sys.stdout if args.out == "-" else open(args.out, "w", encoding="utf-8")
+
+    runner = HeadlessRunner(
+        telemetry, hz=hz, recorder=recorder, publisher=publisher, out=out, clock=clock,
+    )
+    try:
+        runner.run(args.duration)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        runner.close()
+        if args.perf_export:
+            PROBES.export(args.perf_export)
+    print(f"{runner.frames} frames processed", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Low-overhead timings of the dashboard's hot paths.
+
+Call sites bracket the work with the shared ``PROBES``::
+
+    t0 = PROBES.start()
+    sm = telemetry.get_sm()
+    PROBES.stop("telemetry.get_sm", t0)
+
+While ``PROBES.enabled`` is false ``start`` returns 0.0 without reading the
+clock and ``stop`` returns at once, so a disabled probe is two method calls.
+Enabled, each stage keeps a fixed-size histogram of log-spaced buckets
+(``BUCKETS_PER_DECADE`` per decade from ``MIN_SECONDS``), a running
+count/total/max and its call rate over the last ``RATE_WINDOW`` seconds;
+nothing grows with the number of samples. ``PROBES.count`` records a rate
+without a duration.
+
+``snapshot()`` gives p50/p99 per stage, and ``export(path)`` writes the same
+as CSV (``.csv``) or JSON (anything else). Nothing here imports Qt.
+"""
+
+import csv
+import json
+import math
+import time
+from array import array
+
+MIN_SECONDS = 1e-6
+DECADES = 7  # 1 us .. 10 s
+BUCKETS_PER_DECADE = 10
+BUCKET_COUNT = DECADES * BUCKETS_PER_DECADE
+RATE_WINDOW = 1.0  # s
+
+CSV_FIELDS = ("stage", "count", "rate_hz", "mean_us", "p50_us", "p90_us", "p99_us", "max_us")
+
+
+def _bucket(seconds):
+    if seconds <= MIN_SECONDS:
+        return 0
+    b = int(math.log10(seconds / MIN_SECONDS) * BUCKETS_PER_DECADE)
+    return b if b < BUCKET_COUNT else BUCKET_COUNT - 1
+
+
+def _bucket_value(b):
+    """Geometric middle of bucket ``b``, in seconds."""
+    return MIN_SECONDS * 10 ** ((b + 0.5) / BUCKETS_PER_DECADE)
+
+
+class Histogram:
+    """Durations of one stage in fixed log-spaced buckets, plus its rate."""
+
+    def __init__(self):
+        self.buckets = array("L", bytes(array("L").itemsize * BUCKET_COUNT))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.rate = 0.0
+
+        self._window_start = None
+        self._window_count = 0
+
+    def event(self, now):
+        """Count one call towards the rate."""
+        if self._window_start is None:
+            self._window_start = now
+        self._window_count += 1
+        elapsed = now - self._window_start
+        if elapsed >= RATE_WINDOW:
+            self.rate = self._window_count / elapsed
+            self._window_start = now
+            self._window_count = 0
+
+    def add(self, seconds, now):
+        self.buckets[_bucket(seconds)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.event(now)
+
+    def percentile(self, q):
+        """Approximate ``q`` quantile (0..1) in seconds; 0.0 with no samples."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for b, n in enumerate(self.buckets):
+            seen += n
+            if n and seen >= rank:
+                return min(_bucket_value(b), self.max)
+        return self.max
+
+    def snapshot(self, now=None):
+        rate = self.rate
+        if now is not None and self._window_start is not None and now - self._window_start >= 2 * RATE_WINDOW:
+            rate = 0.0  # no longer called
+        return {
+            "count": self.count,
+            "rate_hz": rate,
+            "mean_us": self.total / self.count * 1e6 if self.count else 0.0,
+            "p50_us": self.percentile(0.50) * 1e6,
+            "p90_us": self.percentile(0.90) * 1e6,
+            "p99_us": self.percentile(0.99) * 1e6,
+            "max_us": self.max * 1e6,
+        }
+
+
+class Probes:
+    def __init__(self, clock=time.perf_counter):
+        self.enabled = False
+        self.clock = clock
+        self.stages = {}
+
+    def stage(self, name) -> Histogram:
+        h = self.stages.get(name)
+        if h is None:
+            h = self.stages[name] = Histogram()
+        return h
+
+    def start(self) -> float:
+        return self.clock() if self.enabled else 0.0
+
+    def stop(self, name, t0):
+        if not t0:
+            return
+        now = self.clock()
+        self.stage(name).add(now - t0, now)
+
+    def count(self, name):
+        if self.enabled:
+            h = self.stage(name)
+            h.count += 1
+            h.event(self.clock())
+
+    def reset(self):
+        self.stages = {}
+
+    def snapshot(self):
+        """{stage: {count, rate_hz, mean_us, p50_us, p90_us, p99_us, max_us}}, by name."""
+        now = self.clock()
+        # copied first: the acquisition thread may add a stage meanwhile
+        stages = sorted(list(self.stages.items()), key=lambda kv: kv[0])
+        return {name: h.snapshot(now) for name, h in stages}
+
+    def export(self, path):
+        path = str(path)
+        stats = self.snapshot()
+        if path.lower().endswith(".csv"):
+            with open(path, "w", newline="", encoding="utf-8") as f:
+                writer = csv.DictWriter(f, fieldnames=CSV_FIELDS)
+                writer.writeheader()
+                for name, s in stats.items():
+                    writer.writerow({"stage": name, **s})
+        else:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"time": time.time(), "stages": stats}, f, indent=2)
+        return path
+
+
+PROBES = Probes()
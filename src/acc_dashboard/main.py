@@ -1,19 +1,172 @@
+import argparse
+import json
 import sys
+import time
+from PySide6.QtCore import QEvent, QObject, QTimer
 from PySide6.QtWidgets import QApplication
 
-from .controller import AppController
-from .telemetry.shared_memory import Telemetry
+from .instrument import PROBES
+from .telemetry import DEFAULT_HZ
 from .ui.main_window import MainWindow
 
 
+def build_parser():
+    ap = argparse.ArgumentParser(prog="acc-dashboard")
+    ap.add_argument(
+        "--hz", type=float, default=DEFAULT_HZ,
+        help=f"Shared memory polling rate (default {DEFAULT_HZ:g} Hz).",
+    )
+    ap.add_argument("--record", metavar="PATH", help="Record raw telemetry to PATH while running.")
+    ap.add_argument("--replay", metavar="PATH", help="Play back a recording instead of reading ACC.")
+    ap.add_argument(
+        "--replay-speed", type=float, default=1.0,
+        help="Replay rate: 1 is real time, N is N times faster, 0 is as fast as possible.",
+    )
+    ap.add_argument(
+        "--pages", metavar="DIR",
+        help="Read file-backed shared-memory pages from DIR instead of the game's, "
+             "creating zero-filled ones if missing (see telemetry/mapped.py).",
+    )
+    ap.add_argument(
+        "--publish", metavar="PORT", type=int, nargs="?", const=0,
+        help="Also broadcast processed telemetry to subscribers on PORT (or the default port).",
+    )
+    ap.add_argument(
+        "--subscribe", metavar="HOST:PORT", nargs="?", const="",
+        help="Show another dashboard's broadcast instead of reading telemetry (default: this machine).",
+    )
+    ap.add_argument(
+        "--startup-profile", metavar="SECONDS", type=float, nargs="?", const=5.0,
+        help="Print startup timestamps as JSON and exit, waiting up to SECONDS for the track preload.",
+    )
+    ap.add_argument("--perf", action="store_true", help="Collect hot-path timings from the start (F3 shows them).")
+    ap.add_argument(
+        "--perf-export", metavar="PATH",
+        help="Where F4 and exit write the timings (.csv or .json); implies --perf.",
+    )
+    return ap
+
+
+def parse_args(argv, ap=None):
+    # anything else is left for Qt (-platform, -style, ...)
+    args, _ = (ap or build_parser()).parse_known_args(argv[1:])
+    return args
+
+
+class _FirstPaint(QObject):
+    """Calls ``callback`` once, after the watched widget's first paint."""
+
+    def __init__(self, widget, callback):
+        super().__init__(widget)
+        self._callback = callback
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Paint and self._callback is not None:
+            callback, self._callback = self._callback, None
+            obj.removeEventFilter(self)
+            # let this paint finish first
+            QTimer.singleShot(0, callback)
+        return False
+
+
+def _start(args, window, fail):
+    """Everything the first frame does not need: telemetry, processors, sockets.
+
+    Problems with the command line are reported through ``fail(message)``,
+    and None is returned.
+    """
+    # imported here so none of it delays the first paint
+    from .broadcast import DEFAULT_HOST, DEFAULT_PORT, Publisher, Subscriber
+    from .controller import AppController
+
+    publisher = None
+    if args.publish is not None:
+        port = args.publish or DEFAULT_PORT
+        try:
+            publisher = Publisher(DEFAULT_HOST, port)
+        except OSError as e:
+            return fail(f"cannot publish on port {port}: {e.strerror or e}")
+
+    if args.pages and args.subscribe is None and not args.replay and not args.record:
+        from .telemetry.mapped import create_page_files
+        try:
+            create_page_files(args.pages)
+        except OSError as e:
+            if publisher is not None:
+                publisher.close()
+            return fail(f"cannot use --pages {args.pages}: {e.strerror or e}")
+
+    if args.subscribe is not None:
+        # the publishing dashboard reads telemetry for us
+        telemetry = None
+    elif args.replay:
+        from .telemetry.replay import ReplayTelemetry
+        telemetry = ReplayTelemetry(args.replay, speed=args.replay_speed)
+    elif args.record:
+        # recordings keep every field, which only the full reader decodes
+        from .telemetry.shared_memory import Telemetry
+        telemetry = Telemetry()
+    else:
+        from .telemetry.mapped import MappedTelemetry
+        telemetry = MappedTelemetry(args.pages)
+
+    recorder = None
+    if args.record:
+        from .telemetry.recording import SessionRecorder
+        recorder = SessionRecorder(args.record)
+    subscriber = None
+    if args.subscribe is not None:
+        host, _, port = args.subscribe.rpartition(":")
+        subscriber = Subscriber(host or DEFAULT_HOST, int(port or DEFAULT_PORT))
+
+    controller = AppController(
+        telemetry, window, acquisition_hz=args.hz, recorder=recorder,
+        publisher=publisher, subscriber=subscriber,
+    )
+    controller.start()
+    return controller
+
+
 def main():
-    app = QApplication(sys.argv)
+    ap = build_parser()
+    args = parse_args(sys.argv, ap)
+    marks = [("main", time.time())]
 
-    telemetry = Telemetry()
+    PROBES.enabled = args.perf or bool(args.perf_export)
+    app = QApplication(sys.argv)
     window = MainWindow()
+    if args.perf_export:
+        window.perf_export_path = args.perf_export
+        app.aboutToQuit.connect(lambda: PROBES.export(args.perf_export))
+    marks.append(("window", time.time()))
+    started = []
 
-    controller = AppController(telemetry, window)
-    controller.start()
+    def fail(message):
+        # what ap.error prints; its SystemExit would not get out of Qt's loop
+        ap.print_usage(sys.stderr)
+        print(f"{ap.prog}: error: {message}", file=sys.stderr)
+        app.exit(2)
+
+    def warm():
+        marks.append(("first_paint", time.time()))
+        controller = _start(args, window, fail)
+        if controller is None:
+            return
+        started.append(controller)
+        marks.append(("started", time.time()))
+        if args.startup_profile:
+            controller = started[0]
+            if controller.track_preload is not None:
+                controller.track_preload.join(args.startup_profile)
+                marks.append(("track_ready", time.time()))
+            print(json.dumps(dict(marks)), flush=True)
+            controller.stop()
+            app.quit()
+
+    # show the window first, warm the rest once it has painted
+    _FirstPaint(window, warm)
+    window.show()
 
     sys.exit(app.exec())
 
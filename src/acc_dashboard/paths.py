@@ -0,0 +1,6 @@
+from pathlib import Path
+
+PACKAGE_DIR = Path(__file__).resolve().parent
+RESOURCES_DIR = PACKAGE_DIR / "resources"
+IMAGES_DIR = RESOURCES_DIR / "images"
+TRACKS_DIR = RESOURCES_DIR / "tracks"
@@ -0,0 +1,101 @@
+"""Processor scheduling, independent of Qt.
+
+Each ``Processor`` says how often it wants to run, which shared-memory blocks
+it reads and which view its result feeds. ``Pipeline.run`` is called with the
+frames acquired since the previous call and runs only the processors that are
+due; a processor with ``hz=0`` sees every frame (physics rate), the others
+only the latest one. Results are collected per view, so each view is updated
+at most once per call however many processors or frames fed it.
+"""
+
+import time
+
+from .instrument import PROBES
+from .processors.fuel import FuelStrategy
+from .processors.tires import TyreWearEngine
+from .processors.track import process_track
+
+# run on every acquired frame
+EVERY_FRAME = 0.0
+
+
+class Processor:
+    def __init__(self, name, func, hz=EVERY_FRAME, reads=("Physics", "Graphics", "Static"), view=None):
+        self.name = name
+        self.func = func
+        self.hz = float(hz)
+        self.period = 1.0 / self.hz if self.hz > 0 else 0.0
+        self.reads = tuple(reads)
+        self.view = view
+        self.probe = f"processor.{name}"
+
+        self.next_run = 0.0
+        self.last_packets = None
+        self.runs = 0
+
+    def packets(self, sm):
+        """Packet ids of the blocks this processor reads (None for Static)."""
+        return tuple(getattr(getattr(sm, block, None), "packed_id", None) for block in self.reads)
+
+    def __repr__(self):
+        rate = "every frame" if self.hz <= 0 else f"{self.hz:g} Hz"
+        return f"Processor({self.name!r}, {rate}, reads={self.reads}, view={self.view!r})"
+
+
+def default_processors():
+    return [
+        # strategy numbers only move once a lap
+        Processor("fuel", FuelStrategy().process, hz=1.0, reads=("Physics", "Graphics", "Static"), view="fuel"),
+        # wear integrates physics over sim time, so it sees every frame
+        Processor("tires", TyreWearEngine().process, hz=EVERY_FRAME, reads=("Physics", "Graphics"), view="tyres"),
+        Processor("track", process_track, hz=30.0, reads=("Graphics", "Physics", "Static"), view="track"),
+    ]
+
+
+class Pipeline:
+    def __init__(self, processors=None, clock=time.perf_counter):
+        self.processors = list(default_processors() if processors is None else processors)
+        self.clock = clock
+
+    def tick_interval(self) -> float:
+        """Seconds between calls needed to serve the fastest rated processor."""
+        periods = [p.period for p in self.processors if p.period > 0]
+        return min(periods) if periods else 0.2
+
+    def run(self, frames, now=None):
+        """Run due processors over ``frames`` (oldest first); returns {view: result}."""
+        if not frames:
+            return {}
+        now = self.clock() if now is None else now
+        latest = frames[-1].sm
+
+        updates = {}
+        for proc in self.processors:
+            if proc.period > 0:
+                if now < proc.next_run:
+                    continue
+                # keep the cadence, but after the first run or a stall restart
+                # it from now instead of bursting to catch up
+                proc.next_run += proc.period
+                if proc.next_run <= now:
+                    proc.next_run = now + proc.period
+                todo = (latest,)
+            else:
+                todo = [f.sm for f in frames]
+
+            result = None
+            ran = False
+            for sm in todo:
+                packets = proc.packets(sm)
+                if packets == proc.last_packets and any(p is not None for p in packets):
+                    continue  # nothing it reads has changed
+                proc.last_packets = packets
+                t0 = PROBES.start()
+                result = proc.func(sm)
+                PROBES.stop(proc.probe, t0)
+                proc.runs += 1
+                ran = True
+
+            if ran and proc.view is not None:
+                updates[proc.view] = result
+        return updates
@@ -1,22 +1,182 @@
-def process_fuel(sm): 
-    fuel_left = sm.Physics.fuel
-    fuel_per_lap = sm.Graphics.fuel_per_lap
-    last_lap_time = sm.Graphics.last_time
-    if last_lap_time <= 0 or last_lap_time > 3600:
-        track_name = sm.Static.track.split("\x00", 1)[0].strip()
-        f = open(f"src/acc_dashboard/resources/tracks/{track_name}/laptime.txt", "r")
-        last_lap_time = float(f.read().strip()) * 1000
-        f.close()
-    session_time_left = sm.Graphics.session_time_left  
-    laps_left = int(session_time_left // last_lap_time) + 1
-    fuel_needed = fuel_per_lap * laps_left
-    margin = fuel_left - fuel_needed
-
-    return {
-        "fuel_left": fuel_left,
-        "fuel_per_lap": fuel_per_lap,
-        "last_lap_time": last_lap_time / 1000,
-        "laps_left": laps_left,
-        "fuel_needed_to_finish": fuel_needed,
-        "margin": margin,
-    }
+import math
+from array import array
+
+from .track_registry import get_track
+
+# laps of history the strategy works from
+DEFAULT_HISTORY = 8
+# extra fuel kept on top of the projection, in laps of worst-case use
+DEFAULT_SAFETY_LAPS = 1.0
+
+
+class LapRing:
+    """Fixed-size ring of per-lap values with rolling statistics.
+
+    ``push`` keeps the running sum in O(1); the trimmed mean and extremes are
+    refreshed over at most ``capacity`` values, which happens once a lap.
+    """
+
+    def __init__(self, capacity=DEFAULT_HISTORY):
+        self.capacity = max(1, capacity)
+        self.clear()
+
+    def clear(self):
+        self.values = array("d", bytes(8 * self.capacity))
+        self.count = 0
+        self._head = 0
+        self.total = 0.0
+
+        self.mean = 0.0
+        self.trimmed_mean = 0.0
+        self.low = 0.0
+        self.high = 0.0
+
+    def __len__(self):
+        return self.count
+
+    def push(self, value):
+        if self.count == self.capacity:
+            self.total -= self.values[self._head]
+        else:
+            self.count += 1
+        self.values[self._head] = value
+        self._head = (self._head + 1) % self.capacity
+        self.total += value
+
+        live = sorted(self.values[:self.count])
+        self.mean = self.total / self.count
+        self.low = live[0]
+        self.high = live[-1]
+        # drop the best and worst lap once there are enough to spare
+        trimmed = live[1:-1] if self.count >= 4 else live
+        self.trimmed_mean = sum(trimmed) / len(trimmed)
+
+
+class FuelStrategy:
+    """Incremental fuel strategy for one session.
+
+    Every completed green lap adds its fuel use and lap time to two
+    ``LapRing``s. Each tick then projects, from the cached statistics, the
+    laps left, the fuel needed (typical and worst case), how much to add and
+    the window of laps in which a single stop can still make the finish.
+    """
+
+    def __init__(self, history=DEFAULT_HISTORY, safety_laps=DEFAULT_SAFETY_LAPS):
+        self.safety_laps = safety_laps
+        self.fuel_used = LapRing(history)
+        self.lap_times = LapRing(history)
+        self._session = None
+        self._lap = None
+        self._lap_start_fuel = None
+        self._lap_clean = False
+        self._last_fuel = None
+
+    def reset(self):
+        self.fuel_used.clear()
+        self.lap_times.clear()
+        self._lap = None
+        self._lap_start_fuel = None
+        self._lap_clean = False
+        self._last_fuel = None
+
+    def _observe(self, sm):
+        g = sm.Graphics
+        fuel = sm.Physics.fuel
+        session = (getattr(g, "session_index", None), getattr(g.session_type, "value", g.session_type), sm.Static.track)
+        if session != self._session:
+            self.reset()
+            self._session = session
+
+        if self._last_fuel is not None and fuel > self._last_fuel + 0.5:
+            # refuelled: this lap's use is unknown
+            self._lap_clean = False
+        if g.is_in_pit_lane or g.is_in_pit:
+            self._lap_clean = False
+        self._last_fuel = fuel
+
+        lap = g.completed_lap
+        if lap != self._lap:
+            if self._lap is not None and lap == self._lap + 1 and self._lap_clean:
+                used = self._lap_start_fuel - fuel
+                lap_time = g.last_time / 1000
+                if used > 0 and lap_time > 0:
+                    self.fuel_used.push(used)
+                    self.lap_times.push(lap_time)
+            # a lap seen from its start (not joined halfway) can count
+            self._lap_clean = self._lap is not None
+            self._lap = lap
+            self._lap_start_fuel = fuel
+
+    def process(self, sm):
+        self._observe(sm)
+
+        g = sm.Graphics
+        fuel_left = sm.Physics.fuel
+
+        if self.fuel_used.count:
+            fuel_per_lap = self.fuel_used.trimmed_mean
+            worst_per_lap = self.fuel_used.high
+        else:
+            # no clean lap yet: the game's own estimate
+            fuel_per_lap = worst_per_lap = g.fuel_per_lap
+
+        if self.lap_times.count:
+            lap_time = self.lap_times.trimmed_mean
+            best_lap_time = self.lap_times.low
+        else:
+            lap_time = g.last_time / 1000
+            if lap_time <= 0 or lap_time > 3600:
+                # no valid lap yet (out-lap, session start): use the track's reference
+                lap_time = get_track(sm.Static.track).lap_time or 0.0
+            best_lap_time = lap_time
+
+        session_time_left = g.session_time_left / 1000
+        laps_left = int(session_time_left // lap_time) + 1 if lap_time > 0 else 0
+        # faster laps mean more of them before the flag
+        worst_laps_left = int(session_time_left // best_lap_time) + 1 if best_lap_time > 0 else 0
+
+        fuel_needed = fuel_per_lap * laps_left
+        worst_needed = worst_per_lap * (worst_laps_left + self.safety_laps)
+        fuel_to_add = max(0.0, worst_needed - fuel_left)
+
+        # 0: no stop, 1: one stop within pit_window, 2: one stop can't make
+        # the flag (2 or more), None: tank size unknown
+        stops_needed = 0
+        pit_window = None
+        if fuel_to_add > 0 and worst_per_lap > 0:
+            stops_needed = None
+            max_fuel = sm.Static.max_fuel
+            if max_fuel > 0:
+                # earliest: what is still needed after the stop must fit in the tank;
+                # latest: the fuel on board must last until the stop
+                earliest = max(0, math.ceil((worst_needed - max_fuel) / worst_per_lap))
+                latest = int(fuel_left // worst_per_lap)
+                if earliest <= latest:
+                    stops_needed = 1
+                    pit_window = (g.completed_lap + earliest, g.completed_lap + latest)
+                else:
+                    stops_needed = 2
+
+        return {
+            "fuel_left": fuel_left,
+            "fuel_per_lap": fuel_per_lap,
+            "fuel_per_lap_mean": self.fuel_used.mean if self.fuel_used.count else fuel_per_lap,
+            "fuel_per_lap_worst": worst_per_lap,
+            "laps_sampled": self.fuel_used.count,
+            "last_lap_time": lap_time,
+            "laps_left": laps_left,
+            "fuel_needed_to_finish": fuel_needed,
+            "fuel_needed_worst": worst_needed,
+            "margin": fuel_left - fuel_needed,
+            "fuel_to_add": fuel_to_add,
+            "pit_window": pit_window,
+            "stops_needed": stops_needed,
+        }
+
+
+_STRATEGY = FuelStrategy()
+
+
+def process_fuel(sm):
+    """Fuel strategy for the shared default engine."""
+    return _STRATEGY.process(sm)
@@ -0,0 +1,380 @@
+import time
+from array import array
+
+from .track_index import TrackPointIndex
+
+NO_POINT = -1
+NO_SECTOR = -1
+
+DEFAULT_SECTOR_LEN = 10
+# a sector within this fraction of its previous pass counts as unchanged
+DOMINANCE_DEADBAND = 0.03
+# change that reaches full dominance
+DOMINANCE_SATURATION = 0.10
+# anything faster between two steps is a teleport (pits, reset), not driving
+MAX_SPEED = 120.0  # m/s
+
+
+class PaceStore:
+    """Per-car pace state for one track, stored as flat arrays.
+
+    Every car gets a row. Point data is ``rows x n_points`` and sector data is
+    ``rows x sector_count``, both indexed by integer point/sector index:
+
+        speed[row * n_points + i]        latest speed through point i
+        last_speed[row * n_points + i]   the speed before that
+        sec_sum / sec_cnt                running total for the current pass
+        sec_avg / sec_prev_avg           latest and previous completed pass
+    """
+
+    def __init__(self, n_points: int, sector_len: int, sector_count: int):
+        self.n_points = n_points
+        self.sector_len = max(1, sector_len)
+        self.sector_count = sector_count
+
+        # car_id -> row
+        self.rows = {}
+
+        self.speed = array("d")
+        self.last_speed = array("d")
+
+        self.sec_sum = array("d")
+        self.sec_cnt = array("l")
+        self.sec_avg = array("d")
+        self.sec_prev_avg = array("d")
+
+        # per-car scalars
+        self.last_point = array("l")
+        self.last_time = array("d")
+        self.last_sector = array("l")
+
+    def __contains__(self, car_id):
+        return car_id in self.rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def row(self, car_id):
+        return self.rows.get(car_id)
+
+    def add_car(self, car_id, now: float) -> int:
+        row = self.rows.get(car_id)
+        if row is not None:
+            return row
+
+        row = len(self.rows)
+        self.rows[car_id] = row
+
+        zeros = array("d", bytes(8 * self.n_points))
+        self.speed.extend(zeros)
+        self.last_speed.extend(zeros)
+
+        sec_zeros = array("d", bytes(8 * self.sector_count))
+        self.sec_sum.extend(sec_zeros)
+        self.sec_avg.extend(sec_zeros)
+        self.sec_prev_avg.extend(sec_zeros)
+        self.sec_cnt.extend(array("l", bytes(self.sec_cnt.itemsize * self.sector_count)))
+
+        self.last_point.append(NO_POINT)
+        self.last_time.append(now)
+        self.last_sector.append(NO_SECTOR)
+        return row
+
+    def sector_of(self, idx: int) -> int:
+        s = idx // self.sector_len
+        if s >= self.sector_count:
+            s = self.sector_count - 1
+        return s
+
+    def commit_sector(self, row: int, s: int):
+        """Commit the running sum/cnt into avg, shifting avg -> prev_avg."""
+        if s == NO_SECTOR or not 0 <= s < self.sector_count:
+            return
+        k = row * self.sector_count + s
+        cnt = self.sec_cnt[k]
+        if cnt <= 0:
+            return
+
+        self.sec_prev_avg[k] = self.sec_avg[k]
+        self.sec_avg[k] = self.sec_sum[k] / cnt
+        self.sec_sum[k] = 0.0
+        self.sec_cnt[k] = 0
+
+    def sector_avgs(self, row: int, s: int):
+        """(avg, prev_avg) for sector s of the car in ``row``."""
+        k = row * self.sector_count + s
+        return self.sec_avg[k], self.sec_prev_avg[k]
+
+    def nbytes(self) -> int:
+        arrays = (
+            self.speed, self.last_speed,
+            self.sec_sum, self.sec_cnt, self.sec_avg, self.sec_prev_avg,
+            self.last_point, self.last_time, self.last_sector,
+        )
+        return sum(a.itemsize * len(a) for a in arrays)
+
+
+class PaceEngine:
+    """Advances the pace state of the whole field in one batched step.
+
+    ``step`` takes every car's position at once, finds the nearest track
+    point for each, turns the arc length covered since the last step into a
+    speed, and writes that speed over the whole traversed point range with
+    slice assignment. Sector totals are accumulated per sector crossed rather
+    than per point, so the cost of a step no longer depends on how far a car
+    moved. ``now`` should be the frames' own clock (recorded time in a
+    replay). A move faster than ``MAX_SPEED``, backwards by more than a sector
+    or against a clock that went back resets the car instead.
+    """
+
+    def __init__(self, track_pts, track_index, sector_len: int, sector_count: int, arc=None, lap_length=None):
+        self.track_pts = track_pts
+        self.track_index = track_index
+        self.store = PaceStore(len(track_pts), sector_len, sector_count)
+
+        if arc is not None and lap_length is not None:
+            # precomputed by the track registry
+            self.arc = arc
+            self.lap_length = lap_length
+            return
+
+        # cumulative arc length up to each point, plus the full lap length
+        self.arc = array("d", [0.0])
+        for (x1, z1), (x2, z2) in zip(track_pts, track_pts[1:]):
+            self.arc.append(self.arc[-1] + ((x2 - x1) ** 2 + (z2 - z1) ** 2) ** 0.5)
+        if track_pts:
+            (x1, z1), (x2, z2) = track_pts[-1], track_pts[0]
+            self.lap_length = self.arc[-1] + ((x2 - x1) ** 2 + (z2 - z1) ** 2) ** 0.5
+        else:
+            self.lap_length = 0.0
+
+    def add_car(self, car_id, now: float) -> int:
+        return self.store.add_car(car_id, now)
+
+    def nearest_indices(self, rows, xs, zs):
+        last_point = self.store.last_point
+        nearest = self.track_index.nearest
+        return [
+            nearest(x, z, None if last_point[row] == NO_POINT else last_point[row])
+            for row, x, z in zip(rows, xs, zs)
+        ]
+
+    def step(self, car_ids, xs, zs, now: float):
+        """Advance every car in ``car_ids`` to its position (xs[k], zs[k])."""
+        store = self.store
+        n = store.n_points
+        if n == 0:
+            return
+
+        rows = [store.rows.get(car_id) for car_id in car_ids]
+        known = [k for k, row in enumerate(rows) if row is not None]
+        rows = [rows[k] for k in known]
+        closest = self.nearest_indices(rows, [xs[k] for k in known], [zs[k] for k in known])
+
+        last_point = store.last_point
+        last_time = store.last_time
+        last_sector = store.last_sector
+        arc = self.arc
+        lap = self.lap_length
+
+        for row, c in zip(rows, closest):
+            if c is None:
+                continue
+            last = last_point[row]
+
+            # First observation
+            if last == NO_POINT:
+                last_point[row] = c
+                last_time[row] = now
+                last_sector[row] = NO_SECTOR
+                continue
+
+            dt = now - last_time[row]
+            if 0 <= dt <= 1e-6 or c == last:
+                continue
+
+            back = (last - c) % n
+            if dt > 0 and back <= store.sector_len:
+                # nearest-point jitter backwards: wait until the car is past ``last``
+                continue
+
+            distance = arc[c] - arc[last]
+            if distance < 0:
+                distance += lap
+            if dt < 0 or back < n // 2 or distance > MAX_SPEED * dt:
+                # clock went back (replay looped), drove backwards or teleported - reset
+                last_point[row] = c
+                last_time[row] = now
+                last_sector[row] = NO_SECTOR
+                continue
+            speed = distance / dt
+
+            # traversed range is [last, c); c < last only when crossing the line
+            if c > last:
+                self._scatter(row, last, c, speed)
+            else:
+                self._scatter(row, last, n, speed)
+                self._scatter(row, 0, c, speed)
+
+            last_point[row] = c
+            last_time[row] = now
+
+    def _scatter(self, row: int, a: int, b: int, speed: float):
+        """Write ``speed`` over points [a, b) and accumulate their sectors."""
+        if b <= a:
+            return
+        store = self.store
+        base = row * store.n_points
+        lo, hi = base + a, base + b
+        store.last_speed[lo:hi] = store.speed[lo:hi]
+        store.speed[lo:hi] = array("d", [speed]) * (b - a)
+
+        if store.sector_count <= 0:
+            return
+
+        sec_base = row * store.sector_count
+        i = a
+        while i < b:
+            s = store.sector_of(i)
+            # last sector absorbs any leftover points past sector_count * sector_len
+            end = b if s == store.sector_count - 1 else min(b, (s + 1) * store.sector_len)
+            count = end - i
+
+            prev_s = store.last_sector[row]
+            if prev_s == NO_SECTOR:
+                store.last_sector[row] = s
+            elif s != prev_s:
+                # leaving prev sector -> commit it
+                store.commit_sector(row, prev_s)
+                store.last_sector[row] = s
+
+            store.sec_sum[sec_base + s] += speed * count
+            store.sec_cnt[sec_base + s] += count
+            i = end
+
+
+class TrackPace:
+    """Pace and sector dominance of the field on the current track, without Qt.
+
+    Fed the ``process_track`` view through ``update_view`` (or ``set_track``
+    once per track and ``set_cars`` + ``step`` every tick), like the minimap
+    is. ``dominance(s)`` compares the player's latest pass through sector
+    ``s`` with the previous one.
+    """
+
+    def __init__(self, sector_target: int = 0, clock=time.perf_counter):
+        self.sector_target = max(0, int(sector_target))
+        self.clock = clock
+
+        self.track = None
+        self.track_pts = []
+        self.track_index = None
+        self.sector_len = DEFAULT_SECTOR_LEN
+        self.sector_count = 0
+        self.cars = []
+        self.player_car_id = None
+        self.engine = PaceEngine([], None, DEFAULT_SECTOR_LEN, 0)
+        self._track_key = None
+
+    @property
+    def store(self) -> PaceStore:
+        return self.engine.store
+
+    def set_track(self, track_pts, track_index=None, track=None):
+        """Load track geometry and start fresh pace data.
+
+        ``track`` is the registry's TrackInfo for these points; when given,
+        its index, arc length and sector layout are reused.
+        """
+        self.track_pts = [(float(x), float(z)) for x, z in (track_pts or [])]
+        if track is not None and len(track) != len(self.track_pts):
+            track = None
+        self.track = track
+        if track_index is None and self.track_pts:
+            track_index = track.index if track is not None else TrackPointIndex(self.track_pts)
+        self.track_index = track_index
+
+        if track is not None:
+            self.sector_len, self.sector_count = track.sector_layout(self.sector_target)
+        elif self.track_pts:
+            if self.sector_target > 0:
+                self.sector_count = self.sector_target
+                self.sector_len = max(1, len(self.track_pts) // self.sector_count)
+            else:
+                self.sector_len = DEFAULT_SECTOR_LEN
+                self.sector_count = max(1, (len(self.track_pts) + self.sector_len - 1) // self.sector_len)
+
+        # pace data is per track point, so it doesn't survive a track change
+        self.engine = PaceEngine(
+            self.track_pts, self.track_index, self.sector_len, self.sector_count,
+            arc=track.arc if track is not None else None,
+            lap_length=track.lap_length if track is not None else None,
+        )
+
+    def set_cars(self, cars, player_car_id=None, now=None):
+        self.cars = cars or []
+        self.player_car_id = player_car_id
+        now = self.clock() if now is None else now
+        for car in self.cars:
+            car_id = car.get("car_id")
+            if car_id is not None:
+                self.engine.add_car(car_id, now)
+
+    def step(self, now=None):
+        """Advance every car with a known position to where it is now."""
+        if not self.track_pts:
+            return
+        car_ids, xs, zs = [], [], []
+        for car in self.cars:
+            if car.get("car_id") is None:
+                continue
+            if car.get("x") == 0 and car.get("z") == 0:
+                continue
+            car_ids.append(car["car_id"])
+            xs.append(car["x"])
+            zs.append(car["z"])
+        self.engine.step(car_ids, xs, zs, self.clock() if now is None else now)
+
+    def update_view(self, d, now=None):
+        # a reloaded track (edited files) comes back as a new TrackInfo
+        track_key = (d.get("track_name"), d.get("path_to_points"), d.get("track"))
+        if track_key != self._track_key:
+            self._track_key = track_key
+            self.set_track(d.get("track_points"), d.get("track_index"), d.get("track"))
+        now = self.clock() if now is None else now
+        self.set_cars(d.get("cars_coordinates", []), d.get("player_car_id"), now)
+        self.step(now)
+
+    def sector_at(self, idx: int) -> int:
+        """Sector of track point ``idx``."""
+        s = idx // self.sector_len
+        return self.sector_count - 1 if s >= self.sector_count else s
+
+    def dominance(self, s: int):
+        """Player's change in sector ``s`` against the previous pass, in [-1, 1].
+
+        Positive is faster. None when there is nothing to show: no player,
+        no data, or a change inside ``DOMINANCE_DEADBAND``.
+        """
+        if self.player_car_id is None:
+            return None
+        store = self.store
+        row = store.row(self.player_car_id)
+        if row is None or not 0 <= s < store.sector_count:
+            return None
+
+        v, v_prev = store.sector_avgs(row, s)
+        rel = (v - v_prev) / max(v_prev, 1e-6)
+        if abs(rel) < DOMINANCE_DEADBAND:
+            return None
+        return max(-1.0, min(1.0, rel / DOMINANCE_SATURATION))
+
+    def summary(self) -> dict:
+        """Plain-data snapshot: the player's sector dominance and field size."""
+        return {
+            "track_name": self.track.name if self.track is not None else None,
+            "player_car_id": self.player_car_id,
+            "cars": len(self.store),
+            "sector_count": self.sector_count,
+            "dominance": [self.dominance(s) for s in range(self.sector_count)],
+        }
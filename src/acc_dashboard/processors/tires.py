@@ -1,23 +1,20 @@
 # src/acc_dashboard/processors/tires.py
 
-import time
-import math
-
-# Persistent wear state (0.0 = new, increases toward ~1.0)
-_TYRE_WEAR = {
-    "fl": 0.0,
-    "fr": 0.0,
-    "rl": 0.0,
-    "rr": 0.0,
-}
-
-_LAST_TIME = time.time()
+from array import array
 
 # --- tuning constants (ACC-like) ---
 OPT_TEMP = 90.0          # °C
 OPT_PRESSURE = 27.5      # PSI (GT3 dry)
 BASE_WEAR_RATE = 0.00004 # baseline per second
 
+# wear is integrated on a fixed simulation-time grid
+STEP = 1.0 / 60.0        # s
+# a bigger jump in sim time (seek, session reload) is not driving
+MAX_GAP = 5.0            # s
+
+_ACC_LIVE = 2
+_WHEELS = ("front_left", "front_right", "rear_left", "rear_right")
+
 
 def _temp_multiplier(temp):
     if temp < 70:
@@ -34,93 +31,120 @@ def _pressure_multiplier(p):
     return 1.0 + abs(p - OPT_PRESSURE) * 0.08
 
 
-def process_tires(sm):
-    global _LAST_TIME
-
-    now = time.time()
-    dt = now - _LAST_TIME
-    _LAST_TIME = now
-
-    phys = sm.Physics
-    stat = sm.Static
-
-    # build a safe base snapshot first (consistent keys)
-    base = {
-        "front_left_wear":  max(0.0, 1.0 - _TYRE_WEAR["fl"]),
-        "front_right_wear": max(0.0, 1.0 - _TYRE_WEAR["fr"]),
-        "rear_left_wear":   max(0.0, 1.0 - _TYRE_WEAR["rl"]),
-        "rear_right_wear":  max(0.0, 1.0 - _TYRE_WEAR["rr"]),
-        "front_left_temp":  getattr(phys.tyre_core_temp, "front_left", 0.0),
-        "front_right_temp": getattr(phys.tyre_core_temp, "front_right", 0.0),
-        "rear_left_temp":   getattr(phys.tyre_core_temp, "rear_left", 0.0),
-        "rear_right_temp":  getattr(phys.tyre_core_temp, "rear_right", 0.0),
-    }
-
-    # if dt is weird, return snapshot but DON'T change wear
-    if dt <= 0 or dt > 0.2:
-        return base
-
-    # --- driver abuse ---
-    braking_abuse = phys.brake * (1.0 + phys.abs * 0.8)
-    traction_abuse = phys.gas * (1.0 + phys.tc * 0.6)
-
-    wheels = {
-        "fl": {
-            "temp": phys.tyre_core_temp.front_left,
-            "slip": abs(phys.slip_ratio.front_left) + abs(phys.slip_angle.front_left),
-            "load": phys.suspension_travel.front_left,
-            "pressure": phys.wheel_pressure.front_left,
-            "abuse": braking_abuse,
-        },
-        "fr": {
-            "temp": phys.tyre_core_temp.front_right,
-            "slip": abs(phys.slip_ratio.front_right) + abs(phys.slip_angle.front_right),
-            "load": phys.suspension_travel.front_right,
-            "pressure": phys.wheel_pressure.front_right,
-            "abuse": braking_abuse,
-        },
-        "rl": {
-            "temp": phys.tyre_core_temp.rear_left,
-            "slip": abs(phys.slip_ratio.rear_left) + abs(phys.slip_angle.rear_left),
-            "load": phys.suspension_travel.rear_left,
-            "pressure": phys.wheel_pressure.rear_left,
-            "abuse": traction_abuse,
-        },
-        "rr": {
-            "temp": phys.tyre_core_temp.rear_right,
-            "slip": abs(phys.slip_ratio.rear_right) + abs(phys.slip_angle.rear_right),
-            "load": phys.suspension_travel.rear_right,
-            "pressure": phys.wheel_pressure.rear_right,
-            "abuse": traction_abuse,
-        },
-    }
-
-    for k, w in wheels.items():
-        slip_energy = min(w["slip"], 3.0)
-        load_factor = 1.0 + w["load"] * 0.6
-
-        wear = (
-            BASE_WEAR_RATE
-            * slip_energy
-            * load_factor
-            * _temp_multiplier(w["temp"])
-            * _pressure_multiplier(w["pressure"])
-            * (1.0 + w["abuse"])
-            * stat.aid_tyre_rate
-            * dt
-        )
-
-        _TYRE_WEAR[k] = min(_TYRE_WEAR[k] + wear, 1.2)
-
-    # return same shape, but updated values
-    return {
-        "front_left_wear":  max(0.0, 1.0 - _TYRE_WEAR["fl"]),
-        "front_right_wear": max(0.0, 1.0 - _TYRE_WEAR["fr"]),
-        "rear_left_wear":   max(0.0, 1.0 - _TYRE_WEAR["rl"]),
-        "rear_right_wear":  max(0.0, 1.0 - _TYRE_WEAR["rr"]),
-        "front_left_temp":  wheels["fl"]["temp"],
-        "front_right_temp": wheels["fr"]["temp"],
-        "rear_left_temp":   wheels["rl"]["temp"],
-        "rear_right_temp":  wheels["rr"]["temp"],
-    }
+def _wheels(w):
+    return (w.front_left, w.front_right, w.rear_left, w.rear_right)
+
+
+def _value(v):
+    return getattr(v, "value", v)
+
+
+class TyreWearEngine:
+    """Tyre wear integrated over simulation time, one instance per dashboard.
+
+    Time comes from ``Graphics.session_time_left`` (or the lap timer when the
+    session clock stands still), so wear does not depend on how often the
+    engine is called, stops while the game is paused, and replays the same at
+    any speed. Each frame's wear rate is linearly interpolated from the
+    previous frame's and applied in fixed ``STEP`` sub-steps; time left over
+    carries into the next frame. State resets when the session changes.
+    """
+
+    def __init__(self, step=STEP):
+        self.step = step
+        self.reset()
+
+    def reset(self):
+        self.wear = array("d", bytes(8 * 4))  # 0.0 = new, increases toward ~1.0
+        self._session = None
+        self._sim_time = None
+        self._lap_time = None
+        self._rate = None
+        self._pending = 0.0
+
+    def _sim_dt(self, g):
+        """Seconds of simulation since the previous frame (0 when paused)."""
+        left = g.session_time_left
+        lap = g.current_time
+        prev_left, prev_lap = self._sim_time, self._lap_time
+        self._sim_time, self._lap_time = left, lap
+        if prev_left is None or _value(g.status) != _ACC_LIVE:
+            return 0.0
+        dt = (prev_left - left) / 1000.0
+        if dt <= 0 and lap > prev_lap:
+            # session clock not running (e.g. unlimited practice): lap timer
+            dt = (lap - prev_lap) / 1000.0
+        if dt <= 0 or dt > MAX_GAP:
+            return 0.0
+        return dt
+
+    def _rates(self, phys, stat):
+        """Wear per second for the four wheels (fl, fr, rl, rr)."""
+        # --- driver abuse ---
+        braking_abuse = phys.brake * (1.0 + phys.abs * 0.8)
+        traction_abuse = phys.gas * (1.0 + phys.tc * 0.6)
+        abuse = (braking_abuse, braking_abuse, traction_abuse, traction_abuse)
+
+        base = BASE_WEAR_RATE * stat.aid_tyre_rate
+        return [
+            base
+            * min(abs(sr) + abs(sa), 3.0)
+            * (1.0 + load * 0.6)
+            * _temp_multiplier(temp)
+            * _pressure_multiplier(pressure)
+            * (1.0 + a)
+            for temp, sr, sa, load, pressure, a in zip(
+                _wheels(phys.tyre_core_temp),
+                _wheels(phys.slip_ratio),
+                _wheels(phys.slip_angle),
+                _wheels(phys.suspension_travel),
+                _wheels(phys.wheel_pressure),
+                abuse,
+            )
+        ]
+
+    def update(self, sm):
+        g = sm.Graphics
+        session = (getattr(g, "session_index", None), _value(g.session_type), sm.Static.track)
+        if session != self._session:
+            self.reset()
+            self._session = session
+
+        dt = self._sim_dt(g)
+        rate = self._rates(sm.Physics, sm.Static)
+        prev = self._rate if self._rate is not None else rate
+        self._rate = rate
+        if dt <= 0:
+            return
+
+        # fixed sub-steps, rate interpolated from the previous frame's
+        wear = self.wear
+        step = self.step
+        t = step - self._pending
+        self._pending += dt
+        while self._pending >= step:
+            f = t / dt
+            for k in range(4):
+                wear[k] = min(wear[k] + (prev[k] + (rate[k] - prev[k]) * f) * step, 1.2)
+            self._pending -= step
+            t += step
+
+    def snapshot(self, phys):
+        temps = _wheels(phys.tyre_core_temp)
+        out = {}
+        for k, name in enumerate(_WHEELS):
+            out[f"{name}_wear"] = max(0.0, 1.0 - self.wear[k])
+            out[f"{name}_temp"] = temps[k]
+        return out
+
+    def process(self, sm):
+        self.update(sm)
+        return self.snapshot(sm.Physics)
+
+
+_ENGINE = TyreWearEngine()
+
 
+def process_tires(sm):
+    """Wear and temperatures for the shared default engine."""
+    return _ENGINE.process(sm)
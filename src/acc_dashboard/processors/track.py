@@ -1,42 +1,8 @@
-import json
-from pathlib import Path
-
-_TRACK_CACHE = {}
-
-
-def safe_track_name(raw: str) -> str:
-    return raw.split("\x00", 1)[0].strip()
-
-
-def load_track_points(path_to_points: str):
-    if path_to_points in _TRACK_CACHE:
-        return _TRACK_CACHE[path_to_points]
-
-    p = Path(path_to_points)
-    if not p.exists():
-        _TRACK_CACHE[path_to_points] = []
-        return []
-
-    pts = json.loads(p.read_text(encoding="utf-8"))
-
-    out = []
-    if isinstance(pts, list) and pts:
-        if isinstance(pts[0], dict):
-            for q in pts:
-                out.append((float(q["x"]), float(q["z"])))
-        else:
-            for q in pts:
-                out.append((float(q[0]), float(q[1])))
-
-    _TRACK_CACHE[path_to_points] = out
-    return out
+from .track_registry import get_track, safe_track_name  # noqa: F401
 
 
 def process_track(sm):
-    track_name = safe_track_name(sm.Static.track)
-    folder = track_name.lower().replace(" ", "_")
-    filename = f"points_{folder}.json"
-    path_to_points = str(Path("src/acc_dashboard/resources/tracks") / folder / filename)
+    track = get_track(sm.Static.track)
 
     flag = sm.Graphics.flag
 
@@ -52,13 +18,13 @@ def process_track(sm):
         is_player = (car_id == player_id) if (car_id is not None and player_id is not None) else False
         cars.append({"x": float(v.x), "y": float(v.y), "z": float(v.z), "car_id": car_id, "is_player": is_player})
 
-    track_points = load_track_points(path_to_points)
-
     return {
-        "track_name": track_name,
-        "path_to_points": path_to_points,
+        "track_name": track.name,
+        "path_to_points": track.points_path,
+        "track": track,
         "flag": flag,
-        "track_points": track_points,       
+        "track_points": track.points,
+        "track_index": track.index,
         "cars_coordinates": cars,
         "player_car_id": player_id,
         "player_car_rotation": player_car_rotation
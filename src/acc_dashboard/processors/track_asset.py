@@ -0,0 +1,276 @@
+"""Precompiled binary track assets.
+
+``compile_track`` turns a ``points_<track>.json`` centreline into a
+``points_<track>.trk`` file next to it, holding everything the dashboard
+otherwise derives at load time (all little-endian)::
+
+    header   MAGIC, version, flags, source JSON size and crc32, point count,
+             sector length and count, grid cell size, lap length, bounds,
+             grid origin and dimensions, resample spacing
+    float32  x, z per point
+    float32  cumulative arc length per point
+    uint32   grid cell offsets (nx * nz + 1) and point indices per cell
+    uint32   first point of every sector
+
+The header records the JSON it was compiled from; ``load`` ignores an
+asset whose source has changed, and callers fall back to the JSON.
+"""
+
+import json
+import math
+import mmap
+import struct
+import sys
+import zlib
+from array import array
+from pathlib import Path
+
+from .track_index import TrackPointIndex
+
+MAGIC = b"ACCTRK01"
+VERSION = 1
+FLAG_RESAMPLED = 1
+
+SUFFIX = ".trk"
+
+# the minimap's default sector size, in track points
+DEFAULT_SECTOR_LEN = 10
+
+_HEADER = struct.Struct("<8sHHIIIIIdd4diiIId")
+
+
+def asset_path(points_path) -> Path:
+    return Path(points_path).with_suffix(SUFFIX)
+
+
+def read_track_points(path):
+    """Parse a points file (list of {x, z} dicts or [x, z] pairs), [] if missing."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            pts = json.load(f)
+    except FileNotFoundError:
+        return []
+
+    out = []
+    if isinstance(pts, list) and pts:
+        if isinstance(pts[0], dict):
+            for q in pts:
+                out.append((float(q["x"]), float(q["z"])))
+        else:
+            for q in pts:
+                out.append((float(q[0]), float(q[1])))
+    return out
+
+
+def resample(pts, spacing):
+    """Points every ``spacing`` metres along the closed polyline ``pts``."""
+    n = len(pts)
+    if n < 2 or spacing <= 0:
+        return list(pts)
+
+    loop = list(pts) + [pts[0]]
+    seg = [math.hypot(x2 - x1, z2 - z1) for (x1, z1), (x2, z2) in zip(loop, loop[1:])]
+    total = sum(seg)
+    count = max(2, int(round(total / spacing)))
+    step = total / count
+
+    out = []
+    i = 0
+    walked = 0.0
+    for k in range(count):
+        target = k * step
+        while i < n - 1 and walked + seg[i] < target:
+            walked += seg[i]
+            i += 1
+        t = (target - walked) / seg[i] if seg[i] > 0 else 0.0
+        (x1, z1), (x2, z2) = loop[i], loop[i + 1]
+        out.append((x1 + (x2 - x1) * t, z1 + (z2 - z1) * t))
+    return out
+
+
+class TrackAsset:
+    """Centreline plus the geometry derived from it, ready to use."""
+
+    def __init__(self, points, arc, lap_length, bounds, index, sector_len, sector_starts, spacing=0.0):
+        self.points = points
+        self.arc = arc
+        self.lap_length = lap_length
+        self.bounds = bounds
+        self.index = index
+        self.sector_len = sector_len
+        self.sector_starts = sector_starts
+        self.sector_count = len(sector_starts)
+        # 0 unless the centreline was resampled
+        self.spacing = spacing
+
+    def __len__(self):
+        return len(self.points)
+
+
+def build(pts, sector_len=DEFAULT_SECTOR_LEN, spacing=0.0) -> TrackAsset:
+    """Derive arc length, bounds, spatial index and sectors from a centreline."""
+    if spacing > 0:
+        pts = resample(pts, spacing)
+    # round through float32 so a compiled asset and the JSON agree exactly
+    flat = array("f", [c for p in pts for c in p])
+    pts = list(zip(flat[0::2], flat[1::2]))
+
+    arc = array("d", [0.0])
+    for (x1, z1), (x2, z2) in zip(pts, pts[1:]):
+        arc.append(arc[-1] + ((x2 - x1) ** 2 + (z2 - z1) ** 2) ** 0.5)
+    if pts:
+        (x1, z1), (x2, z2) = pts[-1], pts[0]
+        lap_length = arc[-1] + ((x2 - x1) ** 2 + (z2 - z1) ** 2) ** 0.5
+        xs = [p[0] for p in pts]
+        zs = [p[1] for p in pts]
+        bounds = (min(xs), max(xs), min(zs), max(zs))
+    else:
+        arc = array("d")
+        lap_length = 0.0
+        bounds = None
+    # stored as float32 too
+    arc = array("d", array("f", arc))
+
+    sector_len = max(1, sector_len)
+    sector_count = (len(pts) + sector_len - 1) // sector_len if pts else 0
+    sector_starts = [s * sector_len for s in range(sector_count)]
+
+    return TrackAsset(pts, arc, lap_length, bounds, TrackPointIndex(pts), sector_len, sector_starts, spacing)
+
+
+def write(asset: TrackAsset, path, source: bytes = b""):
+    """Write ``asset`` to ``path``; ``source`` is the JSON it was built from."""
+    cells = asset.index.cells
+    if cells:
+        minx = min(c[0] for c in cells)
+        maxx = max(c[0] for c in cells)
+        minz = min(c[1] for c in cells)
+        maxz = max(c[1] for c in cells)
+        nx, nz = maxx - minx + 1, maxz - minz + 1
+    else:
+        minx = minz = 0
+        nx = nz = 0
+
+    offsets = array("I", [0])
+    members = array("I")
+    for iz in range(nz):
+        for ix in range(nx):
+            members.extend(cells.get((minx + ix, minz + iz), ()))
+            offsets.append(len(members))
+
+    header = _HEADER.pack(
+        MAGIC, VERSION, FLAG_RESAMPLED if asset.spacing > 0 else 0,
+        len(source), zlib.crc32(source),
+        len(asset.points), asset.sector_len, asset.sector_count,
+        asset.index.cell_size if asset.points else 1.0, asset.lap_length,
+        *(asset.bounds or (0.0, 0.0, 0.0, 0.0)),
+        minx, minz, nx, nz, asset.spacing,
+    )
+    arrays = (
+        array("f", [c for p in asset.points for c in p]),
+        array("f", asset.arc),
+        offsets,
+        members,
+        array("I", asset.sector_starts),
+    )
+
+    path = Path(path)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(header)
+        for a in arrays:
+            if a.itemsize != 4:
+                raise ValueError("track assets only hold 32-bit values")
+            f.write(a.tobytes() if sys.byteorder == "little" else _swapped(a))
+    tmp.replace(path)
+
+
+def _swapped(a):
+    b = array(a.typecode, a)
+    b.byteswap()
+    return b.tobytes()
+
+
+def _take(mm, offset, typecode, count):
+    """(array, next offset); (None, offset) when the file ends first."""
+    end = offset + 4 * count
+    if end > len(mm):
+        return None, offset
+    a = array(typecode)
+    a.frombytes(mm[offset:end])
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a, end
+
+
+def load(path, source_path=None):
+    """Read a compiled asset; None if it is missing, unreadable or stale."""
+    try:
+        f = open(path, "rb")
+    except FileNotFoundError:
+        return None
+    with f:
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None  # empty file
+        # everything is copied out, so the file is never held open (and can
+        # be recompiled while the dashboard runs, even on Windows)
+        with mm:
+            if len(mm) < _HEADER.size:
+                return None
+            (
+                magic, version, _, source_size, source_crc, n, sector_len, sector_count,
+                cell_size, lap_length, minx, maxx, minz, maxz, gx, gz, nx, nz, spacing,
+            ) = _HEADER.unpack_from(mm, 0)
+            if magic != MAGIC or version != VERSION:
+                return None
+            if source_path is not None:
+                try:
+                    source = Path(source_path).read_bytes()
+                except FileNotFoundError:
+                    source = None
+                # a missing JSON is fine: the asset can ship on its own
+                if source is not None and (len(source), zlib.crc32(source)) != (source_size, source_crc):
+                    return None
+
+            offset = _HEADER.size
+            xz, offset = _take(mm, offset, "f", 2 * n)
+            arc, offset = _take(mm, offset, "f", n)
+            offsets, offset = _take(mm, offset, "I", nx * nz + 1 if nx * nz else 1)
+            if offsets is None:
+                return None  # truncated
+            members, offset = _take(mm, offset, "I", offsets[-1])
+            starts, offset = _take(mm, offset, "I", sector_count)
+            if any(a is None for a in (xz, arc, members, starts)):
+                return None  # truncated (a partial write, say)
+
+    pts = list(zip(xz[0::2], xz[1::2]))
+    cells = {}
+    k = 0
+    for iz in range(nz):
+        for ix in range(nx):
+            lo, hi = offsets[k], offsets[k + 1]
+            if hi > lo:
+                cells[(gx + ix, gz + iz)] = members[lo:hi].tolist()
+            k += 1
+
+    return TrackAsset(
+        pts,
+        array("d", arc),
+        lap_length,
+        (minx, maxx, minz, maxz) if n else None,
+        TrackPointIndex.from_cells(pts, cell_size, cells),
+        sector_len,
+        starts.tolist(),
+        spacing,
+    )
+
+
+def compile_track(points_path, sector_len=DEFAULT_SECTOR_LEN, spacing=0.0) -> Path:
+    """Compile ``points_path`` into its ``.trk`` asset and return the asset path."""
+    source = Path(points_path).read_bytes()
+    asset = build(read_track_points(points_path), sector_len, spacing)
+    out = asset_path(points_path)
+    write(asset, out, source)
+    return out
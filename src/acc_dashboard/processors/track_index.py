@@ -0,0 +1,149 @@
+import math
+
+
+class TrackPointIndex:
+    """Uniform-grid spatial index over the points of a closed track.
+
+    Built once per track. ``nearest`` first walks downhill from a hint index
+    (usually the car's last seen point), staying within a short window around
+    it, and only falls back to a ring search over the grid when that does not
+    end on a plausible match.
+    """
+
+    def __init__(self, pts, cell_size=None, window_back=4, window_ahead=16):
+        self.pts = [(float(x), float(z)) for x, z in pts]
+        self.window_back = window_back
+        self.window_ahead = window_ahead
+
+        n = len(self.pts)
+        if cell_size is None:
+            cell_size = 4.0 * _median_spacing(self.pts) if n > 1 else 1.0
+        self.cell_size = max(float(cell_size), 1e-3)
+
+        cells = {}
+        for i, (x, z) in enumerate(self.pts):
+            cells.setdefault(self._cell_of(x, z), []).append(i)
+        self._set_cells(cells)
+
+    @classmethod
+    def from_cells(cls, pts, cell_size, cells, window_back=4, window_ahead=16):
+        """Rebuild an index from a precomputed {(ix, iz): [point indices]} grid."""
+        self = cls.__new__(cls)
+        self.pts = [(float(x), float(z)) for x, z in pts]
+        self.window_back = window_back
+        self.window_ahead = window_ahead
+        self.cell_size = float(cell_size)
+        self._set_cells(cells)
+        return self
+
+    @property
+    def cells(self):
+        return self._cells
+
+    def _set_cells(self, cells):
+        self._cells = cells
+        if self._cells:
+            ixs = [c[0] for c in self._cells]
+            izs = [c[1] for c in self._cells]
+            self._grid_bounds = (min(ixs), max(ixs), min(izs), max(izs))
+        else:
+            self._grid_bounds = None
+
+    def __len__(self):
+        return len(self.pts)
+
+    def _cell_of(self, x, z):
+        c = self.cell_size
+        return int(math.floor(x / c)), int(math.floor(z / c))
+
+    def nearest(self, x, z, hint=None):
+        """Return the index of the track point closest to (x, z), or None."""
+        if not self.pts:
+            return None
+
+        if hint is not None:
+            idx = self._nearest_in_window(x, z, hint)
+            if idx is not None:
+                return idx
+
+        return self._nearest_in_grid(x, z)
+
+    def _nearest_in_window(self, x, z, hint):
+        pts = self.pts
+        n = len(pts)
+
+        def dist(i):
+            px, pz = pts[i]
+            dx = px - x
+            dz = pz - z
+            return dx * dx + dz * dz
+
+        # walk downhill from the hint; cars mostly move forward, so look
+        # one and two points ahead before looking back
+        i = hint % n
+        d = dist(i)
+        moved = 0
+        while True:
+            for step in (1, 2, -1):
+                j = (i + step) % n
+                dj = dist(j)
+                if dj < d:
+                    i, d = j, dj
+                    moved += step
+                    break
+            else:
+                break
+            # wandered out of the window: the hint is stale
+            if moved > self.window_ahead or moved < -self.window_back:
+                return None
+
+        # a far minimum means the car is off the hinted stretch of track
+        if d > self.cell_size * self.cell_size:
+            return None
+        return i
+
+    def _nearest_in_grid(self, x, z):
+        pts = self.pts
+        cells = self._cells
+        c = self.cell_size
+        qx, qz = self._cell_of(x, z)
+        minx, maxx, minz, maxz = self._grid_bounds
+        r_max = max(qx - minx, maxx - qx, qz - minz, maxz - qz, 0)
+
+        best_i = None
+        best_d = float("inf")
+        for r in range(r_max + 1):
+            for cell in _ring(qx, qz, r):
+                for i in cells.get(cell, ()):
+                    px, pz = pts[i]
+                    dx = px - x
+                    dz = pz - z
+                    d = dx * dx + dz * dz
+                    if d < best_d:
+                        best_d = d
+                        best_i = i
+            # everything outside ring r is at least r cells away
+            reach = r * c
+            if best_i is not None and best_d <= reach * reach:
+                break
+        return best_i
+
+
+def _ring(cx, cz, r):
+    if r == 0:
+        yield cx, cz
+        return
+    for ix in range(cx - r, cx + r + 1):
+        yield ix, cz - r
+        yield ix, cz + r
+    for iz in range(cz - r + 1, cz + r):
+        yield cx - r, iz
+        yield cx + r, iz
+
+
+def _median_spacing(pts):
+    d = sorted(
+        math.hypot(x2 - x1, z2 - z1)
+        for (x1, z1), (x2, z2) in zip(pts, pts[1:])
+    )
+    return d[len(d) // 2] if d else 1.0
@@ -0,0 +1,207 @@
+"""Turn raw recorded positions into a clean track centreline.
+
+``track_recorder.py`` logs the player's car position lap after lap. The
+stages here, applied in order by ``clean_outline``:
+
+    split_laps      cut the recording where the car returns to its start
+    average_laps    merge every complete lap into one centreline
+    resample        even spacing along the arc length
+    simplify        Douglas-Peucker under an error bound, with a cap on the
+                    gap between points so sectors and nearest-point hints
+                    stay short
+
+Points are (x, y, z) tuples; distances are measured in the x/z plane, the one
+the minimap and the processors use.
+"""
+
+import math
+
+from .track_index import TrackPointIndex
+
+DEFAULT_CLOSURE_RADIUS = 25.0
+DEFAULT_SPACING = 2.0
+DEFAULT_EPSILON = 0.5
+DEFAULT_MAX_GAP = 40.0
+
+
+def _dist(a, b):
+    return math.hypot(b[0] - a[0], b[2] - a[2])
+
+
+def _arc(pts):
+    arc = [0.0]
+    for a, b in zip(pts, pts[1:]):
+        arc.append(arc[-1] + _dist(a, b))
+    return arc
+
+
+def split_laps(pts, closure_radius=DEFAULT_CLOSURE_RADIUS, min_lap_length=500.0):
+    """Cut ``pts`` into laps at each return to the first point.
+
+    A lap ends at the closest approach to the start once the car has been
+    more than twice ``closure_radius`` away and comes back inside it. Returns
+    (complete laps, leftover points after the last closure).
+    """
+    if len(pts) < 3:
+        return [], list(pts)
+
+    start = pts[0]
+    arc = _arc(pts)
+    laps = []
+    lap_start = 0
+    away = False
+    i = 1
+    n = len(pts)
+    while i < n:
+        d = _dist(pts[i], start)
+        if d > 2 * closure_radius:
+            away = True
+        elif away and d < closure_radius and arc[i] - arc[lap_start] >= min_lap_length:
+            # closest approach to the start inside the closure radius
+            best = i
+            while i + 1 < n and _dist(pts[i + 1], start) < closure_radius:
+                i += 1
+                if _dist(pts[i], start) < _dist(pts[best], start):
+                    best = i
+            laps.append(pts[lap_start:best])
+            lap_start = best
+            away = False
+        i += 1
+    return laps, pts[lap_start:]
+
+
+def resample(pts, spacing, closed=True):
+    """Points every ``spacing`` metres along ``pts`` (evenly spread around a closed loop)."""
+    if len(pts) < 2 or spacing <= 0:
+        return list(pts)
+
+    line = list(pts) + [pts[0]] if closed else list(pts)
+    arc = _arc(line)
+    total = arc[-1]
+    if total <= 0:
+        return [pts[0]]
+    count = max(2, int(round(total / spacing)))
+    step = total / count if closed else total / (count - 1)
+
+    out = []
+    j = 0
+    for k in range(count):
+        target = k * step
+        while j < len(line) - 2 and arc[j + 1] < target:
+            j += 1
+        seg = arc[j + 1] - arc[j]
+        t = (target - arc[j]) / seg if seg > 0 else 0.0
+        t = min(max(t, 0.0), 1.0)
+        a, b = line[j], line[j + 1]
+        out.append(tuple(a[c] + (b[c] - a[c]) * t for c in range(len(a))))
+    return out
+
+
+def average_laps(laps, spacing=1.0):
+    """One centreline from several laps of the same track.
+
+    The first lap is resampled as the reference; for each of its points the
+    nearest point of every lap (found with a hinted ``TrackPointIndex`` walk)
+    is averaged in.
+    """
+    laps = [lap for lap in laps if len(lap) >= 3]
+    if not laps:
+        return []
+    ref = resample(laps[0], spacing)
+    if len(laps) == 1:
+        return ref
+
+    sums = [list(p) for p in ref]
+    for lap in laps[1:]:
+        dense = resample(lap, spacing)
+        index = TrackPointIndex([(p[0], p[2]) for p in dense], window_ahead=64)
+        hint = None
+        for k, p in enumerate(ref):
+            hint = index.nearest(p[0], p[2], hint)
+            q = dense[hint]
+            s = sums[k]
+            for c in range(len(s)):
+                s[c] += q[c]
+
+    m = len(laps)
+    return [tuple(c / m for c in s) for s in sums]
+
+
+def _segment_distance(p, a, b):
+    ax, az = a[0], a[2]
+    dx, dz = b[0] - ax, b[2] - az
+    length2 = dx * dx + dz * dz
+    if length2 <= 0:
+        return math.hypot(p[0] - ax, p[2] - az)
+    t = max(0.0, min(1.0, ((p[0] - ax) * dx + (p[2] - az) * dz) / length2))
+    return math.hypot(p[0] - (ax + t * dx), p[2] - (az + t * dz))
+
+
+def _douglas_peucker(pts, lo, hi, epsilon, max_gap, keep):
+    stack = [(lo, hi)]
+    while stack:
+        lo, hi = stack.pop()
+        if hi - lo < 2:
+            continue
+        a, b = pts[lo], pts[hi]
+        worst, worst_d = lo, -1.0
+        for i in range(lo + 1, hi):
+            d = _segment_distance(pts[i], a, b)
+            if d > worst_d:
+                worst, worst_d = i, d
+        if worst_d > epsilon or _dist(a, b) > max_gap:
+            if worst_d <= epsilon:
+                worst = (lo + hi) // 2
+            keep[worst] = True
+            stack.append((lo, worst))
+            stack.append((worst, hi))
+
+
+def simplify(pts, epsilon=DEFAULT_EPSILON, max_gap=DEFAULT_MAX_GAP, closed=True):
+    """Douglas-Peucker: drop points within ``epsilon`` metres of the simplified line.
+
+    No two kept neighbours end up more than ``max_gap`` apart (as long as the
+    input spacing allows it).
+    """
+    n = len(pts)
+    if n < 3:
+        return list(pts)
+
+    keep = [False] * n
+    keep[0] = True
+    if closed:
+        # split the loop at the point farthest from the start
+        far = max(range(n), key=lambda i: _dist(pts[0], pts[i]))
+        keep[far] = True
+        line = list(pts) + [pts[0]]
+        _douglas_peucker(line, 0, far, epsilon, max_gap, keep)
+        tail = [False] * (n + 1)
+        _douglas_peucker(line, far, n, epsilon, max_gap, tail)
+        for i in range(far, n):
+            keep[i] = keep[i] or tail[i]
+    else:
+        keep[-1] = True
+        _douglas_peucker(pts, 0, n - 1, epsilon, max_gap, keep)
+    return [p for p, k in zip(pts, keep) if k]
+
+
+def clean_outline(
+    pts,
+    closure_radius=DEFAULT_CLOSURE_RADIUS,
+    spacing=DEFAULT_SPACING,
+    epsilon=DEFAULT_EPSILON,
+    max_gap=DEFAULT_MAX_GAP,
+):
+    """Raw recorded (x, y, z) points -> a closed, simplified centreline.
+
+    Without a complete lap the recording is cleaned as one open line.
+    """
+    laps, rest = split_laps(pts, closure_radius)
+    if laps:
+        line = average_laps(laps, min(spacing, 1.0))
+        closed = True
+    else:
+        line = list(rest)
+        closed = False
+    line = resample(line, spacing, closed=closed)
+    return simplify(line, epsilon, max_gap, closed=closed)
@@ -0,0 +1,175 @@
+import os
+import threading
+import time
+
+from ..paths import TRACKS_DIR
+from . import track_asset
+from .track_asset import DEFAULT_SECTOR_LEN, read_track_points
+
+# how often (seconds) a cached track is checked against its files
+DEFAULT_CHECK_INTERVAL = 5.0
+
+
+def safe_track_name(raw: str) -> str:
+    return raw.split("\x00", 1)[0].strip()
+
+
+def track_key(raw: str) -> str:
+    """Normalised name used to find a track's folder (case-insensitive)."""
+    return safe_track_name(raw).lower().replace(" ", "_")
+
+
+def read_lap_time(path):
+    """Reference lap time in seconds from laptime.txt, None if missing or invalid."""
+    try:
+        with open(path, encoding="utf-8") as f:
+            value = float(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+    return value if value > 0 else None
+
+
+def _mtime(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+class TrackInfo:
+    """Everything the processors need to know about one track.
+
+    Built once from the track folder: the reference lap time, the centreline
+    with its spatial index, cumulative arc length and bounds, and the default
+    sector layout. A track without a folder gets an empty ``TrackInfo``.
+    """
+
+    def __init__(self, name, folder, points_path, lap_time_path, sector_len=DEFAULT_SECTOR_LEN):
+        self.name = name
+        self.folder = folder
+        self.points_path = str(points_path)
+        self.lap_time_path = str(lap_time_path)
+        self.asset_path = str(track_asset.asset_path(self.points_path))
+        self.mtimes = self._current_mtimes()
+
+        # seconds, None when the track has no reference lap time
+        self.lap_time = read_lap_time(self.lap_time_path)
+
+        # the compiled asset when it is up to date, else build from the JSON
+        asset = track_asset.load(self.asset_path, self.points_path)
+        if asset is None or asset.sector_len != sector_len:
+            asset = track_asset.build(read_track_points(self.points_path), sector_len)
+        self.compiled = asset
+
+        self.points = asset.points
+        self.index = asset.index
+        self.arc = asset.arc
+        self.lap_length = asset.lap_length
+        self.bounds = asset.bounds
+        self.sector_len = asset.sector_len
+        self.sector_count = asset.sector_count
+
+    def __len__(self):
+        return len(self.points)
+
+    def _current_mtimes(self):
+        return _mtime(self.points_path), _mtime(self.lap_time_path), _mtime(self.asset_path)
+
+    def is_stale(self):
+        return self._current_mtimes() != self.mtimes
+
+    def sector_layout(self, sector_count=0, sector_len=DEFAULT_SECTOR_LEN):
+        """(sector_len, sector_count): ``sector_count`` equal sectors, or sectors of ``sector_len`` points."""
+        n = len(self.points)
+        if not n:
+            return max(1, sector_len), 0
+        if sector_count > 0:
+            return max(1, n // sector_count), sector_count
+        sector_len = max(1, sector_len)
+        return sector_len, max(1, (n + sector_len - 1) // sector_len)
+
+    def sector_starts(self, sector_len=None, sector_count=None):
+        """First point index of every sector."""
+        if sector_len is None and sector_count is None:
+            return self.compiled.sector_starts
+        sector_len = self.sector_len if sector_len is None else sector_len
+        sector_count = self.sector_count if sector_count is None else sector_count
+        return [s * sector_len for s in range(sector_count)]
+
+
+class TrackRegistry:
+    """Loads each track once and hands out the shared ``TrackInfo``.
+
+    Track folders are matched case-insensitively. A cached track is compared
+    against its files' mtimes at most every ``check_interval`` seconds and
+    reloaded when they changed, so editing a points file or laptime.txt is
+    picked up without a restart while ticks in between never touch the disk.
+    """
+
+    def __init__(self, tracks_dir=TRACKS_DIR, check_interval=DEFAULT_CHECK_INTERVAL, clock=time.monotonic):
+        self.tracks_dir = tracks_dir
+        self.check_interval = check_interval
+        self.clock = clock
+
+        # key -> (TrackInfo, time of the last mtime check)
+        self._tracks = {}
+        self._folders = None
+        # loads may run on a preload thread; a second caller waits for that
+        # load instead of repeating it
+        self._load_lock = threading.Lock()
+
+    def _folder_for(self, key):
+        if self._folders is None or key not in self._folders:
+            try:
+                self._folders = {p.name.lower(): p for p in self.tracks_dir.iterdir() if p.is_dir()}
+            except FileNotFoundError:
+                self._folders = {}
+        return self._folders.get(key)
+
+    def _load(self, raw_name, key):
+        folder = self._folder_for(key)
+        if folder is None:
+            folder = self.tracks_dir / key
+        return TrackInfo(
+            safe_track_name(raw_name),
+            folder.name,
+            folder / f"points_{folder.name}.json",
+            folder / "laptime.txt",
+        )
+
+    def get(self, raw_name) -> TrackInfo:
+        key = track_key(raw_name)
+        now = self.clock()
+        entry = self._tracks.get(key)
+        if entry is not None:
+            info, checked = entry
+            if now - checked < self.check_interval:
+                return info
+            if not info.is_stale():
+                self._tracks[key] = (info, now)
+                return info
+
+        with self._load_lock:
+            current = self._tracks.get(key)
+            if current is not None and current is not entry:
+                return current[0]  # loaded while we waited
+            info = self._load(raw_name, key)
+            self._tracks[key] = (info, now)
+        return info
+
+    def invalidate(self, raw_name=None):
+        """Drop one cached track, or all of them."""
+        if raw_name is None:
+            self._tracks.clear()
+            self._folders = None
+        else:
+            self._tracks.pop(track_key(raw_name), None)
+
+
+_REGISTRY = TrackRegistry()
+
+
+def get_track(raw_name) -> TrackInfo:
+    """The shared ``TrackInfo`` for an ACC track name (``Static.track``)."""
+    return _REGISTRY.get(raw_name)
+
@@ -1,3 +1,3 @@
-from pyaccsharedmemory import accSharedMemory
-
-
+# shared-memory polling rate while the game is live; kept here so the command
+# line can show it without importing the readers (and pyaccsharedmemory)
+DEFAULT_HZ = 120.0
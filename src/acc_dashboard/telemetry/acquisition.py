@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import deque
+from typing import Any, NamedTuple
+
+import pyaccsharedmemory as acc
+
+from ..instrument import PROBES
+from . import DEFAULT_HZ
+
+DEFAULT_CAPACITY = 512
+
+IDLE_HZ = 1.0
+STALE_AFTER = 1.0  # s without a new packet before polling slows down
+
+# game states with something on screen to follow
+ACTIVE_STATUSES = (acc.ACC_STATUS.ACC_LIVE, acc.ACC_STATUS.ACC_REPLAY)
+
+
+class Frame(NamedTuple):
+    seq: int
+    time: float
+    sm: Any
+
+
+def frame_time(telemetry, default: float) -> float:
+    """When ``telemetry``'s last frame happened on its own clock.
+
+    Replays report the recorded time (``last_time``), so anything timed
+    from frames runs at sim speed whatever the playback rate; live sources
+    don't, and ``default`` (the time of the read) is used.
+    """
+    t = getattr(telemetry, "last_time", None)
+    return default if t is None else t
+
+
+class FrameRing:
+    """Bounded buffer of the most recent telemetry frames.
+
+    One writer (the acquisition thread) appends, any number of readers look
+    at it. Neither side takes a lock: appending to and indexing a deque are
+    atomic under the GIL, and the deque drops the oldest frame when full.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY):
+        self._frames = deque(maxlen=capacity)
+        self._seq = 0
+
+    def __len__(self):
+        return len(self._frames)
+
+    def push(self, sm, t: float) -> Frame:
+        self._seq += 1
+        frame = Frame(self._seq, t, sm)
+        self._frames.append(frame)
+        return frame
+
+    def latest(self):
+        try:
+            return self._frames[-1]
+        except IndexError:
+            return None
+
+    def since(self, seq: int):
+        """Frames newer than ``seq``, oldest first (as many as are still buffered)."""
+        frames = list(self._frames)
+        lo = 0
+        hi = len(frames)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if frames[mid].seq <= seq:
+                lo = mid + 1
+            else:
+                hi = mid
+        return frames[lo:]
+
+
+class AdaptiveRate:
+    """How often to poll, from what the game is doing.
+
+    Full rate while the session is live (or an in-game replay runs) and new
+    packets keep coming; ``idle_hz`` in the menus, while paused and while
+    shared memory is absent or frozen (no new packet for ``stale_after``
+    seconds). The first new live packet brings the full rate back, so waking
+    up takes at most one idle period.
+    """
+
+    def __init__(self, hz: float = DEFAULT_HZ, idle_hz: float = IDLE_HZ, stale_after: float = STALE_AFTER):
+        self.active_period = 1.0 / max(float(hz), 1e-3)
+        self.idle_period = max(1.0 / max(float(idle_hz), 1e-3), self.active_period)
+        self.stale_after = stale_after
+        self.idle = False
+        self._last_live = None
+
+    @property
+    def period(self) -> float:
+        return self.idle_period if self.idle else self.active_period
+
+    def update(self, sm, now: float) -> float:
+        """Account for one read (``sm`` None: nothing new); returns the period to wait."""
+        if sm is not None:
+            self.idle = getattr(sm.Graphics, "status", None) not in ACTIVE_STATUSES
+            if not self.idle:
+                self._last_live = now
+        elif self._last_live is None:
+            self._last_live = now  # full rate for a while after starting
+        elif now - self._last_live >= self.stale_after:
+            self.idle = True
+        return self.period
+
+
+class AcquisitionWorker(threading.Thread):
+    """Polls a telemetry source on its own thread into a FrameRing.
+
+    The source only needs ``get_sm()``; ``None`` results (no new data) are
+    skipped. Polling runs at ``hz`` while the game is live and drops to
+    ``idle_hz`` otherwise (see ``AdaptiveRate``). The UI thread reads
+    ``ring.latest()`` at its own pace; ``first_frame`` is set once the
+    first frame is in the ring. An optional recorder (see
+    ``recording.SessionRecorder``) gets every frame.
+    """
+
+    def __init__(
+        self, telemetry, hz: float = DEFAULT_HZ, capacity: int = DEFAULT_CAPACITY,
+        clock=time.perf_counter, recorder=None, idle_hz: float = IDLE_HZ,
+    ):
+        super().__init__(name="telemetry-acquisition", daemon=True)
+        self.telemetry = telemetry
+        self.rate = AdaptiveRate(hz, idle_hz)
+        self.ring = FrameRing(capacity)
+        self.clock = clock
+        self.recorder = recorder
+        self.errors = 0
+        self.first_frame = threading.Event()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        try:
+            self._poll()
+        finally:
+            # closed by the thread that writes, so never under a write
+            if self.recorder is not None:
+                self.recorder.close()
+
+    def _poll(self):
+        next_t = self.clock()
+        while not self._stop_event.is_set():
+            t0 = PROBES.start()
+            try:
+                sm = self.telemetry.get_sm()
+            except Exception:
+                # a bad read must not kill acquisition; try again next period
+                sm = None
+                self.errors += 1
+            PROBES.stop("telemetry.get_sm", t0)
+            if sm is not None:
+                PROBES.count("telemetry.frames")
+                self.ring.push(sm, frame_time(self.telemetry, self.clock()))
+                if not self.first_frame.is_set():
+                    self.first_frame.set()
+                if self.recorder is not None:
+                    self.recorder.write(sm)
+
+            next_t += self.rate.update(sm, self.clock())
+            delay = next_t - self.clock()
+            if delay < 0:
+                # fell behind (slow read), don't try to catch up with a burst
+                next_t = self.clock()
+                delay = 0
+            self._stop_event.wait(delay)
+
+    def stop(self, timeout: float = 1.0):
+        """Stop polling; the recorder is closed once the thread has finished."""
+        self._stop_event.set()
+        if self.is_alive():
+            self.join(timeout)
+        elif self.ident is None and self.recorder is not None:
+            self.recorder.close()  # never started
@@ -0,0 +1,240 @@
+"""Shared-memory reader that maps only the fields the dashboard uses.
+
+``accSharedMemory.read_shared_memory()`` builds a Python object for every
+field of all three ACC pages on each call, a few hundred ``struct.unpack``
+calls. ``MappedTelemetry`` maps the pages with ``mmap`` instead and lays
+small ``ctypes`` structures over them that declare only the consumed fields
+at their ACC offsets; everything in between is padding and never decoded.
+
+Per call it reads the physics packet id through a view on the live page and
+returns ``None`` when it has not moved. A new frame is snapshotted with one
+``from_buffer_copy`` per page (frames stay in the acquisition ring after the
+game has overwritten the page), and Graphics/Static are only copied again
+when the graphics packet id changes. Fields decode lazily on attribute
+access, so a processor pays only for what it reads.
+
+Snapshots keep the attribute interface of ``pyaccsharedmemory``'s dataclasses
+for those fields (``sm.Physics.tyre_core_temp.front_left``,
+``sm.Graphics.car_coordinates[i].x``, enums, ``str`` track name). Code that
+needs every field, such as ``SessionRecorder``, should keep using
+``Telemetry``.
+
+On Windows the pages are ACC's named mappings. Anywhere else (or for tests)
+pass a directory: ``create_page_files`` makes zero-filled files of the page
+sizes there, and anything written into them is read back like the game's
+pages.
+"""
+
+import ctypes
+import mmap
+import os
+from ctypes import c_float, c_int32, c_uint8, c_uint16
+
+import pyaccsharedmemory as acc
+
+# page sizes and names as mapped by pyaccsharedmemory
+PAGES = {
+    "physics": ("Local\\acpmf_physics", 800),
+    "graphics": ("Local\\acpmf_graphics", 1588),
+    "static": ("Local\\acpmf_static", 784),
+}
+
+CAR_SLOTS = 60
+STRING_CHARS = 33
+
+
+class Vector3f(ctypes.Structure):
+    _fields_ = [("x", c_float), ("y", c_float), ("z", c_float)]
+
+
+class Wheels(ctypes.Structure):
+    _fields_ = [
+        ("front_left", c_float),
+        ("front_right", c_float),
+        ("rear_left", c_float),
+        ("rear_right", c_float),
+    ]
+
+
+def _layout(fields):
+    """ctypes ``_fields_`` placing each (offset, name, type), padding the gaps."""
+    out = []
+    pos = 0
+    for offset, name, ctype in fields:
+        if offset < pos:
+            raise ValueError(f"{name} at {offset} overlaps the previous field")
+        if offset > pos:
+            out.append((f"_gap{pos}", c_uint8 * (offset - pos)))
+        out.append((name, ctype))
+        pos = offset + ctypes.sizeof(ctype)
+    return out
+
+
+def _enum(cls, v):
+    try:
+        return cls(v)
+    except ValueError:
+        return cls.UnknownValue if hasattr(cls, "UnknownValue") else v
+
+
+def _string(chars):
+    return bytes(chars).decode("utf-16-le", errors="ignore").split("\x00", 1)[0]
+
+
+class PhysicsPage(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = _layout([
+        (0, "packed_id", c_int32),
+        (4, "gas", c_float),
+        (8, "brake", c_float),
+        (12, "fuel", c_float),
+        (88, "wheel_pressure", Wheels),
+        (152, "tyre_core_temp", Wheels),
+        (184, "suspension_travel", Wheels),
+        (204, "tc", c_float),
+        (208, "heading", c_float),
+        (252, "abs", c_float),
+        (640, "slip_ratio", Wheels),
+        (656, "slip_angle", Wheels),
+    ])
+
+
+class GraphicsPage(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = _layout([
+        (0, "packed_id", c_int32),
+        (4, "_status", c_int32),
+        (8, "_session_type", c_int32),
+        (132, "completed_lap", c_int32),
+        (140, "current_time", c_int32),
+        (144, "last_time", c_int32),
+        (152, "session_time_left", c_float),
+        (160, "_is_in_pit", c_int32),
+        (252, "active_cars", c_int32),
+        (256, "car_coordinates", Vector3f * CAR_SLOTS),
+        (976, "car_id", c_int32 * CAR_SLOTS),
+        (1216, "player_car_id", c_int32),
+        (1224, "_flag", c_int32),
+        (1236, "_is_in_pit_lane", c_int32),
+        (1284, "fuel_per_lap", c_float),
+        (1320, "session_index", c_int32),
+    ])
+
+    @property
+    def status(self):
+        return _enum(acc.ACC_STATUS, self._status)
+
+    @property
+    def session_type(self):
+        return _enum(acc.ACC_SESSION_TYPE, self._session_type)
+
+    @property
+    def flag(self):
+        return _enum(acc.ACC_FLAG_TYPE, self._flag)
+
+    @property
+    def is_in_pit(self):
+        return bool(self._is_in_pit)
+
+    @property
+    def is_in_pit_lane(self):
+        return bool(self._is_in_pit_lane)
+
+
+class StaticPage(ctypes.Structure):
+    _pack_ = 1
+    _fields_ = _layout([
+        (134, "_track", c_uint16 * STRING_CHARS),
+        (416, "max_fuel", c_float),
+        (472, "aid_tyre_rate", c_float),
+    ])
+
+    @property
+    def track(self):
+        return _string(self._track)
+
+
+_STRUCTS = {"physics": PhysicsPage, "graphics": GraphicsPage, "static": StaticPage}
+
+
+def create_page_files(directory):
+    """Zero-filled stand-ins for the three pages in ``directory``; returns it."""
+    os.makedirs(directory, exist_ok=True)
+    for page, (_, size) in PAGES.items():
+        path = os.path.join(directory, f"{page}.bin")
+        if not os.path.exists(path) or os.path.getsize(path) != size:
+            with open(path, "wb") as f:
+                f.write(bytes(size))
+    return directory
+
+
+def page_view(mm, page):
+    """The page structure laid directly over a mapped page (no copy)."""
+    return _STRUCTS[page].from_buffer(mm)
+
+
+class MappedTelemetry:
+    """Telemetry source reading ACC's pages through ``mmap`` and ``ctypes``.
+
+    ``directory`` selects file-backed pages (see ``create_page_files``);
+    without it the named mappings of a running game are opened.
+    """
+
+    def __init__(self, directory=None):
+        self.directory = directory
+        self._maps = {}
+        self._files = []
+        self._physics_id = None
+        self._graphics_id = None
+        self._last_physics = None
+        self._last_graphics = None
+        self._graphics = None
+        self._static = None
+
+    def _open(self, page):
+        tag, size = PAGES[page]
+        if self.directory is None:
+            # the tagname argument only exists on Windows
+            return mmap.mmap(-1, size, tagname=tag, access=mmap.ACCESS_WRITE)
+        f = open(os.path.join(self.directory, f"{page}.bin"), "r+b")
+        self._files.append(f)
+        return mmap.mmap(f.fileno(), size, access=mmap.ACCESS_WRITE)
+
+    def connect(self):
+        if not self._maps:
+            self._maps = {page: self._open(page) for page in PAGES}
+            # live views of the packet ids: reading them copies nothing
+            self._physics_id = c_int32.from_buffer(self._maps["physics"], 0)
+            self._graphics_id = c_int32.from_buffer(self._maps["graphics"], 0)
+        return self._maps
+
+    def close(self):
+        # views must go before their maps can close
+        self._physics_id = self._graphics_id = None
+        for mm in self._maps.values():
+            mm.close()
+        for f in self._files:
+            f.close()
+        self._maps = {}
+        self._files = []
+
+    def get_sm(self):
+        if not self._maps:
+            self.connect()
+
+        packet = self._physics_id.value
+        if packet == self._last_physics:
+            return None
+        physics = PhysicsPage.from_buffer_copy(self._maps["physics"])
+        if physics.packed_id != packet:
+            return None  # torn: the game wrote the page while it was copied
+        self._last_physics = packet
+
+        packet = self._graphics_id.value
+        if packet != self._last_graphics or self._graphics is None:
+            self._graphics = GraphicsPage.from_buffer_copy(self._maps["graphics"])
+            # Static only changes with the session, which also moves graphics
+            self._static = StaticPage.from_buffer_copy(self._maps["static"])
+            self._last_graphics = self._graphics.packed_id
+
+        return acc.ACC_map(physics, self._graphics, self._static)
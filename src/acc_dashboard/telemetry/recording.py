@@ -0,0 +1,274 @@
+"""Binary session recordings of raw shared-memory snapshots.
+
+File layout (all little-endian)::
+
+    header   MAGIC, version, flags, layout fingerprint, block sizes,
+             frames per chunk
+    chunk*   "CHNK", frame count, first frame number, raw/stored length,
+             first timestamp, then the payload:
+                 Static block, then per frame: timestamp + Physics + Graphics
+             The payload is optionally XOR-delta coded frame to frame and
+             zlib compressed. A chunk is closed early when Static changes,
+             so every chunk carries exactly one Static block.
+    index    "INDX", chunk count, (first frame, offset, first timestamp) per
+             chunk, then the index offset and "ACCE"
+
+Chunks are only ever appended. The index is written by ``close``; if it is
+missing (the recorder was killed) ``SessionReader`` rebuilds it by walking
+the chunks.
+"""
+
+import mmap
+import struct
+import time
+import zlib
+from bisect import bisect_right
+
+import pyaccsharedmemory as acc
+
+from . import schema
+
+MAGIC = b"ACCREC01"
+VERSION = 1
+
+FLAG_COMPRESSED = 1
+FLAG_DELTA = 2
+
+_HEADER = struct.Struct("<8sHHIIIII")
+_CHUNK = struct.Struct("<4sIQIId")
+_INDEX_HEAD = struct.Struct("<4sI")
+_INDEX_ENTRY = struct.Struct("<QQd")
+_TRAILER = struct.Struct("<Q4s")
+_TIMESTAMP = struct.Struct("<d")
+
+FRAME_SIZE = _TIMESTAMP.size + schema.PHYSICS.size + schema.GRAPHICS.size
+
+DEFAULT_FRAMES_PER_CHUNK = 600
+
+
+class RecordingError(Exception):
+    pass
+
+
+def _xor(a: bytes, b: bytes) -> bytes:
+    n = len(a)
+    return (int.from_bytes(a, "little") ^ int.from_bytes(b, "little")).to_bytes(n, "little")
+
+
+class SessionRecorder:
+    """Append-only writer for telemetry snapshots.
+
+    ``write`` packs one snapshot into a fixed-size frame and buffers it; a
+    full chunk is delta coded, compressed and appended in one write.
+    """
+
+    def __init__(self, path, frames_per_chunk=DEFAULT_FRAMES_PER_CHUNK, compress=True, delta=False, clock=time.time):
+        self.path = str(path)
+        self.frames_per_chunk = max(1, int(frames_per_chunk))
+        self.flags = (FLAG_COMPRESSED if compress else 0) | (FLAG_DELTA if delta else 0)
+        self.clock = clock
+
+        self._f = open(self.path, "wb")
+        self._f.write(_HEADER.pack(
+            MAGIC, VERSION, self.flags, schema.fingerprint(),
+            schema.PHYSICS.size, schema.GRAPHICS.size, schema.STATIC.size,
+            self.frames_per_chunk,
+        ))
+
+        self._index = []
+        self._frames = []
+        self._static = None
+        self._first_time = 0.0
+        self.frame_count = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def write(self, sm, t=None):
+        t = self.clock() if t is None else t
+        static = schema.STATIC.pack(sm.Static)
+        if self._frames and static != self._static:
+            self._flush()
+        if not self._frames:
+            self._static = static
+            self._first_time = t
+
+        self._frames.append(
+            _TIMESTAMP.pack(t) + schema.PHYSICS.pack(sm.Physics) + schema.GRAPHICS.pack(sm.Graphics)
+        )
+        self.frame_count += 1
+        if len(self._frames) >= self.frames_per_chunk:
+            self._flush()
+
+    def _flush(self):
+        if not self._frames:
+            return
+        frames = self._frames
+        if self.flags & FLAG_DELTA:
+            frames = [frames[0]] + [_xor(cur, prev) for prev, cur in zip(self._frames, self._frames[1:])]
+        raw = self._static + b"".join(frames)
+        stored = zlib.compress(raw, 1) if self.flags & FLAG_COMPRESSED else raw
+
+        first_frame = self.frame_count - len(self._frames)
+        offset = self._f.tell()
+        self._f.write(_CHUNK.pack(b"CHNK", len(self._frames), first_frame, len(raw), len(stored), self._first_time))
+        self._f.write(stored)
+        self._index.append((first_frame, offset, self._first_time))
+        self._frames = []
+
+    def close(self):
+        if self._f.closed:
+            return
+        self._flush()
+        index_offset = self._f.tell()
+        self._f.write(_INDEX_HEAD.pack(b"INDX", len(self._index)))
+        for entry in self._index:
+            self._f.write(_INDEX_ENTRY.pack(*entry))
+        self._f.write(_TRAILER.pack(index_offset, b"ACCE"))
+        self._f.close()
+
+
+class SessionReader:
+    """Random access to a recording through a read-only memory map.
+
+    Plain chunks are decoded straight from the map; compressed or delta coded
+    ones are decoded once and the last decoded chunk is kept.
+    """
+
+    def __init__(self, path):
+        self.path = str(path)
+        self._file = open(self.path, "rb")
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        magic, version, self.flags, fp, phys, graph, stat, self.frames_per_chunk = _HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise RecordingError(f"{self.path}: not a telemetry recording")
+        if fp != schema.fingerprint() or (phys, graph, stat) != (
+            schema.PHYSICS.size, schema.GRAPHICS.size, schema.STATIC.size
+        ):
+            raise RecordingError(f"{self.path}: recorded with a different block layout")
+
+        self._chunks = self._read_index()
+        self._first_frames = [c[0] for c in self._chunks]
+        self._first_times = [c[2] for c in self._chunks]
+        if self._chunks:
+            first, offset, _ = self._chunks[-1]
+            self.frame_count = first + _CHUNK.unpack_from(self._mm, offset)[1]
+        else:
+            self.frame_count = 0
+
+        self._cached_chunk = None
+        self._cached = None
+
+    def __len__(self):
+        return self.frame_count
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._cached_chunk = self._cached = None
+        self._mm.close()
+        self._file.close()
+
+    def _read_index(self):
+        size = len(self._mm)
+        if size >= _HEADER.size + _TRAILER.size:
+            index_offset, tag = _TRAILER.unpack_from(self._mm, size - _TRAILER.size)
+            if tag == b"ACCE":
+                head, count = _INDEX_HEAD.unpack_from(self._mm, index_offset)
+                if head == b"INDX":
+                    base = index_offset + _INDEX_HEAD.size
+                    return [_INDEX_ENTRY.unpack_from(self._mm, base + i * _INDEX_ENTRY.size) for i in range(count)]
+        return self._scan_chunks()
+
+    def _scan_chunks(self):
+        chunks = []
+        offset = _HEADER.size
+        size = len(self._mm)
+        while offset + _CHUNK.size <= size:
+            tag, n, first, _, stored_len, first_time = _CHUNK.unpack_from(self._mm, offset)
+            if tag != b"CHNK" or offset + _CHUNK.size + stored_len > size:
+                break  # index or a torn final chunk
+            chunks.append((first, offset, first_time))
+            offset += _CHUNK.size + stored_len
+        return chunks
+
+    def _chunk(self, k):
+        """(Static, buffer, offset of the first frame, frame count) for chunk k."""
+        if self._cached_chunk == k:
+            return self._cached
+
+        _, offset, _ = self._chunks[k]
+        _, n, _, raw_len, stored_len, _ = _CHUNK.unpack_from(self._mm, offset)
+        start = offset + _CHUNK.size
+        if self.flags & FLAG_COMPRESSED:
+            buf = zlib.decompress(self._mm[start:start + stored_len])
+            start = 0
+        else:
+            # read frames straight out of the map
+            buf = self._mm
+
+        static = schema.STATIC.unpack(buf, start)
+        base = start + schema.STATIC.size
+
+        if self.flags & FLAG_DELTA:
+            frames = [bytes(buf[base:base + FRAME_SIZE])]
+            for i in range(1, n):
+                lo = base + i * FRAME_SIZE
+                frames.append(_xor(bytes(buf[lo:lo + FRAME_SIZE]), frames[-1]))
+            buf = b"".join(frames)
+            base = 0
+
+        self._cached_chunk = k
+        self._cached = (static, buf, base, n)
+        return self._cached
+
+    def locate(self, i):
+        """(chunk number, frame within chunk) for frame ``i``."""
+        if not 0 <= i < self.frame_count:
+            raise IndexError(i)
+        k = bisect_right(self._first_frames, i) - 1
+        return k, i - self._first_frames[k]
+
+    def timestamp(self, i):
+        k, j = self.locate(i)
+        _, buf, base, _ = self._chunk(k)
+        return _TIMESTAMP.unpack_from(buf, base + j * FRAME_SIZE)[0]
+
+    def find(self, t):
+        """Index of the last frame recorded at or before ``t`` (0 if none)."""
+        if not self._chunks:
+            raise IndexError(t)
+        k = max(0, bisect_right(self._first_times, t) - 1)
+        first = self._first_frames[k]
+        _, _, _, n = self._chunk(k)
+        lo, hi = 0, n
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.timestamp(first + mid) <= t:
+                lo = mid + 1
+            else:
+                hi = mid
+        return first + max(0, lo - 1)
+
+    def frame(self, i):
+        """(timestamp, snapshot) for frame ``i``, shaped like read_shared_memory()."""
+        k, j = self.locate(i)
+        static, buf, base, _ = self._chunk(k)
+        offset = base + j * FRAME_SIZE
+        t = _TIMESTAMP.unpack_from(buf, offset)[0]
+        offset += _TIMESTAMP.size
+        physics = schema.PHYSICS.unpack(buf, offset)
+        graphics = schema.GRAPHICS.unpack(buf, offset + schema.PHYSICS.size)
+        return t, acc.ACC_map(physics, graphics, static)
+
+    def __iter__(self):
+        for i in range(self.frame_count):
+            yield self.frame(i)
@@ -0,0 +1,99 @@
+import time
+
+from .recording import SessionReader
+
+# speed value for "as fast as the consumer asks"
+AS_FAST_AS_POSSIBLE = 0
+
+
+class ReplayTelemetry:
+    """Plays a recorded session back through the Telemetry interface.
+
+    ``get_sm()`` returns snapshots shaped exactly like
+    ``accSharedMemory.read_shared_memory()``, and ``None`` when there is no
+    new frame yet, so it can stand in for ``Telemetry`` anywhere.
+
+    ``speed`` is the playback rate relative to the recording: 1.0 is real
+    time, 4.0 is four times faster, and AS_FAST_AS_POSSIBLE hands out the
+    next frame on every call.
+    """
+
+    def __init__(self, path, speed=1.0, loop=False, clock=time.perf_counter):
+        self.path = str(path)
+        self.speed = speed
+        self.loop = loop
+        self.clock = clock
+
+        self.reader = None
+        self.position = 0
+        # recorded time of the last frame handed out
+        self.last_time = 0.0
+        self._last_served = None
+        self._origin_wall = 0.0
+        self._origin_rec = 0.0
+
+    def connect(self):
+        if self.reader is None:
+            self.reader = SessionReader(self.path)
+            self.seek(0)
+        return self.reader
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def __len__(self):
+        return len(self.reader) if self.reader is not None else 0
+
+    @property
+    def finished(self):
+        return self.reader is not None and self.position >= len(self.reader) and not self.loop
+
+    def seek(self, i):
+        """Continue playback from frame ``i``."""
+        self.position = max(0, min(int(i), len(self.reader)))
+        self._last_served = None
+        if self.position < len(self.reader):
+            self._origin_rec = self.reader.timestamp(self.position)
+        self._origin_wall = self.clock()
+
+    def seek_time(self, t):
+        """Continue playback from the frame recorded at (or just before) ``t``."""
+        self.seek(self.reader.find(t))
+
+    def set_speed(self, speed):
+        # keep the current position, change the rate from here on
+        self.speed = speed
+        self.seek(self.position)
+
+    def get_sm(self):
+        reader = self.connect()
+        n = len(reader)
+        if n == 0:
+            return None
+
+        if self.position >= n:
+            if not self.loop:
+                return None
+            self.seek(0)
+
+        if not self.speed:
+            self.last_time, sm = reader.frame(self.position)
+            self.position += 1
+            return sm
+
+        # latest frame whose recorded time has been reached
+        target = self._origin_rec + (self.clock() - self._origin_wall) * self.speed
+        i = self.position
+        if reader.timestamp(i) > target:
+            return None
+        while i + 1 < n and reader.timestamp(i + 1) <= target:
+            i += 1
+        if i == self._last_served:
+            return None
+
+        self._last_served = i
+        self.position = i + 1
+        self.last_time, sm = reader.frame(i)
+        return sm
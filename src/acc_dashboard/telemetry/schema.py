@@ -0,0 +1,140 @@
+"""Fixed binary layouts for the Physics, Graphics and Static blocks.
+
+The layouts are derived once from pyaccsharedmemory's dataclasses, so every
+field of a snapshot round-trips: ``BlockLayout.pack`` turns a block into a
+fixed-size little-endian record and ``BlockLayout.unpack`` rebuilds the same
+dataclass (enums included) from it.
+"""
+
+import dataclasses
+import struct
+import zlib
+from enum import Enum
+
+import pyaccsharedmemory as acc
+
+CAR_SLOTS = 60
+# ACC strings are at most 33 UTF-16 code units
+STRING_BYTES = 66
+
+_ENUMS = {
+    cls.__name__: cls
+    for cls in vars(acc).values()
+    if isinstance(cls, type) and issubclass(cls, Enum) and cls is not Enum
+}
+
+
+def _enum_value(cls, v):
+    try:
+        return cls(v)
+    except ValueError:
+        # ACC sends undocumented penalty values; pyaccsharedmemory does the same
+        return cls.UnknownValue if hasattr(cls, "UnknownValue") else v
+
+
+_WHEELS = ("front_left", "front_right", "rear_left", "rear_right")
+
+
+def _xyz(v):
+    return v.x, v.y, v.z
+
+
+def _field_codec(type_name):
+    """(struct format, value count, flatten(value) -> tuple, build(values) -> value)."""
+    if type_name == "float":
+        return "f", 1, lambda v: (v,), lambda vs: vs[0]
+    if type_name == "int":
+        return "i", 1, lambda v: (v,), lambda vs: vs[0]
+    if type_name == "bool":
+        return "?", 1, lambda v: (bool(v),), lambda vs: vs[0]
+    if type_name == "str":
+        return (
+            f"{STRING_BYTES}s", 1,
+            # pyaccsharedmemory fills last_sector_time_str with an int
+            lambda v: (str(v).encode("utf-16-le")[:STRING_BYTES],),
+            lambda vs: vs[0].decode("utf-16-le", errors="ignore"),
+        )
+    if type_name == "Vector3f":
+        return "3f", 3, _xyz, lambda vs: acc.Vector3f(*vs)
+    if type_name == "Wheels":
+        return (
+            "4f", 4,
+            lambda v: tuple(getattr(v, w) for w in _WHEELS),
+            lambda vs: acc.Wheels(*vs),
+        )
+    if type_name == "CarDamage":
+        return (
+            "5f", 5,
+            lambda v: (v.front, v.rear, v.left, v.right, v.center),
+            lambda vs: acc.CarDamage(*vs),
+        )
+    if type_name == "ContactPoint":
+        return (
+            "12f", 12,
+            lambda v: tuple(c for w in _WHEELS for c in _xyz(getattr(v, w))),
+            lambda vs: acc.ContactPoint.from_list([vs[i:i + 3] for i in range(0, 12, 3)]),
+        )
+    if type_name == "List[Vector3f]":
+        n = CAR_SLOTS * 3
+        return (
+            f"{n}f", n,
+            lambda v: tuple(c for p in v[:CAR_SLOTS] for c in _xyz(p)),
+            lambda vs: [acc.Vector3f(*vs[i:i + 3]) for i in range(0, n, 3)],
+        )
+    if type_name == "List[int]":
+        return f"{CAR_SLOTS}i", CAR_SLOTS, lambda v: tuple(v[:CAR_SLOTS]), tuple
+    if type_name in _ENUMS:
+        cls = _ENUMS[type_name]
+        return (
+            "i", 1,
+            lambda v: (v.value if isinstance(v, Enum) else int(v),),
+            lambda vs: _enum_value(cls, vs[0]),
+        )
+    raise TypeError(f"no binary layout for field type {type_name!r}")
+
+
+class BlockLayout:
+    """Binary layout of one shared-memory block (a pyaccsharedmemory dataclass)."""
+
+    def __init__(self, cls):
+        self.cls = cls
+        self.fields = []
+        fmt = "<"
+        for f in dataclasses.fields(cls):
+            field_fmt, n, flatten, build = _field_codec(f.type)
+            self.fields.append((f.name, n, flatten, build))
+            fmt += field_fmt
+        self.format = fmt
+        self._struct = struct.Struct(fmt)
+        self.size = self._struct.size
+
+    def flatten(self, block):
+        out = []
+        for name, _, flatten, _ in self.fields:
+            out.extend(flatten(getattr(block, name)))
+        return out
+
+    def pack(self, block) -> bytes:
+        return self._struct.pack(*self.flatten(block))
+
+    def pack_into(self, buf, offset, block):
+        self._struct.pack_into(buf, offset, *self.flatten(block))
+
+    def unpack(self, data, offset=0):
+        values = self._struct.unpack_from(data, offset)
+        kwargs = {}
+        i = 0
+        for name, n, _, build in self.fields:
+            kwargs[name] = build(values[i:i + n])
+            i += n
+        return self.cls(**kwargs)
+
+
+PHYSICS = BlockLayout(acc.PhysicsMap)
+GRAPHICS = BlockLayout(acc.GraphicsMap)
+STATIC = BlockLayout(acc.StaticsMap)
+
+
+def fingerprint() -> int:
+    """Changes whenever any block layout changes; stored in recordings."""
+    return zlib.crc32("|".join((PHYSICS.format, GRAPHICS.format, STATIC.format)).encode())
@@ -1,25 +1,33 @@
 import sys
+import time
+
 from PySide6.QtWidgets import (
     QApplication, QWidget, QMainWindow, QLabel, QFrame,
     QVBoxLayout, QHBoxLayout, QGridLayout, QProgressBar
 )
-from PySide6.QtGui import QPainter, QPen, QBrush, QColor, QPainterPath,  QPixmap, QPainter
-from PySide6.QtCore import Qt, QPointF, QRectF
-import time 
+from PySide6.QtGui import QPainter, QPen, QColor, QPainterPath, QPixmap, QKeySequence, QShortcut
+from PySide6.QtCore import Qt, QPointF, QRectF, QEvent
+
+from ..instrument import PROBES
+from ..processors.pace import TrackPace
+from . import sprites
+from .perf_overlay import PerfOverlay
+from .sprites import marker_sprite
 
 
 # =========================================================
 # Mini Map
 # =========================================================
 
-import time
-
-from PySide6.QtWidgets import QWidget
-from PySide6.QtGui import QPainter, QPen, QColor
-from PySide6.QtCore import Qt, QPointF
-
-
 class MiniMapWidget(QWidget):
+    NEUTRAL = QColor(200, 200, 200)
+    TRACK_WIDTH = 3
+    PLAYER_MARKER_SIZE = 16
+    OPPONENT_MARKER_SIZE = 14
+    MARKER_ROTATIONS = 64
+    # opponents closer than this (world units) get the highlighted marker
+    HIGHLIGHT_RADIUS = 30.0
+
     def __init__(self, parent=None):
         super().__init__(parent)
 
@@ -28,222 +36,61 @@ class MiniMapWidget(QWidget):
         self._bounds = None
         self._player_car_id = None
 
-        # car_id -> per-car pace data
-        self._pace_list = {}
-
         self.clock = time.perf_counter
 
-        # sector config
-        self._sector_len = 10
-        self._sector_count = 0
-        self._pt_index = {}
+        # per-car pace and sectors, rebuilt for every track
+        self.pace = TrackPace()
         self._player_car_rotation = None
 
+        # pre-rendered track outline, keyed by widget size and track
+        self._track_layer = None
+        self._track_layer_key = None
+        self._track_version = 0
+        self._screen_pts = []
+
+        sprites.preload()
         self.setMinimumHeight(260)
 
     def set_sector_count(self, n: int):
-        self._sector_count = max(0, int(n))
+        self.pace.sector_target = max(0, int(n))
+
+    def set_track(self, track_pts, track_index=None, track=None):
+        """Load static track geometry. Only needed when the track changes.
+
+        ``track`` is the registry's TrackInfo for these points; when given,
+        its bounds, arc length and sector layout are reused.
+        """
+        self.pace.set_track(track_pts, track_index, track)
+        self._track_pts = self.pace.track_pts
+        if self.pace.track is not None:
+            self._bounds = self.pace.track.bounds
+        else:
+            self._bounds = self._compute_bounds(self._track_pts) if self._track_pts else None
 
-    def set_data(self, track_pts, cars, player_car_id=None, player_car_rotation=None):
-        self._track_pts = [(float(x), float(z)) for x, z in (track_pts or [])]
+        self._track_version += 1
+        self._track_layer = None
+        self.update()
+
+    def set_cars(self, cars, player_car_id=None, player_car_rotation=None):
+        """Per-tick update: car positions and player info only."""
         self._cars = cars or []
-        self._bounds = self._compute_bounds(self._track_pts) if self._track_pts else None
         self._player_car_id = player_car_id
         self._player_car_rotation = player_car_rotation
-        # point -> index
-        self._pt_index = {pt: i for i, pt in enumerate(self._track_pts)}
-
-        # sector sizing
-        if self._track_pts:
-            if self._sector_count > 0:
-                self._sector_len = max(1, len(self._track_pts) // self._sector_count)
-            else:
-                self._sector_count = max(
-                    1, (len(self._track_pts) + self._sector_len - 1) // self._sector_len
-                )
-
-        now = self.clock()
-
-        for car in self._cars:
-            car_id = car.get("car_id")
-            if car_id is None:
-                continue
-
-            if car_id not in self._pace_list:
-                # per-point map (linked list)
-                points = {}
-                for i in range(len(self._track_pts)):
-                    pt = self._track_pts[i]
-                    points[pt] = {
-                        "speed": 0.0,
-                        "last_speed": 0.0,
-                        "next_point": self._track_pts[(i + 1) % len(self._track_pts)],
-                    }
-
-                # per-sector stats:
-                # avg = latest completed sector value
-                # prev_avg = previous completed value (for delta)
-                sectors = {}
-                for s in range(self._sector_count):
-                    sectors[s] = {
-                        "avg": 0.0,
-                        "prev_avg": 0.0,
-                        "sum": 0.0,
-                        "cnt": 0,
-                    }
-
-                self._pace_list[car_id] = {
-                    "points": points,
-                    "last_point_seen": None,
-                    "last_time_seen": now,
-                    "sectors": sectors,
-                    "last_sector": None,
-                }
-
+        t0 = PROBES.start()
+        self.pace.set_cars(self._cars, player_car_id, self.clock())
+        PROBES.stop("minimap.set_cars", t0)
         self.update()
 
-    def find_closest_track_point(self, x, z):
-        if not self._track_pts:
-            return None
-        closest_pt = None
-        closest_dist = float("inf")
-        for pt in self._track_pts:
-            dx = pt[0] - x
-            dz = pt[1] - z
-            dist = (dx * dx) + (dz * dz)
-            if dist < closest_dist:
-                closest_dist = dist
-                closest_pt = pt
-        return closest_pt
-
-    def _commit_sector(self, pace_data, sector_id: int):
-        """Commit the running sum/cnt into avg, shifting avg -> prev_avg."""
-        if sector_id is None:
-            return
-        sec = pace_data["sectors"].get(sector_id)
-        if not sec:
-            return
-        if sec["cnt"] <= 0:
-            return
-
-        new_avg = sec["sum"] / max(sec["cnt"], 1)
-        sec["prev_avg"] = sec["avg"]
-        sec["avg"] = new_avg
-        sec["sum"] = 0.0
-        sec["cnt"] = 0
-
     def compute_paces(self):
-        if not self._track_pts:
-            return
-
-        for car in self._cars:
-            car_id = car.get("car_id")
-            if car_id is None or car_id not in self._pace_list:
-                continue
-            if car.get("x") == 0 and car.get("z") == 0:
-                continue
-
-            pace_data = self._pace_list[car_id]
-            points = pace_data["points"]
-
-            closest_pt = self.find_closest_track_point(car["x"], car["z"])
-            if closest_pt is None:
-                continue
-
-            now = self.clock()
-            last_time = pace_data.get("last_time_seen", now)
-            dt = now - last_time
-            last_point_seen = pace_data.get("last_point_seen")
-
-            # First observation
-            if last_point_seen is None:
-                pace_data["last_point_seen"] = closest_pt
-                pace_data["last_time_seen"] = now
-                pace_data["last_sector"] = None
-                continue
-
-            if dt <= 1e-6:
-                continue
-            
-            if (self._pt_index.get(closest_pt) < self._pt_index.get(last_point_seen)) & (self._pt_index.get(closest_pt) > (self._pt_index.get(last_point_seen) + self._sector_len)):
-                # jumped backwards or too far forwards - reset
-                pace_data["last_point_seen"] = closest_pt
-                pace_data["last_time_seen"] = now
-                pace_data["last_sector"] = None
-                continue
-
-            if closest_pt != last_point_seen:
-                dx = closest_pt[0] - last_point_seen[0]
-                dz = closest_pt[1] - last_point_seen[1]
-                distance = (dx * dx + dz * dz) ** 0.5
-                speed = distance / dt
-
-                while last_point_seen != closest_pt:
-                    # per-point
-                    points[last_point_seen]["last_speed"] = points[last_point_seen]["speed"]
-                    points[last_point_seen]["speed"] = speed
-
-                    # sector id for this point
-                    idx = self._pt_index.get(last_point_seen)
-                    if idx is not None and self._sector_count > 0:
-                        s = idx // self._sector_len
-                        if s >= self._sector_count:
-                            s = self._sector_count - 1
-
-                        prev_s = pace_data.get("last_sector")
-                        if prev_s is None:
-                            pace_data["last_sector"] = s
-                        elif s != prev_s:
-                            # leaving prev sector -> commit it
-                            self._commit_sector(pace_data, prev_s)
-                            pace_data["last_sector"] = s
-
-                        # accumulate current sector
-                        sec = pace_data["sectors"][s]
-                        sec["sum"] += speed
-                        sec["cnt"] += 1
-
-                    last_point_seen = points[last_point_seen]["next_point"]
-
-                pace_data["last_point_seen"] = closest_pt
-                pace_data["last_time_seen"] = now
-
-    def compute_track_dominance(self, x, z):
-        NEUTRAL = QColor(200, 200, 200)
-
-        if self._player_car_id is None:
-            return NEUTRAL
-        player_pace = self._pace_list.get(self._player_car_id)
-        if not player_pace:
-            return NEUTRAL
-
-        idx = self._pt_index.get((x, z))
-        if idx is None or self._sector_count <= 0:
-            return NEUTRAL
-
-        s = idx // self._sector_len
-        if s >= self._sector_count:
-            s = self._sector_count - 1
-
-        sec = player_pace["sectors"].get(s)
-        if not sec:
-            return NEUTRAL
-
-        v = float(sec.get("avg", 0.0))
-        v_prev = float(sec.get("prev_avg", 0.0))
-
-        # Need at least two completed passes of that sector to compare
-        # if v <= 0.0 or v_prev <= 0.0:
-        #     return NEUTRAL
-
-        rel = (v - v_prev) / max(v_prev, 1e-6)
-
-        dead = 0.03
-        if abs(rel) < dead:
-            return NEUTRAL
-
-        sat = 0.10
-        t = max(-1.0, min(1.0, rel / sat))
+        t0 = PROBES.start()
+        self.pace.step(self.clock())
+        PROBES.stop("minimap.compute_paces", t0)
+
+    def _sector_dominance(self, s):
+        """Colour for sector s, or None when it should stay neutral."""
+        t = self.pace.dominance(s)
+        if t is None:
+            return None
         a = abs(t)
 
         base_r, base_g, base_b = 200, 200, 200
@@ -286,28 +133,78 @@ class MiniMapWidget(QWidget):
 
         return QPointF(sx, sy)
     
-    def draw_player_marker(self, p: QPainter, pt: QPointF):
-        rotation = float(self._player_car_rotation or 0.0)  
-        rotation_deg = rotation * (180.0 / 3.14159265)
+    def resizeEvent(self, event):
+        self._track_layer = None
+        super().resizeEvent(event)
+
+    def _ensure_track_layer(self):
+        key = (self.width(), self.height(), self._track_version)
+        if self._track_layer is not None and self._track_layer_key == key:
+            return self._track_layer
+
+        self._screen_pts = [self._world_to_screen(x, z) for x, z in self._track_pts]
+
+        path = QPainterPath(self._screen_pts[0])
+        for pt in self._screen_pts[1:]:
+            path.lineTo(pt)
+        path.closeSubpath()
+
+        dpr = self.devicePixelRatioF()
+        layer = QPixmap(max(1, int(self.width() * dpr)), max(1, int(self.height() * dpr)))
+        layer.setDevicePixelRatio(dpr)
+        layer.fill(Qt.transparent)
+
+        lp = QPainter(layer)
+        lp.setRenderHint(QPainter.Antialiasing, True)
+        lp.setPen(QPen(self.NEUTRAL, self.TRACK_WIDTH))
+        lp.drawPath(path)
+        lp.end()
+
+        self._track_layer = layer
+        self._track_layer_key = key
+        return layer
+
+    def _draw_dominance(self, p: QPainter):
+        """Overdraw sectors whose pace differs from the previous pass."""
+        n = len(self._screen_pts)
+        sector_count, sector_len = self.pace.sector_count, self.pace.sector_len
+        if n < 2 or sector_count <= 0:
+            return
 
-        pm = QPixmap("src/acc_dashboard/resources/images/player_marker.png")
-        w, h = 16, 16
+        for s in range(sector_count):
+            col = self._sector_dominance(s)
+            if col is None:
+                continue
 
-        p.save()
+            start = s * sector_len
+            end = n if s == sector_count - 1 else min(n, start + sector_len)
+            if start >= end:
+                continue
+
+            # segment i runs from point i to point i + 1 (wrapping to close the loop)
+            path = QPainterPath(self._screen_pts[start])
+            for i in range(start, end):
+                path.lineTo(self._screen_pts[(i + 1) % n])
 
-        # optional: nicer looking scaling/rotation
-        p.setRenderHint(QPainter.Antialiasing, True)
-        p.setRenderHint(QPainter.SmoothPixmapTransform, True)
+            p.setPen(QPen(col, self.TRACK_WIDTH))
+            p.setBrush(Qt.NoBrush)
+            p.drawPath(path)
 
-        # rotate around the marker center
-        p.translate(pt.x(), pt.y())
-        p.rotate(-rotation_deg)          # minus if your angle sign is opposite of Qt's CCW
-        p.drawPixmap(-w/2, -h/2, w, h, pm)
+    def draw_player_marker(self, p: QPainter, pt: QPointF):
+        rotation = float(self._player_car_rotation or 0.0)  
+        rotation_deg = rotation * (180.0 / 3.14159265)
 
-        p.restore()
+        sprite = marker_sprite(
+            sprites.PLAYER_MARKER, self.PLAYER_MARKER_SIZE, self.MARKER_ROTATIONS, self.devicePixelRatioF()
+        )
+        sprite.draw(p, pt, -rotation_deg)   # minus if your angle sign is opposite of Qt's CCW
 
+    def draw_opponent_marker(self, p: QPainter, pt: QPointF, highlighted=False):
+        name = sprites.OPPONENT_MARKER_HIGHLIGHTED if highlighted else sprites.OPPONENT_MARKER
+        marker_sprite(name, self.OPPONENT_MARKER_SIZE, 1, self.devicePixelRatioF()).draw(p, pt)
 
     def paintEvent(self, event):
+        t0 = PROBES.start()
         p = QPainter(self)
         try:
             p.setRenderHint(QPainter.Antialiasing, True)
@@ -316,38 +213,35 @@ class MiniMapWidget(QWidget):
                 return
             if self._player_car_id is None:
                 return
-            if self._player_car_id not in self._pace_list:
+            if self._player_car_id not in self.pace.store:
                 return
 
-            # draw track segments
-            for (x1, z1), (x2, z2) in zip(self._track_pts, self._track_pts[1:]):
-                col = self.compute_track_dominance(x1, z1)
-                p.setPen(QPen(col, 3))
-                p.drawLine(self._world_to_screen(x1, z1), self._world_to_screen(x2, z2))
-
-            # close loop
-            x1, z1 = self._track_pts[-1]
-            x2, z2 = self._track_pts[0]
-            col = self.compute_track_dominance(x1, z1)
-            p.setPen(QPen(col, 3))
-            p.drawLine(self._world_to_screen(x1, z1), self._world_to_screen(x2, z2))
+            # static outline, then only the sectors that differ from it
+            p.drawPixmap(0, 0, self._ensure_track_layer())
+            self._draw_dominance(p)
 
-            # draw cars
+            # draw cars, player last so it stays on top
+            player = next(
+                (c for c in self._cars if c.get("is_player") and not (c.get("x") == 0 and c.get("z") == 0)),
+                None,
+            )
+            near = self.HIGHLIGHT_RADIUS * self.HIGHLIGHT_RADIUS
             for car in self._cars:
-                if car.get("x") == 0 and car.get("z") == 0:
+                if car is player or (car.get("x") == 0 and car.get("z") == 0):
                     continue
-                pt = self._world_to_screen(car["x"], car["z"])
-                p.setPen(Qt.NoPen)
-                if car.get("is_player"):
-                    self.draw_player_marker(p, pt)
-                else:
-                    p.setBrush(QBrush(QColor(200, 200, 200, 180)))
-                    r = 5
-                    p.drawEllipse(pt, r, r)
+                highlighted = False
+                if player is not None:
+                    dx = car["x"] - player["x"]
+                    dz = car["z"] - player["z"]
+                    highlighted = dx * dx + dz * dz <= near
+                self.draw_opponent_marker(p, self._world_to_screen(car["x"], car["z"]), highlighted)
+            if player is not None:
+                self.draw_player_marker(p, self._world_to_screen(player["x"], player["z"]))
 
         finally:
             if p.isActive():
                 p.end()
+            PROBES.stop("paint.minimap", t0)
 # =========================================================
 # Track Card
 # =========================================================
@@ -372,15 +266,20 @@ class TrackCard(QFrame):
         header.addWidget(self.track_name)
 
         self.map = MiniMapWidget()
+        self._track_key = None
 
         root.addLayout(header)
         root.addWidget(self.map, 1)
 
     def update_view(self, d):
-        self.track_name.setText(d.get("track_name", "—"))
-        self.map.set_data(d.get("track_points"), d.get("cars_coordinates", []), d.get("player_car_id", None), d.get("player_car_rotation", None))
+        # a reloaded track (edited files) comes back as a new TrackInfo
+        track_key = (d.get("track_name"), d.get("path_to_points"), d.get("track"))
+        if track_key != self._track_key:
+            self._track_key = track_key
+            self.track_name.setText(d.get("track_name", "—"))
+            self.map.set_track(d.get("track_points"), d.get("track_index"), d.get("track"))
+        self.map.set_cars(d.get("cars_coordinates", []), d.get("player_car_id", None), d.get("player_car_rotation", None))
         self.map.compute_paces()
-        self.map.update()
 
 
 # =========================================================
@@ -393,12 +292,22 @@ class TyreTile(QWidget):
         self.label = label
         self.temp = None
         self.grip = None
+        self._drawn = None
         self.setMinimumSize(120, 80)
 
     def set_values(self, temp, grip):
         self.temp = temp
         self.grip = grip
-        self.update()
+        # repaint only when what is drawn changes: the whole degrees shown,
+        # the colour band and the grip bar (to 1/1000)
+        key = (
+            None if temp is None else round(temp),
+            self._temp_color().rgba(),
+            None if grip is None else round(max(0.0, min(1.0, grip)) * 1000),
+        )
+        if key != self._drawn:
+            self._drawn = key
+            self.update()
 
     def _temp_color(self):
         if self.temp is None:
@@ -412,6 +321,7 @@ class TyreTile(QWidget):
         return QColor(255, 120, 120, 180)
 
     def paintEvent(self, _):
+        t0 = PROBES.start()
         p = QPainter(self)
         p.setRenderHint(QPainter.Antialiasing)
 
@@ -436,6 +346,8 @@ class TyreTile(QWidget):
             p.setPen(Qt.NoPen)
             p.setBrush(QColor(120, 255, 180) if w > 0.4 else QColor(255, 120, 120))
             p.drawRoundedRect(bar, 3, 3)
+        p.end()
+        PROBES.stop("paint.tyre_tile", t0)
 
 
 # =========================================================
@@ -534,7 +446,20 @@ class FuelCard(QFrame):
         secondary.addStretch()
         root.addLayout(secondary)
 
+        # Pit stop projection
+        pit = QHBoxLayout()
+        self.pit_window = QLabel("Pit: —")
+        self.pit_window.setObjectName("valueLine")
+        self.fuel_to_add = QLabel("")
+        self.fuel_to_add.setObjectName("valueLine")
+        self.fuel_to_add.setAlignment(Qt.AlignRight)
+        pit.addWidget(self.pit_window)
+        pit.addStretch()
+        pit.addWidget(self.fuel_to_add)
+        root.addLayout(pit)
+
         self._max_seen = 1.0
+        self._margin_state = None
 
     def _divider(self):
         d = QFrame()
@@ -547,17 +472,43 @@ class FuelCard(QFrame):
         need = d["fuel_needed_to_finish"]
         margin = d["margin"]
 
-        self.fuel_left_small.setText(f"{fuel:.1f} L")
-        self.fuel_per_lap.setText(f"{d['fuel_per_lap']:.2f} L / lap")
-        self.need_big.setText(f"Need: {need:.1f} L")
+        # labels only change when the text at displayed precision does
+        _set_text(self.fuel_left_small, f"{fuel:.1f} L")
+        _set_text(self.fuel_per_lap, f"{d['fuel_per_lap']:.2f} L / lap")
+        _set_text(self.need_big, f"Need: {need:.1f} L")
 
         self._max_seen = max(self._max_seen, fuel, need, 1.0)
-        self.bar.setValue(int((fuel / self._max_seen) * 1000))
+        value = int((fuel / self._max_seen) * 1000)
+        if value != self.bar.value():
+            self.bar.setValue(value)
+
+        window = d.get("pit_window")
+        stops = d.get("stops_needed")
+        if window is not None:
+            _set_text(self.pit_window, f"Pit: laps {window[0]}–{window[1]}")
+        elif stops == 0:
+            _set_text(self.pit_window, "Pit: no stop needed")
+        elif stops is not None:
+            _set_text(self.pit_window, f"Pit: {stops}+ stops")
+        else:
+            # tank size unknown, no window to show
+            _set_text(self.pit_window, "Pit: —")
+        to_add = d.get("fuel_to_add", 0.0)
+        _set_text(self.fuel_to_add, f"Add {to_add:.1f} L" if to_add > 0 else "")
 
-        self.margin_big.setText(f"Margin: {margin:+.1f} L")
-        self.margin_big.setProperty("state", "good" if margin >= 0 else "bad")
-        self.margin_big.style().unpolish(self.margin_big)
-        self.margin_big.style().polish(self.margin_big)
+        _set_text(self.margin_big, f"Margin: {margin:+.1f} L")
+        state = "good" if margin >= 0 else "bad"
+        if state != self._margin_state:
+            # repolishing recomputes the stylesheet; only do it on a flip
+            self._margin_state = state
+            self.margin_big.setProperty("state", state)
+            self.margin_big.style().unpolish(self.margin_big)
+            self.margin_big.style().polish(self.margin_big)
+
+
+def _set_text(label, text):
+    if label.text() != text:
+        label.setText(text)
 
 
 # =========================================================
@@ -632,6 +583,32 @@ class MainWindow(QMainWindow):
             #divider { background: rgba(255,255,255,22); }
         """)
 
+        # F3: timings overlay, F4: write them to perf_export_path (--perf-export)
+        self.perf_overlay = PerfOverlay(central)
+        self.perf_export_path = None
+        QShortcut(QKeySequence(Qt.Key_F3), self, self.perf_overlay.toggle)
+        QShortcut(QKeySequence(Qt.Key_F4), self, self.export_perf)
+
+    def export_perf(self):
+        if not self.perf_export_path:
+            self.perf_overlay.show_message("F4 saves timings when started with --perf-export PATH")
+            return
+        try:
+            path = PROBES.export(self.perf_export_path)
+        except OSError as e:
+            self.perf_overlay.show_message(f"Could not save timings: {e.strerror or e}")
+        else:
+            self.perf_overlay.show_message(f"Timings saved to {path}")
+
+    def event(self, e):
+        # one UpdateRequest repaints every dirty widget of the window
+        if e.type() != QEvent.UpdateRequest:
+            return super().event(e)
+        t0 = PROBES.start()
+        handled = super().event(e)
+        PROBES.stop("paint.window", t0)
+        return handled
+
 
 # =========================================================
 # Run
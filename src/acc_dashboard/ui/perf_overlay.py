@@ -0,0 +1,107 @@
+import time
+
+from PySide6.QtCore import QRectF, Qt, QTimer
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPainter
+from PySide6.QtWidgets import QWidget
+
+from ..instrument import PROBES
+
+REFRESH_MS = 500
+MESSAGE_SECONDS = 4.0
+
+
+class PerfOverlay(QWidget):
+    """Per-stage timings from ``PROBES`` drawn over the dashboard.
+
+    ``toggle`` shows it and switches the probes on; hiding it switches them
+    back off unless they were already on (``--perf``). Refreshed twice a
+    second, only while visible. ``show_message`` adds a line under the table
+    for a few seconds.
+    """
+
+    COLUMNS = ("stage", "n", "p50 us", "p99 us", "max us", "rate/s")
+
+    def __init__(self, parent, probes=PROBES):
+        super().__init__(parent)
+        self.probes = probes
+        self._keep_enabled = probes.enabled
+        self._lines = []
+        self._message = None
+        self._message_until = 0.0
+
+        self.setAttribute(Qt.WA_TransparentForMouseEvents, True)
+        self._font = QFont("monospace")
+        self._font.setStyleHint(QFont.TypeWriter)
+        self._font.setPointSize(9)
+
+        self._timer = QTimer(self)
+        self._timer.setInterval(REFRESH_MS)
+        self._timer.timeout.connect(self.refresh)
+        self.hide()
+
+    def toggle(self):
+        if self.isVisible():
+            self._timer.stop()
+            self.probes.enabled = self._keep_enabled
+            self.hide()
+        else:
+            self._keep_enabled = self.probes.enabled
+            self.probes.enabled = True
+            self.refresh()
+            self.show()
+            self.raise_()
+            self._timer.start()
+
+    def show_message(self, text):
+        self._message = text
+        self._message_until = time.monotonic() + MESSAGE_SECONDS
+        if self.isVisible():
+            self.refresh()
+        else:
+            self.toggle()
+
+    def refresh(self):
+        rows = [self.COLUMNS]
+        for name, s in self.probes.snapshot().items():
+            timed = s["max_us"] > 0
+            rows.append((
+                name,
+                str(s["count"]),
+                f"{s['p50_us']:.0f}" if timed else "",
+                f"{s['p99_us']:.0f}" if timed else "",
+                f"{s['max_us']:.0f}" if timed else "",
+                f"{s['rate_hz']:.1f}",
+            ))
+        widths = [max(len(r[c]) for r in rows) for c in range(len(self.COLUMNS))]
+        self._lines = [
+            "  ".join(cell.ljust(w) if c == 0 else cell.rjust(w) for c, (cell, w) in enumerate(zip(r, widths)))
+            for r in rows
+        ]
+        if len(rows) == 1:
+            self._lines.append("waiting for samples…")
+        if self._message is not None:
+            if time.monotonic() < self._message_until:
+                self._lines += ["", self._message]
+            else:
+                self._message = None
+
+        fm = QFontMetrics(self._font)
+        width = max(fm.horizontalAdvance(line) for line in self._lines) + 20
+        self.setGeometry(8, 8, width, fm.lineSpacing() * len(self._lines) + 16)
+        self.update()
+
+    def paintEvent(self, _):
+        p = QPainter(self)
+        p.setRenderHint(QPainter.Antialiasing)
+        p.setPen(Qt.NoPen)
+        p.setBrush(QColor(0, 0, 0, 200))
+        p.drawRoundedRect(QRectF(self.rect()), 8, 8)
+
+        p.setFont(self._font)
+        p.setPen(QColor(255, 255, 255, 230))
+        fm = QFontMetrics(self._font)
+        y = 8 + fm.ascent()
+        for line in self._lines:
+            p.drawText(10, y, line)
+            y += fm.lineSpacing()
+        p.end()
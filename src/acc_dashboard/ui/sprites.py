@@ -0,0 +1,72 @@
+import math
+from functools import lru_cache
+
+from PySide6.QtCore import QPointF, QRectF, Qt
+from PySide6.QtGui import QImage, QPainter, QPixmap
+
+from ..paths import IMAGES_DIR
+
+PLAYER_MARKER = "player_marker.png"
+OPPONENT_MARKER = "oponent_marker.png"
+OPPONENT_MARKER_HIGHLIGHTED = "oponent_marker_higlighted.png"
+
+MARKERS = (PLAYER_MARKER, OPPONENT_MARKER, OPPONENT_MARKER_HIGHLIGHTED)
+
+
+@lru_cache(maxsize=None)
+def load_image(name: str) -> QImage:
+    """Decode a bundled image once; later calls reuse the same QImage."""
+    return QImage(str(IMAGES_DIR / name))
+
+
+def preload():
+    for name in MARKERS:
+        load_image(name)
+
+
+class Sprite:
+    """A marker image pre-scaled to one size, with pre-rotated variants.
+
+    Rotation is quantised into ``buckets`` steps so drawing a rotated marker
+    is a plain pixmap blit.
+    """
+
+    def __init__(self, name: str, size: float, buckets: int = 1, dpr: float = 1.0):
+        self.size = size
+        self.buckets = max(1, int(buckets))
+        self.dpr = dpr
+
+        src = load_image(name)
+        # rotated frames must fit the diagonal of the unrotated marker
+        extent = size * math.sqrt(2) if self.buckets > 1 else size
+        self.extent = extent
+        px = max(1, int(math.ceil(extent * dpr)))
+
+        self._frames = []
+        for k in range(self.buckets):
+            img = QImage(px, px, QImage.Format_ARGB32_Premultiplied)
+            img.setDevicePixelRatio(dpr)
+            img.fill(Qt.transparent)
+
+            p = QPainter(img)
+            p.setRenderHint(QPainter.Antialiasing, True)
+            p.setRenderHint(QPainter.SmoothPixmapTransform, True)
+            p.translate(extent / 2, extent / 2)
+            p.rotate(360.0 * k / self.buckets)
+            p.drawImage(QRectF(-size / 2, -size / 2, size, size), src)
+            p.end()
+
+            self._frames.append(QPixmap.fromImage(img))
+
+    def frame(self, angle_deg: float = 0.0) -> QPixmap:
+        k = int(round(angle_deg * self.buckets / 360.0)) % self.buckets
+        return self._frames[k]
+
+    def draw(self, p: QPainter, pt: QPointF, angle_deg: float = 0.0):
+        half = self.extent / 2
+        p.drawPixmap(QPointF(pt.x() - half, pt.y() - half), self.frame(angle_deg))
+
+
+@lru_cache(maxsize=32)
+def marker_sprite(name: str, size: float, buckets: int = 1, dpr: float = 1.0) -> Sprite:
+    return Sprite(name, size, buckets, dpr)
@@ -0,0 +1,66 @@
+# clean_track.py
+#
+# Cleans a recorded track outline: detects laps, averages them, resamples and
+# simplifies (see acc_dashboard/processors/track_outline.py). Takes the
+# recorder's points_<track>.ndjson log or any points_<track>.json.
+#
+# Examples:
+#   python clean_track.py points_Spa.ndjson                    # -> points_Spa.json
+#   python clean_track.py points_Spa.json --out cleaned.json --epsilon 0.3
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from acc_dashboard.processors import track_outline  # noqa: E402
+
+
+def read_points(path: Path):
+    if path.suffix == ".ndjson":
+        rows = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rows.append(json.loads(line))
+                except ValueError:
+                    continue  # torn final line
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            rows = json.load(f)
+    out = []
+    for q in rows:
+        if isinstance(q, dict):
+            out.append((float(q["x"]), float(q.get("y", 0.0)), float(q["z"])))
+        else:
+            out.append((float(q[0]), 0.0, float(q[1])))
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Clean a recorded track outline.")
+    ap.add_argument("source", type=Path, help="points_<track>.ndjson or .json")
+    ap.add_argument("--out", type=Path, help="Output points file (default: <source>.json).")
+    ap.add_argument("--closure-radius", type=float, default=track_outline.DEFAULT_CLOSURE_RADIUS, help="Lap closure radius (m).")
+    ap.add_argument("--spacing", type=float, default=track_outline.DEFAULT_SPACING, help="Resample spacing (m).")
+    ap.add_argument("--epsilon", type=float, default=track_outline.DEFAULT_EPSILON, help="Simplification error bound (m).")
+    ap.add_argument("--max-gap", type=float, default=track_outline.DEFAULT_MAX_GAP, help="Longest allowed gap between points (m).")
+    args = ap.parse_args()
+
+    raw = read_points(args.source)
+    laps, _ = track_outline.split_laps(raw, args.closure_radius)
+    outline = track_outline.clean_outline(raw, args.closure_radius, args.spacing, args.epsilon, args.max_gap)
+
+    out = args.out or args.source.with_suffix(".json")
+    tmp = out.with_name(out.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump([{"x": x, "y": y, "z": z} for x, y, z in outline], f, ensure_ascii=False, indent=2)
+    os.replace(tmp, out)
+    print(f"{args.source.name}: {len(raw)} samples, {len(laps)} laps -> {len(outline)} points in {out}")
+
+
+if __name__ == "__main__":
+    main()
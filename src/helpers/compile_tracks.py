@@ -0,0 +1,55 @@
+# compile_tracks.py
+#
+# Compiles resources/tracks/*/points_<track>.json into the binary
+# points_<track>.trk assets the dashboard loads (see
+# acc_dashboard/processors/track_asset.py). Re-run after editing a points file;
+# until then the dashboard ignores the stale asset and parses the JSON.
+#
+# Examples:
+#   python compile_tracks.py                  # every bundled track
+#   python compile_tracks.py Spa monza
+#   python compile_tracks.py --spacing 5      # resample to one point per 5 m
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from acc_dashboard.paths import TRACKS_DIR  # noqa: E402
+from acc_dashboard.processors import track_asset  # noqa: E402
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compile track points into binary assets.")
+    ap.add_argument("tracks", nargs="*", help="Track folders to compile (default: all).")
+    ap.add_argument("--tracks-dir", type=Path, default=TRACKS_DIR, help="Folder holding the track folders.")
+    ap.add_argument("--spacing", type=float, default=0.0, help="Resample to this many metres per point (0 keeps the points).")
+    ap.add_argument("--sector-len", type=int, default=track_asset.DEFAULT_SECTOR_LEN, help="Points per minimap sector.")
+    args = ap.parse_args()
+
+    folders = sorted(p for p in args.tracks_dir.iterdir() if p.is_dir())
+    if args.tracks:
+        wanted = {t.lower() for t in args.tracks}
+        folders = [p for p in folders if p.name.lower() in wanted]
+
+    for folder in folders:
+        points = folder / f"points_{folder.name}.json"
+        if not points.exists():
+            print(f"{folder.name}: no {points.name}, skipped")
+            continue
+
+        t0 = time.perf_counter()
+        out = track_asset.compile_track(points, args.sector_len, args.spacing)
+        t1 = time.perf_counter()
+        asset = track_asset.load(out, points)
+        t2 = time.perf_counter()
+        print(
+            f"{folder.name}: {len(asset)} points, {asset.lap_length:.0f} m -> {out.name} "
+            f"({out.stat().st_size / 1024:.1f} KiB, compile {1000 * (t1 - t0):.1f} ms, load {1000 * (t2 - t1):.2f} ms)"
+        )
+
+
+if __name__ == "__main__":
+    main()
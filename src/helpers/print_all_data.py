@@ -3,23 +3,42 @@
 # Examples:
 #   python dump_pyaccsharedmemory_to_file.py --out acc_dump.json --once
 #   python dump_pyaccsharedmemory_to_file.py --out acc_dump.json --hz 10
-#   python dump_pyaccsharedmemory_to_file.py --out acc_dump.ndjson --hz 10 --ndjson
+#   python dump_pyaccsharedmemory_to_file.py --out acc_dump.ndjson --hz 60 --ndjson
+#   python dump_pyaccsharedmemory_to_file.py --out acc_dump.accrec --hz 60 --binary
 #
 # Default behavior:
 # - loops at 1 Hz
 # - writes to acc_dump.json
 # - overwrites the file each tick (so it's always the latest snapshot)
+#
+# The Physics/Graphics/Static layouts are inspected once at startup and turned
+# into a flat extraction plan (BlockPlan), so a tick is a few attrgetter calls
+# instead of a reflective walk over every attribute.
+#
+# --ndjson appends compact rows: a first {"columns": ...} line naming the
+# values, then one line per new physics packet with "Physics" and "Graphics"
+# value lists, plus "Static" only when it changed.
+# --binary writes the dashboard's session recording format instead
+# (acc_dashboard/telemetry/recording.py; replay it with acc-dashboard --replay).
 
 from __future__ import annotations
 
 import argparse
+import dataclasses
 import json
+import sys
 import time
 from enum import Enum
-from typing import Any, Dict, Set
+from operator import attrgetter
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
+import pyaccsharedmemory as acc
 from pyaccsharedmemory import accSharedMemory
 
+BLOCKS = ("Physics", "Graphics", "Static")
+_WHEELS = ("front_left", "front_right", "rear_left", "rear_right")
+
 
 def _decode_if_byteslike(x: Any) -> Any:
     if isinstance(x, (bytes, bytearray)):
@@ -88,23 +107,124 @@ def to_jsonable(obj: Any, *, _seen: Set[int] | None = None) -> Any:
     return str(obj)
 
 
+def _c_string(v: Any) -> str:
+    return str(v).split("\x00", 1)[0]
+
+
+def _vector(v: Any) -> List[float]:
+    return [v.x, v.y, v.z]
+
+
+def _converter(type_name: str) -> Optional[Callable[[Any], Any]]:
+    """JSON conversion for one dataclass field type; None if the value is JSON already."""
+    if type_name in ("float", "int", "bool"):
+        return None
+    if type_name == "str":
+        return _c_string
+    if type_name == "Vector3f":
+        return _vector
+    if type_name == "Wheels":
+        return attrgetter(*_WHEELS)
+    if type_name == "CarDamage":
+        return attrgetter("front", "rear", "left", "right", "center")
+    if type_name == "ContactPoint":
+        return lambda v: [_vector(getattr(v, w)) for w in _WHEELS]
+    if type_name == "List[Vector3f]":
+        return lambda v: [[p.x, p.y, p.z] for p in v]
+    if type_name == "List[int]":
+        return list
+    if isinstance(getattr(acc, type_name, None), type) and issubclass(getattr(acc, type_name), Enum):
+        return lambda v: v.name if isinstance(v, Enum) else v
+    # unknown type: fall back to the reflective walk
+    return to_jsonable
+
+
+class BlockPlan:
+    """Flat, precomputed extraction of one shared-memory block.
+
+    Plain numeric fields are read with a single multi-name attrgetter; the
+    rest each get an attrgetter and a converter picked from the field type.
+    """
+
+    def __init__(self, cls: type):
+        plain: List[str] = []
+        converted: List[Tuple[str, Callable[[Any], Any]]] = []
+        for f in dataclasses.fields(cls):
+            conv = _converter(f.type)
+            if conv is None:
+                plain.append(f.name)
+            else:
+                converted.append((f.name, conv))
+
+        self.columns = plain + [name for name, _ in converted]
+        if len(plain) > 1:
+            self._plain = attrgetter(*plain)
+        elif plain:
+            single = attrgetter(plain[0])
+            self._plain = lambda b: (single(b),)
+        else:
+            self._plain = lambda b: ()
+        self._converted = [(attrgetter(name), conv) for name, conv in converted]
+
+    def values(self, block: Any) -> List[Any]:
+        out = list(self._plain(block))
+        out.extend([conv(get(block)) for get, conv in self._converted])
+        return out
+
+    def as_dict(self, block: Any) -> Dict[str, Any]:
+        return dict(zip(self.columns, self.values(block)))
+
+
+PLANS = {
+    "Physics": BlockPlan(acc.PhysicsMap),
+    "Graphics": BlockPlan(acc.GraphicsMap),
+    "Static": BlockPlan(acc.StaticsMap),
+}
+
+
 def read_all_snapshot(sm_obj: Any) -> Dict[str, Any]:
     snap: Dict[str, Any] = {}
-    for key in ("Physics", "Graphics", "Static", "Statics"):
+    for key in BLOCKS:
         if hasattr(sm_obj, key):
-            snap[key] = to_jsonable(getattr(sm_obj, key))
+            snap[key] = PLANS[key].as_dict(getattr(sm_obj, key))
     return snap
 
 
-def write_json(path: str, payload: Dict[str, Any], *, pretty: bool, mode: str) -> None:
-    if mode not in ("w", "a"):
-        raise ValueError("mode must be 'w' or 'a'")
-    text = json.dumps(payload, indent=2 if pretty else None, ensure_ascii=False)
-    with open(path, mode, encoding="utf-8") as f:
-        if mode == "a":
-            f.write(text + "\n")  # NDJSON style (one object per line)
-        else:
-            f.write(text)         # Normal JSON (single object)
+def write_json(path: str, payload: Dict[str, Any], *, pretty: bool) -> None:
+    text = json.dumps(payload, indent=2 if pretty else None, separators=None if pretty else (",", ":"))
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(text)         # Normal JSON (single object)
+
+
+class NdjsonWriter:
+    """Compact rows: column names once, Static only when it changes."""
+
+    def __init__(self, path: str):
+        self._f = open(path, "a", encoding="utf-8", buffering=1 << 16)
+        self._f.write(json.dumps({"columns": {k: PLANS[k].columns for k in BLOCKS}}, separators=(",", ":")) + "\n")
+        self._static = None
+
+    def write(self, sm: Any) -> None:
+        row: Dict[str, Any] = {
+            "t": time.time(),
+            "Physics": PLANS["Physics"].values(sm.Physics),
+            "Graphics": PLANS["Graphics"].values(sm.Graphics),
+        }
+        static = PLANS["Static"].values(sm.Static)
+        if static != self._static:
+            row["Static"] = self._static = static
+        self._f.write(json.dumps(row, separators=(",", ":")) + "\n")
+
+    def close(self) -> None:
+        self._f.close()
+
+
+def binary_writer(path: str):
+    # the dashboard's recording format, from the package next to this folder
+    sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+    from acc_dashboard.telemetry.recording import SessionRecorder
+
+    return SessionRecorder(path)
 
 
 def main() -> int:
@@ -116,21 +236,30 @@ def main() -> int:
     ap.add_argument(
         "--ndjson",
         action="store_true",
-        help="Append mode: write one JSON object per line (NDJSON).",
+        help="Append mode: write one compact row per line (NDJSON).",
     )
+    ap.add_argument("--binary", action="store_true", help="Write a binary session recording.")
     args = ap.parse_args()
 
-    mode = "a" if args.ndjson else "w"
     period = 1.0 / max(args.hz, 0.001)
 
+    if args.binary:
+        writer = binary_writer(args.out)
+    elif args.ndjson:
+        writer = NdjsonWriter(args.out)
+    else:
+        writer = None
+
     asm = accSharedMemory()
     try:
         def dump_once() -> bool:
             sm = asm.read_shared_memory()
             if sm is None:
                 return False
-            payload = read_all_snapshot(sm)
-            write_json(args.out, payload, pretty=args.pretty, mode=mode)
+            if writer is not None:
+                writer.write(sm)
+            else:
+                write_json(args.out, read_all_snapshot(sm), pretty=args.pretty)
             return True
 
         if args.once:
@@ -141,16 +270,25 @@ def main() -> int:
                 )
             return 0
 
-        # loop forever
+        # loop forever, on a fixed schedule so --hz holds at 60
+        next_t = time.perf_counter()
         while True:
             dump_once()  # if None, just skip this tick
-            time.sleep(period)
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay < 0:
+                next_t = time.perf_counter()
+                delay = 0
+            time.sleep(delay)
+
+    except KeyboardInterrupt:
+        return 0
 
     finally:
+        if writer is not None:
+            writer.close()
         asm.close()
 
-    return 0
-
 
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,73 +1,169 @@
-from pyaccsharedmemory import accSharedMemory
-import time
+# track_recorder.py
+#
+# Records the player's car position into points_<track>.json, the track
+# outline process_track loads.
+#
+# Examples:
+#   python track_recorder.py                   # 20 Hz into the current folder
+#   python track_recorder.py --hz 60 --out-dir ../acc_dashboard/resources/tracks/Spa
+#
+# Samples are appended to points_<track>.ndjson (one {"x","y","z"} object per
+# line) as they arrive, through a buffered file that is flushed about once a
+# second, so the cost per sample stays constant however long the recording
+# gets. On a track change or Ctrl+C the log is turned into points_<track>.json
+# by writing a temporary file and renaming it over the old one, so the points
+# file is never half written. The log is kept: restarting the recorder keeps
+# appending to it, and a torn last line (killed mid-write) is skipped.
+#
+# Unless --raw is given, the points file gets the cleaned outline rather than
+# every sample: laps are detected, averaged, resampled and simplified (see
+# acc_dashboard/processors/track_outline.py). Drive two or three clean laps.
+
+import argparse
 import json
 import os
+import sys
+import time
+from pathlib import Path
+
+from pyaccsharedmemory import accSharedMemory
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+from acc_dashboard.processors.track_outline import clean_outline  # noqa: E402
+
+FLUSH_EVERY = 1.0  # seconds
+
 
 def clean_c_string(s: str) -> str:
     return s.split("\x00", 1)[0].strip()
 
-sm = accSharedMemory()
 
-points = []
-current_file = None
-flush_every = 10
+def read_log(path: Path) -> list:
+    points = []
+    if not path.exists():
+        return points
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                q = json.loads(line)
+            except ValueError:
+                continue  # torn final line
+            points.append({"x": q["x"], "y": q["y"], "z": q["z"]})
+    return points
+
+
+class PointLog:
+    """Append-only NDJSON log of the points recorded for one track."""
+
+    def __init__(self, out_dir: Path, track_name: str):
+        self.log_path = out_dir / f"points_{track_name}.ndjson"
+        self.points_path = out_dir / f"points_{track_name}.json"
+
+        # first run on a track recorded with the old recorder: continue from
+        # its points file instead of replacing it
+        if not self.log_path.exists() and self.points_path.exists():
+            with open(self.points_path, "r", encoding="utf-8") as f:
+                old = json.load(f)
+            with open(self.log_path, "w", encoding="utf-8") as f:
+                for q in old if isinstance(old, list) else []:
+                    f.write(json.dumps({"x": q["x"], "y": q["y"], "z": q["z"]}) + "\n")
+
+        self._f = open(self.log_path, "a", encoding="utf-8", buffering=1 << 16)
+        self._last_flush = time.monotonic()
+        self.count = 0
+
+    def append(self, x: float, y: float, z: float):
+        self._f.write(f'{{"x": {x!r}, "y": {y!r}, "z": {z!r}}}\n')
+        self.count += 1
+        now = time.monotonic()
+        if now - self._last_flush >= FLUSH_EVERY:
+            self._f.flush()
+            self._last_flush = now
+
+    def finalise(self, clean: bool = True) -> int:
+        """Close the log and atomically rewrite the points file from it."""
+        self._f.close()
+        points = read_log(self.log_path)
+        if clean and points:
+            outline = clean_outline([(q["x"], q["y"], q["z"]) for q in points])
+            points = [{"x": x, "y": y, "z": z} for x, y, z in outline]
+        write_points(self.points_path, points)
+        return len(points)
+
+
+def write_points(path: Path, points: list):
+    """Write a points file through a temporary file and a rename."""
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(points, f, ensure_ascii=False, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Record a track outline from the player's car.")
+    ap.add_argument("--hz", type=float, default=20.0, help="Sampling rate (default 20 Hz, 60 for dense outlines).")
+    ap.add_argument("--out-dir", type=Path, default=Path("."), help="Where points_<track>.json is written.")
+    ap.add_argument(
+        "--min-distance", type=float, default=0.05,
+        help="Skip samples closer than this (metres) to the previous one, e.g. while stopped.",
+    )
+    ap.add_argument("--raw", action="store_true", help="Write every sample instead of the cleaned outline.")
+    args = ap.parse_args()
+
+    period = 1.0 / max(args.hz, 0.001)
+    args.out_dir.mkdir(parents=True, exist_ok=True)
+
+    sm = accSharedMemory()
+    log = None
+    last = None
+    next_t = time.perf_counter()
+    next_report = next_t + 1.0
 
-def load_existing(filename: str):
-    if not os.path.exists(filename):
-        return []
     try:
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            return data if isinstance(data, list) else []
-    except Exception:
-        return []
-
-def flush(filename: str, pts: list):
-    # merge with what's already on disk (in case you restart)
-    data = load_existing(filename)
-    data.extend(pts)
-    with open(filename, "w", encoding="utf-8") as f:
-        json.dump(data, f, ensure_ascii=False, indent=2)
-
-try:
-    while True:
-        time.sleep(1)
-        telemetry_data = sm.read_shared_memory()
-        if telemetry_data is None:
-            print(".", end=" ")
-            continue
-
-        track_raw = telemetry_data.Static.track
-        if not track_raw:
-            continue
-
-        track_name = clean_c_string(track_raw)
-        if not track_name:
-            continue
-
-        filename = f"points_{track_name}.json"
-
-        # If track changed, flush old and start new
-        if current_file is None:
-            current_file = filename
-        elif filename != current_file:
-            if points:
-                flush(current_file, points)
-                points.clear()
-            current_file = filename
-
-        car_id = telemetry_data.Graphics.player_car_id
-        cords = telemetry_data.Graphics.car_coordinates[car_id]
-
-        points.append({"x": float(cords.x), "y": float(cords.y), "z": float(cords.z)})
-
-        if len(points) >= flush_every:
-            flush(current_file, points)
-            points.clear()
-
-        print(cords)
-
-except KeyboardInterrupt:
-    # Final flush on exit
-    if current_file and points:
-        flush(current_file, points)
+        while True:
+            telemetry_data = sm.read_shared_memory()
+            if telemetry_data is not None:
+                track_name = clean_c_string(telemetry_data.Static.track or "")
+                if track_name:
+                    # If track changed, finalise old and start new
+                    if log is None or log.points_path.name != f"points_{track_name}.json":
+                        if log is not None:
+                            print(f"\n{log.points_path}: {log.finalise(clean=not args.raw)} points")
+                        log = PointLog(args.out_dir, track_name)
+                        last = None
+
+                    car_id = telemetry_data.Graphics.player_car_id
+                    cords = telemetry_data.Graphics.car_coordinates[car_id]
+                    x, y, z = float(cords.x), float(cords.y), float(cords.z)
+                    if last is None or (x - last[0]) ** 2 + (z - last[1]) ** 2 >= args.min_distance ** 2:
+                        log.append(x, y, z)
+                        last = (x, z)
+
+            now = time.perf_counter()
+            if now >= next_report:
+                print(f"\r{log.count if log else 0} points", end="", flush=True)
+                next_report = now + 1.0
+
+            next_t += period
+            delay = next_t - time.perf_counter()
+            if delay < 0:
+                next_t = time.perf_counter()
+                delay = 0
+            time.sleep(delay)
+
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Final flush on exit
+        if log is not None:
+            print(f"\n{log.points_path}: {log.finalise(clean=not args.raw)} points")
+        sm.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())